@@ -20,8 +20,10 @@ Run this example to see the core infrastructure in action:
 import os
 import sys
 import asyncio
+import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent.parent
@@ -42,14 +44,32 @@ from happypath.core import (
 
 # Import specific classes and enums
 from happypath.core.auditing import AuditEventType, AuditSeverity
+from happypath.core.cache import get_session_cache
+from happypath.core.database import query_builder
+from happypath.core.security import get_permission_manager
+from happypath.core.time_utils import now_iso
 from happypath.core.events import EventType, EventHandler
 from happypath.core.exceptions import HappyPathError, SecurityError
 
 
+# Event loop shared by every async section; created on first use and reused
+# across repeated demo runs instead of building a new loop per asyncio.run()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro):
+    """Run a coroutine to completion on the module's persistent event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
 class SampleUserEventHandler(EventHandler):
     """Sample event handler for user-related events."""
     
     def __init__(self):
+        super().__init__("sample_user_handler")
         self.logger = get_logger(__name__)
     
     def handle_user_registered(self, event):
@@ -63,7 +83,7 @@ class SampleUserEventHandler(EventHandler):
         # Log audit event
         audit = get_audit_logger()
         audit.log_event(
-            event_type=AuditEventType.USER_ACCOUNT_CREATED,
+            event_type=AuditEventType.USER_REGISTRATION,
             user_id=user_data.get('user_id'),
             description=f"Welcome email sent to {user_data.get('email')}",
             details={"email_sent": True, "template": "welcome"}
@@ -74,12 +94,14 @@ class SampleUserEventHandler(EventHandler):
         login_data = event.data
         self.logger.info(f"Processing login for user {login_data.get('user_id')}")
         
-        # Update user's last login cache
+        # Update user's last login cache; frequent users get shorter TTLs
+        user_id = login_data.get('user_id')
         cache = get_cache_manager()
-        cache.set(
-            f"user:{login_data.get('user_id')}:last_login",
-            datetime.now().isoformat(),
-            ttl=86400  # 24 hours
+        cache.set_adaptive(
+            f"user:{user_id}:last_login",
+            now_iso(),
+            base_ttl=86400,  # 24 hours for rare users
+            access_hint=str(user_id)
         )
 
 
@@ -103,9 +125,7 @@ def setup_environment_variables():
         "LOG_LEVEL": "INFO"
     }
     
-    for key, value in env_vars.items():
-        if not os.getenv(key):
-            os.environ[key] = value
+    os.environ.update({key: value for key, value in env_vars.items() if not os.environ.get(key)})
     
     print("✅ Environment variables configured for demo")
 
@@ -121,24 +141,26 @@ def demonstrate_configuration():
     print(f"✅ Configuration initialized for {config.env.value} environment")
     
     # Access various configuration sections
+    database, security, redis, features = config.database, config.security, config.redis, config.features
+    
     print(f"📊 Database configuration:")
-    print(f"  Host: {config.database.host}")
-    print(f"  Port: {config.database.port}")
-    print(f"  Database: {config.database.name}")
+    print(f"  Host: {database.host}")
+    print(f"  Port: {database.port}")
+    print(f"  Database: {database.database}")
     
     print(f"🔐 Security configuration:")
-    print(f"  JWT Expiry: {config.security.jwt_expiry_hours} hours")
-    print(f"  Password Min Length: {config.security.password_min_length}")
+    print(f"  JWT Expiry: {security.jwt_expiry_hours} hours")
+    print(f"  Password Min Length: {security.password_min_length}")
     
     print(f"🗃️ Cache configuration:")
-    print(f"  Redis Host: {config.cache.host}")
-    print(f"  Redis Port: {config.cache.port}")
+    print(f"  Redis Host: {redis.host}")
+    print(f"  Redis Port: {redis.port}")
     
     # Feature flags
     print(f"🚩 Feature flags:")
-    print(f"  Audit Logging: {config.features.enable_audit_logging}")
-    print(f"  Metrics Collection: {config.features.enable_metrics_collection}")
-    print(f"  Rate Limiting: {config.features.enable_rate_limiting}")
+    print(f"  Audit Logging: {features.enable_audit_logging}")
+    print(f"  Analytics: {features.enable_analytics}")
+    print(f"  Crisis Detection: {features.enable_crisis_detection}")
 
 
 def demonstrate_logging():
@@ -157,7 +179,7 @@ def demonstrate_logging():
     logger.info("Application started", extra={
         "component": "sample_app",
         "version": "1.0.0",
-        "startup_time": datetime.now().isoformat()
+        "startup_time": now_iso()
     })
     
     logger.debug("Processing user request", extra={
@@ -228,16 +250,19 @@ def demonstrate_security():
     
     # Permission checking
     print("\n👮 Permission System:")
-    user_roles = ["user", "premium"]
+    permission_manager = get_permission_manager()
+    user_roles = ["user", "premium_user"]
     permissions_to_check = [
-        "user:read",
-        "user:write", 
-        "admin:read",
-        "premium:features"
+        "mood:read",
+        "subscription:write",
+        "users:write",
+        "analytics:read"
     ]
     
+    # Resolve the role set once, then each check is a set lookup
+    permissions = permission_manager.permissions_for(user_roles)
     for permission in permissions_to_check:
-        has_permission = security.check_permission(user_roles, permission)
+        has_permission = permission_manager.grants(permissions, permission)
         status = "✅ Allowed" if has_permission else "❌ Denied"
         print(f"  {permission}: {status}")
 
@@ -262,21 +287,22 @@ def demonstrate_database():
         
         # Query builder demonstration
         print("\n📊 Query Builder Demo:")
-        query_builder = db.query_builder()
         
         # Build a sample query
-        query = (query_builder
-                .select("id, email, created_at")
-                .from_table("users")
-                .where("active = %s", True)
-                .where("created_at > %s", datetime.now() - timedelta(days=30))
-                .order_by("created_at DESC")
-                .limit(10))
+        query, params = (query_builder("users")
+                .select("id", "email", "created_at")
+                .where("active = %(active)s", active=True)
+                .where("created_at > %(since)s", since=datetime.now() - timedelta(days=30))
+                .order_by("created_at", "DESC")
+                .limit(10)
+                .build())
         
-        print(f"  Built query: {query.query}")
-        print(f"  Parameters: {query.params}")
+        print(f"  Built query: {query}")
+        print(f"  Parameters: {params}")
         
-        # Note: We won't execute since demo database might not exist
+        # Note: We won't execute since demo database might not exist. When run,
+        # QueryBuilder.execute() prepares the statement once per connection
+        # and reuses it on later calls.
         print("  (Query built successfully - execution skipped for demo)")
         
     except Exception as e:
@@ -303,15 +329,15 @@ def demonstrate_caching():
             # Basic caching operations
             print("\n📦 Basic Cache Operations:")
             
-            # Set values
-            cache.set("demo:user:12345", {"name": "John Doe", "email": "john@example.com"}, ttl=300)
-            cache.set("demo:counter", 42, ttl=60)
-            cache.set("demo:settings", {"theme": "dark", "notifications": True}, ttl=3600)
-            
-            # Get values
-            user_data = cache.get("demo:user:12345")
-            counter = cache.get("demo:counter")
-            settings = cache.get("demo:settings")
+            # Queue all writes and reads, then send them in one round-trip
+            with cache.pipeline() as pipe:
+                pipe.set("demo:user:12345", {"name": "John Doe", "email": "john@example.com"}, ttl=300)
+                pipe.set("demo:counter", 42, ttl=60)
+                pipe.set("demo:settings", {"theme": "dark", "notifications": True}, ttl=3600)
+                pipe.get("demo:user:12345")
+                pipe.get("demo:counter")
+                pipe.get("demo:settings")
+                _, _, _, user_data, counter, settings = pipe.execute()
             
             print(f"  User data: {user_data}")
             print(f"  Counter: {counter}")
@@ -319,20 +345,20 @@ def demonstrate_caching():
             
             # Session management
             print("\n👤 Session Management:")
-            session_id = cache.create_session(
-                user_id=12345,
-                data={"role": "premium", "login_time": datetime.now().isoformat()}
+            session_cache = get_session_cache()
+            session_id = str(uuid.uuid4())
+            session_cache.set_session(
+                session_id,
+                {"user_id": 12345, "role": "premium", "login_time": now_iso()}
             )
             print(f"  Session created: {session_id}")
             
-            session_data = cache.get_session(session_id)
+            session_data = session_cache.get_session(session_id)
             print(f"  Session data: {session_data}")
             
-            # Cleanup demo data
-            cache.delete("demo:user:12345")
-            cache.delete("demo:counter")
-            cache.delete("demo:settings")
-            cache.invalidate_session(session_id)
+            # Cleanup demo data with a single UNLINK
+            cache.unlink("demo:user:12345", "demo:counter", "demo:settings")
+            session_cache.delete_session(session_id)
             print("  Demo cache data cleaned up")
             
     except Exception as e:
@@ -348,75 +374,73 @@ def demonstrate_audit_logging():
     
     audit = get_audit_logger()
     
-    # Log various types of events
+    # Log various types of events in a single batch (one database round-trip)
     print("📝 Logging audit events...")
     
-    # User authentication events
-    login_event_id = audit.log_event(
-        event_type=AuditEventType.USER_LOGIN_SUCCESS,
-        user_id=12345,
-        description="User logged in successfully",
-        severity=AuditSeverity.LOW,
-        details={
+    events = [
+        # User authentication events
+        {
+            "event_type": AuditEventType.USER_LOGIN,
+            "user_id": "12345",
+            "description": "User logged in successfully",
+            "severity": AuditSeverity.LOW,
             "ip_address": "192.168.1.100",
             "user_agent": "Mozilla/5.0 (Demo Browser)",
-            "login_method": "password"
-        }
-    )
-    print(f"  ✅ Login event logged: {login_event_id}")
-    
-    # Data access events
-    data_access_event_id = audit.log_event(
-        event_type=AuditEventType.DATA_ACCESS,
-        user_id=12345,
-        description="User accessed patient records",
-        severity=AuditSeverity.MEDIUM,
-        details={
+            "details": {"login_method": "password"}
+        },
+        # Data access events
+        {
+            "event_type": AuditEventType.DATA_READ,
+            "user_id": "12345",
+            "description": "User accessed patient records",
+            "severity": AuditSeverity.MEDIUM,
             "resource_type": "patient_records",
-            "record_count": 5,
-            "access_reason": "treatment_review"
-        }
-    )
-    print(f"  ✅ Data access event logged: {data_access_event_id}")
-    
-    # Administrative events
-    admin_event_id = audit.log_event(
-        event_type=AuditEventType.ADMIN_SYSTEM_CONFIG_CHANGE,
-        user_id=1,
-        description="System configuration updated",
-        severity=AuditSeverity.HIGH,
-        details={
-            "config_section": "security_settings",
-            "changes": ["jwt_expiry_hours", "rate_limit_window"],
-            "previous_values": {"jwt_expiry_hours": 24, "rate_limit_window": 3600}
-        }
-    )
-    print(f"  ✅ Admin event logged: {admin_event_id}")
-    
-    # Security monitoring
-    print("\n🛡️ Security event monitoring:")
-    audit.log_security_event(
-        event="SUSPICIOUS_LOGIN_ATTEMPT",
-        user_id=12345,
-        success=False,
-        ip_address="203.0.113.1",
-        details={
-            "reason": "multiple_failed_attempts",
-            "attempt_count": 5,
-            "time_window": "5_minutes"
+            "details": {
+                "record_count": 5,
+                "access_reason": "treatment_review"
+            }
+        },
+        # Administrative events
+        {
+            "event_type": AuditEventType.ADMIN_SYSTEM_CONFIG_CHANGE,
+            "user_id": "1",
+            "description": "System configuration updated",
+            "severity": AuditSeverity.HIGH,
+            "details": {
+                "config_section": "security_settings",
+                "changes": ["jwt_expiry_hours", "rate_limit_window"],
+                "previous_values": {"jwt_expiry_hours": 24, "rate_limit_window": 3600}
+            }
+        },
+        # Security monitoring
+        {
+            "event_type": AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY,
+            "user_id": "12345",
+            "description": "Suspicious login attempt",
+            "severity": AuditSeverity.HIGH,
+            "ip_address": "203.0.113.1",
+            "success": False,
+            "details": {
+                "reason": "multiple_failed_attempts",
+                "attempt_count": 5,
+                "time_window": "5_minutes"
+            }
+        },
+        # GDPR compliance tracking
+        {
+            "event_type": AuditEventType.PRIVACY_DATA_PORTABILITY,
+            "user_id": "12345",
+            "description": "User requested data export",
+            "details": {
+                "data_types": ["profile", "activity_logs", "preferences"],
+                "legal_basis": "user_consent"
+            }
         }
-    )
-    print("  ✅ Security event logged")
-    
-    # GDPR compliance tracking
-    gdpr_event_id = audit.log_gdpr_event(
-        event_type="DATA_EXPORT_REQUEST",
-        user_id=12345,
-        description="User requested data export",
-        data_types=["profile", "activity_logs", "preferences"],
-        legal_basis="user_consent"
-    )
-    print(f"  ✅ GDPR event logged: {gdpr_event_id}")
+    ]
+    
+    event_ids = audit.log_events_batch(events)
+    for event, event_id in zip(events, event_ids):
+        print(f"  ✅ {event['event_type'].value} event logged: {event_id}")
 
 
 def demonstrate_event_system():
@@ -427,41 +451,42 @@ def demonstrate_event_system():
     
     events = get_event_manager()
     
-    # Register event handler
+    # Register event handlers
     handler = SampleUserEventHandler()
-    events.register_handler(handler)
+    events.register_handler(EventType.USER_REGISTERED, handler.handle_user_registered)
+    events.register_handler(EventType.USER_LOGIN, handler.handle_user_login)
     print("✅ Event handler registered")
     
-    # Publish events
-    print("\n📤 Publishing events:")
+    # Queue events for deferred processing
+    print("\n📤 Queueing events:")
     
     # User registration event
-    registration_event_id = events.publish(
+    registration_event_id = events.enqueue(
         event_type=EventType.USER_REGISTERED,
         data={
             "user_id": 12345,
             "email": "john.doe@example.com",
-            "registration_date": datetime.now().isoformat(),
+            "registration_date": now_iso(),
             "plan": "premium"
         },
         source="user_service"
     )
-    print(f"  ✅ User registration event published: {registration_event_id}")
+    print(f"  ✅ User registration event queued: {registration_event_id}")
     
     # User login event
-    login_event_id = events.publish(
+    login_event_id = events.enqueue(
         event_type=EventType.USER_LOGIN,
         data={
             "user_id": 12345,
-            "login_time": datetime.now().isoformat(),
+            "login_time": now_iso(),
             "ip_address": "192.168.1.100"
         },
         source="auth_service"
     )
-    print(f"  ✅ User login event published: {login_event_id}")
+    print(f"  ✅ User login event queued: {login_event_id}")
     
     # System events
-    maintenance_event_id = events.publish(
+    maintenance_event_id = events.enqueue(
         event_type=EventType.SYSTEM_MAINTENANCE_START,
         data={
             "maintenance_type": "database_update",
@@ -470,12 +495,12 @@ def demonstrate_event_system():
         },
         source="admin_service"
     )
-    print(f"  ✅ Maintenance event published: {maintenance_event_id}")
+    print(f"  ✅ Maintenance event queued: {maintenance_event_id}")
     
     # Process events (this would normally run in background)
     print("\n📥 Processing events...")
-    events.process_pending_events()
-    print("  ✅ Events processed")
+    processed = run_async(events.process_pending_events())
+    print(f"  ✅ {processed} events processed")
 
 
 def demonstrate_monitoring():
@@ -576,7 +601,9 @@ async def demonstrate_async_operations():
     
     async def fetch_user_data(user_id):
         """Simulate async user data fetch."""
-        await asyncio.sleep(0.1)  # Simulate I/O delay
+        # Simulated I/O delay; real lookups use db.execute_async_query() or
+        # db.run_blocking() so blocking drivers stay off the event loop
+        await asyncio.sleep(0.1)
         return {
             "id": user_id,
             "name": f"User {user_id}",
@@ -587,12 +614,12 @@ async def demonstrate_async_operations():
         """Process multiple users concurrently."""
         user_ids = [1, 2, 3, 4, 5]
         
-        # Process users concurrently
+        # Process users concurrently, handling each result as soon as it arrives
         tasks = [fetch_user_data(user_id) for user_id in user_ids]
-        results = await asyncio.gather(*tasks)
         
-        for user_data in results:
-            logger.info("Processed user data", extra={
+        for next_result in asyncio.as_completed(tasks):
+            user_data = await next_result
+            logger.info("Processed user data", extra_data={
                 "user_id": user_data["id"],
                 "operation": "async_fetch"
             })
@@ -634,7 +661,7 @@ def main():
     
     # Async demo
     print("\n⚡ Running async operations demo...")
-    asyncio.run(demonstrate_async_operations())
+    run_async(demonstrate_async_operations())
     
     # Final summary
     print("\n" + "="*60)
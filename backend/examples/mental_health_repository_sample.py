@@ -5,10 +5,17 @@ This file demonstrates comprehensive usage of the mental health platform
 repository pattern implementation across all clinical and operational workflows.
 """
 
+import asyncio
+import hashlib
+import inspect
+import json
 import logging
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from datetime import datetime, timedelta, date, time
-from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # Import core infrastructure
 from backend.happypath.core import get_db_manager, get_logger
@@ -32,13 +39,19 @@ from backend.happypath.repository import (
     Provider, Referral, CareTeam,
     
     # Repositories
+    TherapeuticRelationshipRepository, TreatmentPlanRepository,
+    MoodEntryRepository, JournalEntryRepository, AppointmentRepository,
+    MedicationRepository, MedicationDoseRepository,
+    ConversationRepository, ChatMessageRepository, ProviderRepository,
     create_therapeutic_relationship_repository,
     create_treatment_plan_repository,
     create_mood_entry_repository,
     create_journal_entry_repository,
     create_appointment_repository,
     create_medication_repository,
+    create_medication_dose_repository,
     create_conversation_repository,
+    create_chat_message_repository,
     create_provider_repository,
     
     # Enums
@@ -47,50 +60,88 @@ from backend.happypath.repository import (
     AppointmentModality, ConversationType, MessageSender,
     ProviderType, ReferralPriority, CareTeamRole
 )
+from backend.happypath.repository.crisis_repository import (
+    CRISIS_HOTLINE_CONTACT, EMERGENCY_SERVICES_CONTACT
+)
+
+
+# Shared identifiers used across the demos
+PATIENT_ID = "patient_001"
+THERAPIST_ID = "therapist_001"
+
+# Demo loggers, created once at import
+CLINICAL_LOGGER = get_logger('clinical_workflow')
+ENGAGEMENT_LOGGER = get_logger('patient_engagement')
+CARE_COORDINATION_LOGGER = get_logger('care_coordination')
+CRISIS_LOGGER = get_logger('crisis_management')
+ADHERENCE_LOGGER = get_logger('medication_adherence')
+ANALYTICS_LOGGER = get_logger('analytics_reporting')
+
+
+@dataclass(frozen=True)
+class MentalHealthRepositories:
+    """Repositories shared by the demos."""
+    __slots__ = (
+        'relationship', 'treatment', 'mood', 'journal', 'appointment',
+        'medication', 'medication_dose', 'conversation', 'chat_message', 'provider'
+    )
+    
+    relationship: TherapeuticRelationshipRepository
+    treatment: TreatmentPlanRepository
+    mood: MoodEntryRepository
+    journal: JournalEntryRepository
+    appointment: AppointmentRepository
+    medication: MedicationRepository
+    medication_dose: MedicationDoseRepository
+    conversation: ConversationRepository
+    chat_message: ChatMessageRepository
+    provider: ProviderRepository
 
 
-def setup_mental_health_repositories():
-    """Set up mental health repository instances."""
+@lru_cache(maxsize=1)
+def setup_mental_health_repositories() -> MentalHealthRepositories:
+    """Set up mental health repository instances (built once per process)."""
     db_manager = get_db_manager()
     logger = get_logger('mental_health_repositories')
     
-    return {
-        'relationship': create_therapeutic_relationship_repository(db_manager, logger),
-        'treatment': create_treatment_plan_repository(db_manager, logger),
-        'mood': create_mood_entry_repository(db_manager, logger),
-        'journal': create_journal_entry_repository(db_manager, logger),
-        'appointment': create_appointment_repository(db_manager, logger),
-        'medication': create_medication_repository(db_manager, logger),
-        'conversation': create_conversation_repository(db_manager, logger),
-        'provider': create_provider_repository(db_manager, logger)
-    }
-
-
-def clinical_workflow_demo():
+    return MentalHealthRepositories(
+        relationship=create_therapeutic_relationship_repository(db_manager, logger),
+        treatment=create_treatment_plan_repository(db_manager, logger),
+        mood=create_mood_entry_repository(db_manager, logger),
+        journal=create_journal_entry_repository(db_manager, logger),
+        appointment=create_appointment_repository(db_manager, logger),
+        medication=create_medication_repository(db_manager, logger),
+        medication_dose=create_medication_dose_repository(db_manager, logger),
+        conversation=create_conversation_repository(db_manager, logger),
+        chat_message=create_chat_message_repository(db_manager, logger),
+        provider=create_provider_repository(db_manager, logger)
+    )
+
+
+async def clinical_workflow_demo(repos: MentalHealthRepositories):
     """Demonstrate complete clinical workflow."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('clinical_workflow')
+    logger = CLINICAL_LOGGER
     
     try:
         logger.info("=== Clinical Workflow Demo ===")
         
         # 1. Establish therapeutic relationship
         relationship = TherapeuticRelationship(
-            patient_id="patient_001",
-            therapist_id="therapist_001",
+            patient_id=PATIENT_ID,
+            therapist_id=THERAPIST_ID,
             therapy_modality=TherapyModality.CBT,
             relationship_status="active",
             start_date=date.today(),
             session_frequency="weekly",
             treatment_focus=["Depression", "Anxiety"]
         )
-        relationship = repos['relationship'].create(relationship)
-        logger.info(f"Created therapeutic relationship: {relationship.relationship_id}")
+        relationship = await repos.relationship.acreate(relationship)
+        logger.info("Created therapeutic relationship: %s", relationship.relationship_id)
         
         # 2. Create treatment plan
         treatment_plan = TreatmentPlan(
-            patient_id="patient_001",
-            therapist_id="therapist_001",
+            patient_id=PATIENT_ID,
+            therapist_id=THERAPIST_ID,
             relationship_id=relationship.relationship_id,
             plan_name="CBT for Depression and Anxiety",
             primary_diagnosis="Major Depressive Disorder",
@@ -109,12 +160,12 @@ def clinical_workflow_demo():
             estimated_duration_weeks=16,
             phase=TreatmentPhase.ACTIVE
         )
-        treatment_plan = repos['treatment'].create(treatment_plan)
-        logger.info(f"Created treatment plan: {treatment_plan.plan_id}")
+        treatment_plan = await repos.treatment.acreate(treatment_plan)
+        logger.info("Created treatment plan: %s", treatment_plan.plan_id)
         
         # 3. Track patient mood
         mood_entry = MoodEntry(
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             mood_scale=MoodScale.ONE_TO_TEN,
             mood_rating=6,
             mood_type=MoodType.GENERAL,
@@ -125,12 +176,12 @@ def clinical_workflow_demo():
             weather="Sunny",
             privacy_level="therapist_shared"
         )
-        mood_entry = repos['mood'].create(mood_entry)
-        logger.info(f"Logged mood entry: {mood_entry.entry_id}")
+        mood_entry = await repos.mood.acreate(mood_entry)
+        logger.info("Logged mood entry: %s", mood_entry.entry_id)
         
         # 4. Create therapeutic journal entry
         journal_entry = JournalEntry(
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             title="Daily Reflection - Week 3",
             content="Today I practiced the thought challenging technique we discussed. When I started feeling anxious about the presentation, I wrote down my automatic thoughts and questioned their validity. I realized I was catastrophizing and was able to reframe my thinking.",
             journal_type=JournalType.THERAPEUTIC,
@@ -142,13 +193,13 @@ def clinical_workflow_demo():
             tags=["anxiety", "thought-challenging", "progress", "presentation"],
             privacy_level="therapist_shared"
         )
-        journal_entry = repos['journal'].create(journal_entry)
-        logger.info(f"Created journal entry: {journal_entry.entry_id}")
+        journal_entry = await repos.journal.acreate(journal_entry)
+        logger.info("Created journal entry: %s", journal_entry.entry_id)
         
         # 5. Schedule next therapy session
         appointment = Appointment(
-            provider_id="therapist_001",
-            patient_id="patient_001",
+            provider_id=THERAPIST_ID,
+            patient_id=PATIENT_ID,
             appointment_type=AppointmentType.THERAPY_SESSION,
             scheduled_start=datetime.now() + timedelta(days=7),
             duration_minutes=50,
@@ -162,12 +213,12 @@ def clinical_workflow_demo():
             goals=["Assess progress on treatment goals", "Introduce new CBT technique"],
             preparation_notes="Review thought records from past week"
         )
-        appointment = repos['appointment'].create(appointment)
-        logger.info(f"Scheduled appointment: {appointment.appointment_id}")
+        appointment = await repos.appointment.acreate(appointment)
+        logger.info("Scheduled appointment: %s", appointment.appointment_id)
         
         # 6. Medication management
         medication = Medication(
-            patient_id="patient_001",
+            patient_id=PATIENT_ID,
             prescribing_provider_id="psychiatrist_001",
             medication_name="Sertraline",
             generic_name="Sertraline",
@@ -181,57 +232,61 @@ def clinical_workflow_demo():
             indication="Major Depressive Disorder",
             prescriber_notes="Start with 50mg, may increase to 100mg if tolerated"
         )
-        medication = repos['medication'].create(medication)
-        logger.info(f"Added medication: {medication.medication_id}")
+        medication = await repos.medication.acreate(medication)
+        logger.info("Added medication: %s", medication.medication_id)
         
         logger.info("Clinical workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Clinical workflow failed: {e}")
+        logger.error("Clinical workflow failed: %s", e)
         return False
 
 
-def patient_engagement_demo():
+async def patient_engagement_demo(repos: MentalHealthRepositories):
     """Demonstrate patient engagement features."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('patient_engagement')
+    logger = ENGAGEMENT_LOGGER
     
     try:
         logger.info("=== Patient Engagement Demo ===")
         
         # 1. AI Chatbot conversation
-        conversation = repos['conversation'].start_conversation(
-            user_id="patient_001",
+        conversation = repos.conversation.start_conversation(
+            user_id=PATIENT_ID,
             conversation_type=ConversationType.MOOD_CHECK_IN,
             title="Daily Mood Check-in",
             context={"previous_mood": 6, "last_checkin": "yesterday"}
         )
-        logger.info(f"Started conversation: {conversation.conversation_id}")
+        logger.info("Started conversation: %s", conversation.conversation_id)
         
         # Add chat messages
-        chat_repo = repos['conversation']  # Assuming we can get the chat message repo
         user_message = ChatMessage(
             conversation_id=conversation.conversation_id,
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             sender=MessageSender.USER,
             content="I'm feeling quite anxious today about my job interview tomorrow",
-            sentiment_score=Decimal('-0.3'),
+            sentiment_score=-0.3,
             emotion_analysis={"primary": "anxiety", "secondary": "worry"}
         )
         
         bot_response = ChatMessage(
             conversation_id=conversation.conversation_id,
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             sender=MessageSender.AGENT,
             content="I understand you're feeling anxious about your interview. That's completely normal. Let's use some of the coping strategies we've discussed. Have you tried the breathing technique?",
             intent="provide_support",
             response_template="anxiety_support_template"
         )
         
+        # Persist the whole turn with a single insert
+        messages = repos.chat_message.append_messages(
+            conversation.conversation_id, [user_message, bot_response]
+        )
+        logger.info("Added %s chat messages", len(messages))
+        
         # 2. Mood pattern analysis
         mood_pattern = MoodPattern(
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             pattern_name="Weekly Anxiety Pattern",
             pattern_type="weekly",
             timeframe_days=30,
@@ -246,7 +301,7 @@ def patient_engagement_demo():
         
         # 3. Set mood improvement goals
         mood_goal = MoodGoal(
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             goal_type="average_mood",
             target_value=7.5,
             current_value=6.2,
@@ -266,14 +321,13 @@ def patient_engagement_demo():
         return True
         
     except Exception as e:
-        logger.error(f"Patient engagement demo failed: {e}")
+        logger.error("Patient engagement demo failed: %s", e)
         return False
 
 
-def care_coordination_demo():
+async def care_coordination_demo(repos: MentalHealthRepositories):
     """Demonstrate care coordination workflow."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('care_coordination')
+    logger = CARE_COORDINATION_LOGGER
     
     try:
         logger.info("=== Care Coordination Demo ===")
@@ -293,13 +347,13 @@ def care_coordination_demo():
             accepting_new_patients=True,
             languages_spoken=["English", "Spanish"]
         )
-        psychiatrist = repos['provider'].create(psychiatrist)
-        logger.info(f"Created psychiatrist: {psychiatrist.provider_id}")
+        psychiatrist = await repos.provider.acreate(psychiatrist)
+        logger.info("Created psychiatrist: %s", psychiatrist.provider_id)
         
         # 2. Create referral for medication evaluation
         referral = Referral(
-            patient_id="patient_001",
-            referring_provider_id="therapist_001",
+            patient_id=PATIENT_ID,
+            referring_provider_id=THERAPIST_ID,
             receiving_provider_id=psychiatrist.provider_id,
             referral_reason="Medication evaluation for treatment-resistant depression",
             clinical_summary="Patient has been in CBT for 8 weeks with modest improvement. PHQ-9 score remains at 15. Considering medication augmentation.",
@@ -309,14 +363,14 @@ def care_coordination_demo():
             patient_consent_obtained=True,
             release_of_information_signed=True
         )
-        referral = repos['provider'].create_referral(referral)
-        logger.info(f"Created referral: {referral.referral_id}")
+        referral = repos.provider.create_referral(referral)
+        logger.info("Created referral: %s", referral.referral_id)
         
         # 3. Create multidisciplinary care team
         care_team = CareTeam(
-            patient_id="patient_001",
+            patient_id=PATIENT_ID,
             team_name="Patient 001 Integrated Care Team",
-            primary_provider_id="therapist_001",
+            primary_provider_id=THERAPIST_ID,
             care_coordinator_id="case_manager_001",
             shared_goals=[
                 "Achieve remission of depressive symptoms",
@@ -327,35 +381,34 @@ def care_coordination_demo():
             meeting_frequency="biweekly",
             communication_plan="Weekly progress updates, urgent issues immediate contact"
         )
-        care_team = repos['provider'].create_care_team(care_team)
+        care_team = repos.provider.create_care_team(care_team)
         
         # Add team members
-        team_added = repos['provider'].add_team_member(
+        team_added = repos.provider.add_team_member(
             team_id=care_team.team_id,
             provider_id=psychiatrist.provider_id,
             role=CareTeamRole.PSYCHIATRIST
         )
         
-        logger.info(f"Created care team: {care_team.team_id}")
+        logger.info("Created care team: %s", care_team.team_id)
         logger.info("Care coordination workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Care coordination demo failed: {e}")
+        logger.error("Care coordination demo failed: %s", e)
         return False
 
 
-def crisis_management_demo():
+async def crisis_management_demo(repos: MentalHealthRepositories):
     """Demonstrate crisis detection and management."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('crisis_management')
+    logger = CRISIS_LOGGER
     
     try:
         logger.info("=== Crisis Management Demo ===")
         
         # 1. Journal entry with crisis indicators
         crisis_journal = JournalEntry(
-            user_id="patient_001",
+            user_id=PATIENT_ID,
             title="Difficult Night",
             content="I can't take this anymore. Everything feels hopeless and I keep thinking about just ending the pain. I don't see any way out of this darkness.",
             journal_type=JournalType.FREE_FORM,
@@ -366,12 +419,12 @@ def crisis_management_demo():
         )
         
         # The system would detect crisis keywords automatically
-        crisis_journal = repos['journal'].create(crisis_journal)
-        logger.info(f"Created journal entry with crisis indicators: {crisis_journal.entry_id}")
+        crisis_journal = await repos.journal.acreate(crisis_journal)
+        logger.info("Created journal entry with crisis indicators: %s", crisis_journal.entry_id)
         
         # 2. Automated crisis detection
         crisis_detection = CrisisDetection(
-            patient_id="patient_001",
+            patient_id=PATIENT_ID,
             detection_source="journal_entry",
             source_id=crisis_journal.entry_id,
             crisis_type="suicidal_ideation",
@@ -383,13 +436,13 @@ def crisis_management_demo():
             requires_immediate_attention=True,
             recommended_actions=["Contact patient immediately", "Safety assessment", "Consider hospitalization"]
         )
-        crisis_detection = repos['journal'].create_crisis_detection(crisis_detection)
-        logger.info(f"Crisis detected: {crisis_detection.detection_id}")
+        crisis_detection = repos.journal.create_crisis_detection(crisis_detection)
+        logger.info("Crisis detected: %s", crisis_detection.detection_id)
         
         # 3. Safety plan activation
         safety_plan = SafetyPlan(
-            patient_id="patient_001",
-            created_by_provider_id="therapist_001",
+            patient_id=PATIENT_ID,
+            created_by_provider_id=THERAPIST_ID,
             plan_name="Emergency Safety Plan",
             warning_signs=[
                 "Feeling hopeless",
@@ -411,8 +464,8 @@ def crisis_management_demo():
             ],
             professional_contacts=[
                 {"name": "Dr. Smith (Therapist)", "phone": "(555) 123-4567", "role": "therapist"},
-                {"name": "Crisis Hotline", "phone": "988", "role": "crisis_support"},
-                {"name": "Emergency Services", "phone": "911", "role": "emergency"}
+                CRISIS_HOTLINE_CONTACT,
+                EMERGENCY_SERVICES_CONTACT
             ],
             environmental_safety=[
                 "Remove or secure potentially harmful objects",
@@ -427,21 +480,20 @@ def crisis_management_demo():
             ],
             is_active=True
         )
-        safety_plan = repos['journal'].create_safety_plan(safety_plan)
-        logger.info(f"Safety plan activated: {safety_plan.plan_id}")
+        safety_plan = repos.journal.create_safety_plan(safety_plan)
+        logger.info("Safety plan activated: %s", safety_plan.plan_id)
         
         logger.info("Crisis management workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Crisis management demo failed: {e}")
+        logger.error("Crisis management demo failed: %s", e)
         return False
 
 
-def medication_adherence_demo():
+async def medication_adherence_demo(repos: MentalHealthRepositories):
     """Demonstrate medication adherence tracking."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('medication_adherence')
+    logger = ADHERENCE_LOGGER
     
     try:
         logger.info("=== Medication Adherence Demo ===")
@@ -449,12 +501,15 @@ def medication_adherence_demo():
         # 1. Record medication doses over a week
         medication_id = "med_sertraline_001"
         
+        # Anchor every dose time on today's 08:00 instead of re-reading the clock
+        today_8am = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+        
         # Today's dose - taken on time
         dose_today = MedicationDose(
             medication_id=medication_id,
-            patient_id="patient_001",
-            scheduled_time=datetime.now().replace(hour=8, minute=0, second=0, microsecond=0),
-            actual_time=datetime.now().replace(hour=8, minute=10, second=0, microsecond=0),
+            patient_id=PATIENT_ID,
+            scheduled_time=today_8am,
+            actual_time=today_8am + timedelta(minutes=10),
             dose_amount="50mg",
             dose_unit="mg",
             taken_as_prescribed=True,
@@ -466,9 +521,9 @@ def medication_adherence_demo():
         # Yesterday's dose - taken late
         dose_yesterday = MedicationDose(
             medication_id=medication_id,
-            patient_id="patient_001",
-            scheduled_time=datetime.now().replace(hour=8, minute=0) - timedelta(days=1),
-            actual_time=datetime.now().replace(hour=14, minute=30) - timedelta(days=1),
+            patient_id=PATIENT_ID,
+            scheduled_time=today_8am - timedelta(days=1),
+            actual_time=today_8am - timedelta(days=1) + timedelta(hours=6, minutes=30),
             dose_amount="50mg",
             dose_unit="mg",
             taken_as_prescribed=False,
@@ -480,8 +535,8 @@ def medication_adherence_demo():
         # Two days ago - missed dose
         dose_missed = MedicationDose(
             medication_id=medication_id,
-            patient_id="patient_001",
-            scheduled_time=datetime.now().replace(hour=8, minute=0) - timedelta(days=2),
+            patient_id=PATIENT_ID,
+            scheduled_time=today_8am - timedelta(days=2),
             dose_amount="50mg",
             dose_unit="mg",
             taken_as_prescribed=False,
@@ -491,10 +546,14 @@ def medication_adherence_demo():
             notes="Completely forgot - was rushing to work"
         )
         
+        # Persist the week's doses with a single multi-row insert
+        doses = repos.medication_dose.bulk_create([dose_today, dose_yesterday, dose_missed])
+        logger.info("Recorded %s medication doses", len(doses))
+        
         # 2. Calculate weekly adherence
         adherence_week = MedicationAdherence(
             medication_id=medication_id,
-            patient_id="patient_001",
+            patient_id=PATIENT_ID,
             period_start=date.today() - timedelta(days=7),
             period_end=date.today(),
             doses_prescribed=7,
@@ -520,107 +579,153 @@ def medication_adherence_demo():
         return True
         
     except Exception as e:
-        logger.error(f"Medication adherence demo failed: {e}")
+        logger.error("Medication adherence demo failed: %s", e)
         return False
 
 
-def analytics_and_reporting_demo():
+async def analytics_and_reporting_demo(repos: MentalHealthRepositories):
     """Demonstrate analytics and reporting capabilities."""
-    repos = setup_mental_health_repositories()
-    logger = get_logger('analytics_reporting')
+    logger = ANALYTICS_LOGGER
     
     try:
         logger.info("=== Analytics and Reporting Demo ===")
         
         # 1. Mood trend analysis
         logger.info("Analyzing mood trends...")
-        mood_trends = repos['mood'].analyze_mood_trends(
-            user_id="patient_001",
+        mood_trends = repos.mood.analyze_mood_trends(
+            user_id=PATIENT_ID,
             days_back=30
         )
-        logger.info(f"Mood trend direction: {mood_trends.get('trend_direction', 'stable')}")
-        logger.info(f"Average mood: {mood_trends.get('average_mood', 0):.1f}")
+        logger.info("Mood trend direction: %s", mood_trends.get('trend_direction', 'stable'))
+        logger.info("Average mood: %.1f", mood_trends.get('average_mood', 0))
         
         # 2. Treatment progress analytics
         logger.info("Analyzing treatment progress...")
-        treatment_progress = repos['treatment'].get_treatment_progress(
+        treatment_progress = repos.treatment.get_treatment_progress(
             treatment_plan_id="plan_001"
         )
-        logger.info(f"Treatment completion: {treatment_progress.get('completion_percentage', 0)}%")
-        logger.info(f"Goals achieved: {treatment_progress.get('goals_achieved', 0)}")
+        logger.info("Treatment completion: %s%%", treatment_progress.get('completion_percentage', 0))
+        logger.info("Goals achieved: %s", treatment_progress.get('goals_achieved', 0))
         
         # 3. Medication adherence analytics
         logger.info("Calculating medication adherence statistics...")
-        adherence_stats = repos['medication'].calculate_adherence_statistics(
-            patient_id="patient_001",
+        adherence_stats = repos.medication.calculate_adherence_statistics(
+            patient_id=PATIENT_ID,
             period_days=30
         )
-        logger.info(f"Overall adherence: {adherence_stats.get('average_adherence', 0):.1f}%")
-        logger.info(f"Medications tracked: {adherence_stats.get('medications_count', 0)}")
+        logger.info("Overall adherence: %.1f%%", adherence_stats.get('average_adherence', 0))
+        logger.info("Medications tracked: %s", adherence_stats.get('medications_count', 0))
         
         # 4. Appointment analytics
         logger.info("Analyzing appointment patterns...")
-        appointment_stats = repos['appointment'].get_appointment_statistics(
-            provider_id="therapist_001",
+        appointment_stats = repos.appointment.get_appointment_statistics(
+            provider_id=THERAPIST_ID,
             months_back=3
         )
-        logger.info(f"Total appointments: {appointment_stats.get('total_appointments', 0)}")
-        logger.info(f"No-show rate: {appointment_stats.get('no_show_rate', 0):.1f}%")
-        logger.info(f"Average session rating: {appointment_stats.get('average_rating', 0):.1f}")
+        logger.info("Total appointments: %s", appointment_stats.get('total_appointments', 0))
+        logger.info("No-show rate: %.1f%%", appointment_stats.get('no_show_rate', 0))
+        logger.info("Average session rating: %.1f", appointment_stats.get('average_rating', 0))
         
         # 5. Crisis detection analytics
         logger.info("Analyzing crisis detection patterns...")
-        crisis_stats = repos['journal'].get_crisis_statistics(
-            patient_id="patient_001",
+        crisis_stats = repos.journal.get_crisis_statistics(
+            patient_id=PATIENT_ID,
             period_days=90
         )
-        logger.info(f"Crisis detections: {crisis_stats.get('total_detections', 0)}")
-        logger.info(f"False positive rate: {crisis_stats.get('false_positive_rate', 0):.2f}")
+        logger.info("Crisis detections: %s", crisis_stats.get('total_detections', 0))
+        logger.info("False positive rate: %.2f", crisis_stats.get('false_positive_rate', 0))
         
         logger.info("Analytics and reporting completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Analytics and reporting demo failed: {e}")
+        logger.error("Analytics and reporting demo failed: %s", e)
         return False
 
 
-def main():
-    """Main function to run all mental health platform demos."""
+DEMOS = (
+    ("Clinical Workflow", clinical_workflow_demo),
+    ("Patient Engagement", patient_engagement_demo),
+    ("Care Coordination", care_coordination_demo),
+    ("Crisis Management", crisis_management_demo),
+    ("Medication Adherence", medication_adherence_demo),
+    ("Analytics & Reporting", analytics_and_reporting_demo)
+)
+
+STATUS_ICONS = {"SUCCESS": "✓", "SUCCESS (cached)": "✓"}
+
+# Fingerprints of demos that last passed, used by ``--cached`` runs
+DEMO_CACHE_PATH = Path(".demo_cache.json")
+
+
+def _demo_fingerprint(demo_func) -> str:
+    """Hash a demo's source so edits invalidate its cached result."""
+    return hashlib.sha1(inspect.getsource(demo_func).encode()).hexdigest()
+
+
+def _load_demo_cache() -> Dict[str, str]:
+    try:
+        return json.loads(DEMO_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+async def main(use_cache: bool = False):
+    """
+    Main function to run all mental health platform demos.
+    
+    With use_cache, demos whose source is unchanged since they last passed
+    are skipped and reported as cached.
+    """
     print("=" * 70)
     print("Mental Health Wellness Platform Repository Demonstration")
     print("=" * 70)
     
-    demos = [
-        ("Clinical Workflow", clinical_workflow_demo),
-        ("Patient Engagement", patient_engagement_demo),
-        ("Care Coordination", care_coordination_demo),
-        ("Crisis Management", crisis_management_demo),
-        ("Medication Adherence", medication_adherence_demo),
-        ("Analytics & Reporting", analytics_and_reporting_demo)
-    ]
+    fingerprints = {name: _demo_fingerprint(demo_func) for name, demo_func in DEMOS}
+    cache = _load_demo_cache() if use_cache else {}
+    pending = [(name, demo_func) for name, demo_func in DEMOS if cache.get(name) != fingerprints[name]]
     
-    results = {}
+    repos = setup_mental_health_repositories()
     
-    for name, demo_func in demos:
+    # The demos touch disjoint entities, so run them concurrently
+    outcomes = await asyncio.gather(
+        *(demo_func(repos) for _, demo_func in pending),
+        return_exceptions=True
+    )
+    outcomes = dict(zip((name for name, _ in pending), outcomes))
+    
+    results = {}
+    for name, _ in DEMOS:
         print(f"\n--- {name} Demo ---")
-        try:
-            success = demo_func()
-            results[name] = "SUCCESS" if success else "FAILED"
-            print(f"{name}: {'✓ PASSED' if success else '✗ FAILED'}")
-        except Exception as e:
-            results[name] = f"ERROR: {str(e)[:100]}"
-            print(f"{name}: ✗ ERROR - {e}")
+        if name not in outcomes:
+            results[name] = "SUCCESS (cached)"
+            print(f"{name}: ✓ PASSED (cached)")
+            continue
+        
+        outcome = outcomes[name]
+        if isinstance(outcome, Exception):
+            results[name] = f"ERROR: {str(outcome)[:100]}"
+            print(f"{name}: ✗ ERROR - {outcome}")
+        else:
+            results[name] = "SUCCESS" if outcome else "FAILED"
+            print(f"{name}: {'✓ PASSED' if outcome else '✗ FAILED'}")
+    
+    if use_cache:
+        passed = {
+            name: fingerprints[name]
+            for name, result in results.items() if result.startswith("SUCCESS")
+        }
+        DEMO_CACHE_PATH.write_text(json.dumps(passed, indent=2))
     
     print("\n" + "=" * 70)
     print("DEMONSTRATION SUMMARY")
     print("=" * 70)
     for name, result in results.items():
-        status_icon = "✓" if result == "SUCCESS" else "✗"
+        status_icon = STATUS_ICONS.get(result, "✗")
         print(f"{status_icon} {name:<30} {result}")
     
     # Calculate success rate
-    success_count = sum(1 for result in results.values() if result == "SUCCESS")
+    success_count = sum(1 for result in results.values() if result.startswith("SUCCESS"))
     total_count = len(results)
     success_rate = (success_count / total_count * 100) if total_count > 0 else 0
     
@@ -641,5 +746,5 @@ if __name__ == "__main__":
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Run the demonstration
-    main()
+    # Run the demonstration; --cached skips demos unchanged since they last passed
+    asyncio.run(main(use_cache="--cached" in sys.argv[1:]))
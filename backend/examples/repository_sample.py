@@ -7,13 +7,18 @@ and administrative entities.
 """
 
 import asyncio
+from functools import partial
 from datetime import datetime, timedelta, date, time
 from decimal import Decimal
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import logging.handlers
+import sys
+import threading
 
 # Import core infrastructure
-from backend.happypath.core import get_db_manager, get_logger
+from backend.happypath.core import get_cache_manager, get_db_manager, get_event_manager, get_logger
 
 # Import repository classes and entities
 from backend.happypath.repository import (
@@ -67,11 +72,12 @@ from backend.happypath.repository import (
     ConversationType, MessageType, MessageSender, UserRole, UserStatus,
     
     # Utilities
-    QueryOptions,
+    QueryOptions, QueryResult, set_repository_context,
     
     # Factory functions
     create_user_repository, create_audit_repository, 
-    create_subscription_repository, create_session_repository,
+    create_subscription_repository, create_subscription_plan_repository,
+    create_session_repository,
     create_therapeutic_relationship_repository, create_treatment_plan_repository,
     create_mood_entry_repository, create_journal_entry_repository,
     create_appointment_repository, create_medication_repository,
@@ -79,38 +85,98 @@ from backend.happypath.repository import (
 )
 
 
-def setup_repositories():
-    """Set up repository instances with database connection."""
-    # Get database manager and logger
-    db_manager = get_db_manager()
-    logger = get_logger('repository_sample')
+# Repository set shared by every example, built on first use
+_REPOS: Optional[Dict[str, Any]] = None
+_REPOS_LOCK = threading.Lock()
+
+# Example loggers, looked up once rather than on every call
+CLINICAL_LOGGER = get_logger('clinical_workflow')
+ENGAGEMENT_LOGGER = get_logger('patient_engagement')
+CARE_COORDINATION_LOGGER = get_logger('care_coordination')
+CRISIS_LOGGER = get_logger('crisis_management')
+ADHERENCE_LOGGER = get_logger('medication_adherence')
+QUERY_LOGGER = get_logger('query_operations')
+ANALYTICS_LOGGER = get_logger('analytics_operations')
+SAMPLE_LOGGER = get_logger('repository_sample')
+
+
+# Static example data, built once at import. Entities get their own list
+# copies because psycopg2 adapts tuples as records rather than arrays.
+_TREATMENT_GOALS = ("Reduce depression symptoms", "Improve coping skills")
+_TREATMENT_INTERVENTIONS = ("CBT techniques", "Mood tracking", "Journaling")
+_TREATMENT_TARGET_OUTCOMES = ("PHQ-9 score < 10", "Improved daily functioning")
+_APPT_AGENDA = ("Review mood tracking", "Practice CBT techniques", "Discuss progress")
+_PROVIDER_CREDENTIALS = ("MD", "Board Certified Psychiatrist")
+_SAFETY_WARNING_SIGNS = ("Feeling hopeless", "Isolating from others", "Sleep disruption")
+_SAFETY_COPING_STRATEGIES = ("Deep breathing", "Call support person", "Go for a walk")
+_SAFETY_SOCIAL_CONTACTS = (
+    {"name": "Best Friend", "phone": "(555) 999-8888", "relationship": "friend"},
+    {"name": "Sister", "phone": "(555) 777-6666", "relationship": "family"}
+)
+_SAFETY_PROFESSIONAL_CONTACTS = (
+    {"name": "Dr. Smith", "phone": "(555) 123-4567", "role": "therapist"},
+    {"name": "Crisis Hotline", "phone": "988", "role": "crisis_support"}
+)
+_SAFETY_ENVIRONMENT_STEPS = ("Remove harmful objects", "Stay with trusted person")
+
+# Active verified users for the advanced query example. QueryOptions is
+# frozen, so one instance serves every call and always yields the same
+# statement text for the prepared-statement cache.
+_ACTIVE_VERIFIED_QO = QueryOptions(
+    filters=MappingProxyType({'is_active': True, 'is_verified': True}),
+    order_by=('created_at',),
+    limit=10,
+    include_count=True,
+    prepared=True
+)
+
+
+def _query_cache():
+    """Return the shared cache for memoized repository reads, or None to read the database."""
+    try:
+        return get_cache_manager()
+    except Exception as e:
+        SAMPLE_LOGGER.warning("Query cache unavailable, reading from the database: %s", e)
+        return None
+
+
+def _build_repositories() -> Dict[str, Any]:
+    """Build repository instances with database connection."""
+    # Share one database manager, logger, query cache and event manager across every repository
+    set_repository_context(
+        get_db_manager(), SAMPLE_LOGGER,
+        query_cache=_query_cache(),
+        event_manager=get_event_manager()
+    )
     
     # Core repositories
-    user_repo = create_user_repository(db_manager, logger)
-    audit_repo = create_audit_repository(db_manager, logger)
-    subscription_repo = create_subscription_repository(db_manager, logger)
-    session_repo = create_session_repository(db_manager, logger)
+    user_repo = create_user_repository()
+    audit_repo = create_audit_repository()
+    plan_repo = create_subscription_plan_repository()
+    subscription_repo = create_subscription_repository(plan_repo=plan_repo)
+    session_repo = create_session_repository()
     
     # Clinical repositories
-    relationship_repo = create_therapeutic_relationship_repository(db_manager, logger)
-    treatment_repo = create_treatment_plan_repository(db_manager, logger)
-    mood_repo = create_mood_entry_repository(db_manager, logger)
-    journal_repo = create_journal_entry_repository(db_manager, logger)
+    relationship_repo = create_therapeutic_relationship_repository()
+    treatment_repo = create_treatment_plan_repository()
+    mood_repo = create_mood_entry_repository()
+    journal_repo = create_journal_entry_repository()
     
     # Operational repositories
-    appointment_repo = create_appointment_repository(db_manager, logger)
-    medication_repo = create_medication_repository(db_manager, logger)
+    appointment_repo = create_appointment_repository()
+    medication_repo = create_medication_repository()
     
     # Communication repositories
-    conversation_repo = create_conversation_repository(db_manager, logger)
+    conversation_repo = create_conversation_repository()
     
     # Administration repositories
-    provider_repo = create_provider_repository(db_manager, logger)
+    provider_repo = create_provider_repository()
     
     return {
         'user': user_repo,
         'audit': audit_repo,
         'subscription': subscription_repo,
+        'subscription_plan': plan_repo,
         'session': session_repo,
         'relationship': relationship_repo,
         'treatment': treatment_repo,
@@ -123,311 +189,338 @@ def setup_repositories():
     }
 
 
-def clinical_workflow_example():
+def setup_repositories() -> Dict[str, Any]:
+    """Return the shared repository instances, building them on first call."""
+    global _REPOS
+    if _REPOS is None:
+        with _REPOS_LOCK:
+            if _REPOS is None:
+                _REPOS = _build_repositories()
+    return _REPOS
+
+
+async def clinical_workflow_example() -> bool:
     """Demonstrate a complete clinical workflow."""
     repos = setup_repositories()
-    logger = get_logger('clinical_workflow')
+    logger = CLINICAL_LOGGER
+    db = get_db_manager()
     
     try:
-        # 1. Create a therapeutic relationship
-        logger.info("Creating therapeutic relationship...")
-        relationship = TherapeuticRelationship(
-            patient_id="patient_123",
-            therapist_id="therapist_456",
-            therapy_modality=TherapyModality.CBT,
-            relationship_status="active",
-            start_date=date.today()
-        )
-        relationship = repos['relationship'].create(relationship)
-        logger.info(f"Created relationship: {relationship.relationship_id}")
-        
-        # 2. Create treatment plan
-        logger.info("Creating treatment plan...")
-        treatment_plan = TreatmentPlan(
-            patient_id="patient_123",
-            therapist_id="therapist_456",
-            relationship_id=relationship.relationship_id,
-            plan_name="Depression and Anxiety Treatment",
-            primary_diagnosis="Major Depressive Disorder",
-            treatment_goals=["Reduce depression symptoms", "Improve coping skills"],
-            interventions=["CBT techniques", "Mood tracking", "Journaling"],
-            target_outcomes=["PHQ-9 score < 10", "Improved daily functioning"],
-            estimated_duration_weeks=12,
-            phase=TreatmentPhase.ACTIVE
-        )
-        treatment_plan = repos['treatment'].create(treatment_plan)
-        logger.info(f"Created treatment plan: {treatment_plan.plan_id}")
-        
-        # 3. Log mood entry
-        logger.info("Creating mood entry...")
-        mood_entry = MoodEntry(
-            user_id="patient_123",
-            mood_scale=MoodScale.ONE_TO_TEN,
-            mood_rating=6,
-            mood_type=MoodType.GENERAL,
-            contributing_factors=["Good sleep", "Exercise"],
-            notes="Feeling better today after morning walk",
-            location="Home",
-            privacy_level="private"
-        )
-        mood_entry = repos['mood'].create(mood_entry)
-        logger.info(f"Created mood entry: {mood_entry.entry_id}")
-        
-        # 4. Create journal entry
-        logger.info("Creating journal entry...")
-        journal_entry = JournalEntry(
-            user_id="patient_123",
-            title="Daily Reflection",
-            content="Today I practiced the breathing exercises we discussed. I noticed my anxiety decreased significantly.",
-            journal_type=JournalType.THERAPEUTIC,
-            cbt_technique=CBTTechnique.THOUGHT_RECORD,
-            mood_before=4,
-            mood_after=7,
-            tags=["breathing", "anxiety", "progress"],
-            privacy_level="therapist_shared"
-        )
-        journal_entry = repos['journal'].create(journal_entry)
-        logger.info(f"Created journal entry: {journal_entry.entry_id}")
-        
-        # 5. Schedule appointment
-        logger.info("Scheduling appointment...")
-        appointment = Appointment(
-            provider_id="therapist_456",
-            patient_id="patient_123",
-            appointment_type=AppointmentType.THERAPY_SESSION,
-            scheduled_start=datetime.now() + timedelta(days=7),
-            duration_minutes=50,
-            modality=AppointmentModality.TELEHEALTH,
-            agenda=["Review mood tracking", "Practice CBT techniques", "Discuss progress"]
-        )
-        appointment = repos['appointment'].create(appointment)
-        logger.info(f"Scheduled appointment: {appointment.appointment_id}")
-        
-        # 6. Track medication if applicable
-        logger.info("Adding medication...")
-        medication = Medication(
-            patient_id="patient_123",
-            prescribing_provider_id="psychiatrist_789",
-            medication_name="Sertraline",
-            generic_name="Sertraline",
-            strength="50mg",
-            dosage_form="tablet",
-            prescribed_dosage="50mg once daily",
-            prescribed_frequency="daily",
-            start_date=date.today(),
-            indication="Major Depressive Disorder"
-        )
-        medication = repos['medication'].create(medication)
-        logger.info(f"Added medication: {medication.medication_id}")
+        # Commit the example's inserts together, or none of them
+        async with db.async_transaction():
+            # 1. Create a therapeutic relationship
+            logger.info("Creating therapeutic relationship...")
+            relationship = TherapeuticRelationship(
+                patient_id="patient_123",
+                therapist_id="therapist_456",
+                therapy_modality=TherapyModality.CBT,
+                relationship_status="active",
+                start_date=date.today()
+            )
+            relationship = await repos['relationship'].acreate(relationship)
+            logger.info("Created relationship: %s", relationship.relationship_id)
+            
+            # 2. Create treatment plan
+            logger.info("Creating treatment plan...")
+            treatment_plan = TreatmentPlan(
+                patient_id="patient_123",
+                therapist_id="therapist_456",
+                relationship_id=relationship.relationship_id,
+                plan_name="Depression and Anxiety Treatment",
+                primary_diagnosis="Major Depressive Disorder",
+                treatment_goals=list(_TREATMENT_GOALS),
+                interventions=list(_TREATMENT_INTERVENTIONS),
+                target_outcomes=list(_TREATMENT_TARGET_OUTCOMES),
+                estimated_duration_weeks=12,
+                phase=TreatmentPhase.ACTIVE
+            )
+            treatment_plan = await repos['treatment'].acreate(treatment_plan)
+            logger.info("Created treatment plan: %s", treatment_plan.plan_id)
+            
+            # 3. Log mood entry
+            logger.info("Creating mood entry...")
+            mood_entry = MoodEntry(
+                user_id="patient_123",
+                mood_scale=MoodScale.ONE_TO_TEN,
+                mood_rating=6,
+                mood_type=MoodType.GENERAL,
+                contributing_factors=["Good sleep", "Exercise"],
+                notes="Feeling better today after morning walk",
+                location="Home",
+                privacy_level="private"
+            )
+            mood_entry = await repos['mood'].acreate(mood_entry)
+            logger.info("Created mood entry: %s", mood_entry.entry_id)
+            
+            # 4. Create journal entry
+            logger.info("Creating journal entry...")
+            journal_entry = JournalEntry(
+                user_id="patient_123",
+                title="Daily Reflection",
+                content="Today I practiced the breathing exercises we discussed. I noticed my anxiety decreased significantly.",
+                journal_type=JournalType.THERAPEUTIC,
+                cbt_technique=CBTTechnique.THOUGHT_RECORD,
+                mood_before=4,
+                mood_after=7,
+                tags=["breathing", "anxiety", "progress"],
+                privacy_level="therapist_shared"
+            )
+            journal_entry = await repos['journal'].acreate(journal_entry)
+            logger.info("Created journal entry: %s", journal_entry.entry_id)
+            
+            # 5. Schedule appointment
+            logger.info("Scheduling appointment...")
+            appointment = Appointment(
+                provider_id="therapist_456",
+                patient_id="patient_123",
+                appointment_type=AppointmentType.THERAPY_SESSION,
+                scheduled_start=datetime.now() + timedelta(days=7),
+                duration_minutes=50,
+                modality=AppointmentModality.TELEHEALTH,
+                agenda=list(_APPT_AGENDA)
+            )
+            appointment = await repos['appointment'].acreate(appointment)
+            logger.info("Scheduled appointment: %s", appointment.appointment_id)
+            
+            # 6. Track medication if applicable
+            logger.info("Adding medication...")
+            medication = Medication(
+                patient_id="patient_123",
+                prescribing_provider_id="psychiatrist_789",
+                medication_name="Sertraline",
+                generic_name="Sertraline",
+                strength="50mg",
+                dosage_form="tablet",
+                prescribed_dosage="50mg once daily",
+                prescribed_frequency="daily",
+                start_date=date.today(),
+                indication="Major Depressive Disorder"
+            )
+            medication = await repos['medication'].acreate(medication)
+            logger.info("Added medication: %s", medication.medication_id)
         
         logger.info("Clinical workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Clinical workflow failed: {e}")
+        logger.error("Clinical workflow failed: %s", e)
         return False
 
 
-def patient_engagement_example():
+async def patient_engagement_example() -> bool:
     """Demonstrate patient engagement features."""
     repos = setup_repositories()
-    logger = get_logger('patient_engagement')
+    logger = ENGAGEMENT_LOGGER
+    db = get_db_manager()
+    
+    def run_conversation():
+        # The conversation repositories are synchronous; one transaction
+        # keeps the conversation and its messages on a single connection
+        with db.transaction():
+            # 1. Start conversation with AI chatbot
+            logger.info("Starting AI conversation...")
+            conversation = repos['conversation'].start_conversation(
+                user_id="patient_123",
+                conversation_type=ConversationType.MOOD_CHECK_IN,
+                title="Daily Mood Check-in"
+            )
+            logger.info("Started conversation: %s", conversation.conversation_id)
+            
+            # 2. Add chat messages
+            logger.info("Adding chat messages...")
+            messages = repos['conversation'].get_chat_message_repo().add_messages_bulk(
+                conversation.conversation_id,
+                "patient_123",
+                [
+                    ("I'm feeling anxious today", MessageSender.USER),
+                    ("I understand you're feeling anxious. Can you tell me what might be contributing to this feeling?",
+                     MessageSender.AGENT)
+                ]
+            )
+            logger.info("Added %s chat messages", len(messages))
     
     try:
-        # 1. Start conversation with AI chatbot
-        logger.info("Starting AI conversation...")
-        conversation = repos['conversation'].start_conversation(
-            user_id="patient_123",
-            conversation_type=ConversationType.MOOD_CHECK_IN,
-            title="Daily Mood Check-in"
-        )
-        logger.info(f"Started conversation: {conversation.conversation_id}")
-        
-        # 2. Add chat messages
-        logger.info("Adding chat messages...")
-        user_message = repos['conversation'].get_chat_message_repo().add_message(
-            conversation_id=conversation.conversation_id,
-            user_id="patient_123",
-            content="I'm feeling anxious today",
-            sender=MessageSender.USER
-        )
-        
-        bot_response = repos['conversation'].get_chat_message_repo().add_message(
-            conversation_id=conversation.conversation_id,
-            user_id="patient_123",
-            content="I understand you're feeling anxious. Can you tell me what might be contributing to this feeling?",
-            sender=MessageSender.AGENT
-        )
-        
-        # 3. Create mood pattern analysis
-        logger.info("Analyzing mood patterns...")
-        mood_pattern = MoodPattern(
-            user_id="patient_123",
-            pattern_name="Weekly Mood Trend",
-            pattern_type="weekly",
-            average_mood=6.5,
-            mood_variance=1.2,
-            trend_direction="improving",
-            pattern_strength=0.75,
-            contributing_factors=["Exercise", "Sleep quality", "Social activities"],
-            recommendations=["Continue exercise routine", "Monitor sleep patterns"]
-        )
-        mood_pattern = repos['mood'].get_pattern_repo().create(mood_pattern)
-        logger.info(f"Created mood pattern: {mood_pattern.pattern_id}")
-        
-        # 4. Set mood goals
-        logger.info("Setting mood goals...")
-        mood_goal = MoodGoal(
-            user_id="patient_123",
-            goal_type="average_mood",
-            target_value=7.5,
-            current_value=6.5,
-            target_date=date.today() + timedelta(days=30),
-            description="Achieve average mood rating of 7.5",
-            strategies=["Daily meditation", "Regular exercise", "Journaling"],
-            milestone_rewards=["Treat myself to a movie", "Buy a new book"]
-        )
-        mood_goal = repos['mood'].get_goal_repo().create(mood_goal)
-        logger.info(f"Created mood goal: {mood_goal.goal_id}")
+        await db.run_blocking(run_conversation)
+        
+        # Commit the mood pattern and goal together, or neither of them
+        async with db.async_transaction():
+            # 3. Create mood pattern analysis
+            logger.info("Analyzing mood patterns...")
+            mood_pattern = MoodPattern(
+                user_id="patient_123",
+                pattern_name="Weekly Mood Trend",
+                pattern_type="weekly",
+                average_mood=6.5,
+                mood_variance=1.2,
+                trend_direction="improving",
+                pattern_strength=0.75,
+                contributing_factors=["Exercise", "Sleep quality", "Social activities"],
+                recommendations=["Continue exercise routine", "Monitor sleep patterns"]
+            )
+            mood_pattern = await repos['mood'].get_pattern_repo().acreate(mood_pattern)
+            logger.info("Created mood pattern: %s", mood_pattern.pattern_id)
+            
+            # 4. Set mood goals
+            logger.info("Setting mood goals...")
+            mood_goal = MoodGoal(
+                user_id="patient_123",
+                goal_type="average_mood",
+                target_value=7.5,
+                current_value=6.5,
+                target_date=date.today() + timedelta(days=30),
+                description="Achieve average mood rating of 7.5",
+                strategies=["Daily meditation", "Regular exercise", "Journaling"],
+                milestone_rewards=["Treat myself to a movie", "Buy a new book"]
+            )
+            mood_goal = await repos['mood'].get_goal_repo().acreate(mood_goal)
+            logger.info("Created mood goal: %s", mood_goal.goal_id)
         
         logger.info("Patient engagement workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Patient engagement workflow failed: {e}")
+        logger.error("Patient engagement workflow failed: %s", e)
         return False
 
 
-def care_coordination_example():
+async def care_coordination_example() -> bool:
     """Demonstrate care coordination workflow."""
     repos = setup_repositories()
-    logger = get_logger('care_coordination')
+    logger = CARE_COORDINATION_LOGGER
+    db = get_db_manager()
+    
+    def run_referral_and_membership(provider, care_team):
+        # Referral and membership writes are synchronous; run them in one
+        # transaction on a single connection once the provider is committed
+        with db.transaction():
+            # 3. Create referral
+            logger.info("Creating referral...")
+            referral = repos['provider'].get_referral_repo().create_referral(
+                patient_id="patient_123",
+                referring_provider_id="therapist_456",
+                receiving_provider_id=provider.provider_id,
+                referral_reason="Psychiatric evaluation for medication management",
+                priority=ReferralPriority.ROUTINE
+            )
+            logger.info("Created referral: %s", referral.referral_id)
+            
+            # 4. Add team members
+            repos['provider'].get_care_team_repo().add_team_member(
+                team_id=care_team.team_id,
+                provider_id=provider.provider_id,
+                role=CareTeamRole.PSYCHIATRIST
+            )
     
     try:
-        # 1. Create provider
-        logger.info("Creating healthcare provider...")
-        provider = Provider(
-            first_name="Dr. Sarah",
-            last_name="Johnson",
-            credentials=["MD", "Board Certified Psychiatrist"],
-            provider_type=ProviderType.PSYCHIATRIST,
-            license_number="MD12345",
-            license_state="CA",
-            specialty="Adult Psychiatry",
-            phone="(555) 123-4567",
-            email="dr.johnson@clinic.com",
-            accepting_new_patients=True
-        )
-        provider = repos['provider'].create(provider)
-        logger.info(f"Created provider: {provider.provider_id}")
-        
-        # 2. Create referral
-        logger.info("Creating referral...")
-        referral = repos['provider'].get_referral_repo().create_referral(
-            patient_id="patient_123",
-            referring_provider_id="therapist_456",
-            receiving_provider_id=provider.provider_id,
-            referral_reason="Psychiatric evaluation for medication management",
-            priority=ReferralPriority.ROUTINE
-        )
-        logger.info(f"Created referral: {referral.referral_id}")
-        
-        # 3. Create care team
-        logger.info("Creating care team...")
-        care_team = CareTeam(
-            patient_id="patient_123",
-            team_name="Patient 123 Care Team",
-            primary_provider_id="therapist_456",
-            shared_goals=["Symptom reduction", "Improved functioning"],
-            treatment_approach="Integrated CBT and medication management"
-        )
-        care_team = repos['provider'].get_care_team_repo().create(care_team)
-        
-        # Add team members
-        repos['provider'].get_care_team_repo().add_team_member(
-            team_id=care_team.team_id,
-            provider_id=provider.provider_id,
-            role=CareTeamRole.PSYCHIATRIST
-        )
-        logger.info(f"Created care team: {care_team.team_id}")
+        # Commit the provider and care team together, or neither of them
+        async with db.async_transaction():
+            # 1. Create provider
+            logger.info("Creating healthcare provider...")
+            provider = Provider(
+                first_name="Dr. Sarah",
+                last_name="Johnson",
+                credentials=list(_PROVIDER_CREDENTIALS),
+                provider_type=ProviderType.PSYCHIATRIST,
+                license_number="MD12345",
+                license_state="CA",
+                specialty="Adult Psychiatry",
+                phone="(555) 123-4567",
+                email="dr.johnson@clinic.com",
+                accepting_new_patients=True
+            )
+            provider = await repos['provider'].acreate(provider)
+            logger.info("Created provider: %s", provider.provider_id)
+            
+            # 2. Create care team
+            logger.info("Creating care team...")
+            care_team = CareTeam(
+                patient_id="patient_123",
+                team_name="Patient 123 Care Team",
+                primary_provider_id="therapist_456",
+                shared_goals=["Symptom reduction", "Improved functioning"],
+                treatment_approach="Integrated CBT and medication management"
+            )
+            care_team = await repos['provider'].get_care_team_repo().acreate(care_team)
+            logger.info("Created care team: %s", care_team.team_id)
+        
+        await db.run_blocking(run_referral_and_membership, provider, care_team)
         
         logger.info("Care coordination workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Care coordination workflow failed: {e}")
+        logger.error("Care coordination workflow failed: %s", e)
         return False
 
 
-def crisis_management_example():
+async def crisis_management_example() -> bool:
     """Demonstrate crisis detection and management."""
     repos = setup_repositories()
-    logger = get_logger('crisis_management')
+    logger = CRISIS_LOGGER
+    db = get_db_manager()
     
     try:
-        # 1. Crisis detection in journal entry
-        logger.info("Creating journal entry with crisis indicators...")
-        crisis_journal = JournalEntry(
-            user_id="patient_123",
-            title="Difficult Day",
-            content="I don't see the point anymore. Everything feels hopeless and I can't stop thinking about ending it all.",
-            journal_type=JournalType.FREE_FORM,
-            privacy_level="private"
-        )
-        
-        # The repository would detect crisis keywords and flag this
-        crisis_journal = repos['journal'].create(crisis_journal)
-        logger.info(f"Created journal with crisis detection: {crisis_journal.entry_id}")
-        
-        # 2. Create crisis detection record
-        logger.info("Creating crisis detection record...")
-        crisis_detection = CrisisDetection(
-            patient_id="patient_123",
-            detection_source="journal_entry",
-            source_id=crisis_journal.entry_id,
-            crisis_type="suicidal_ideation",
-            severity_level=CrisisSeverity.HIGH,
-            risk_factors=["Hopelessness", "Suicidal ideation"],
-            detected_keywords=["hopeless", "ending it all"],
-            confidence_score=0.95,
-            requires_immediate_attention=True
-        )
-        crisis_detection = repos['journal'].get_crisis_repo().create(crisis_detection)
-        logger.info(f"Created crisis detection: {crisis_detection.detection_id}")
-        
-        # 3. Create safety plan
-        logger.info("Creating safety plan...")
-        safety_plan = SafetyPlan(
-            patient_id="patient_123",
-            created_by_provider_id="therapist_456",
-            warning_signs=["Feeling hopeless", "Isolating from others", "Sleep disruption"],
-            coping_strategies=["Deep breathing", "Call support person", "Go for a walk"],
-            social_contacts=[
-                {"name": "Best Friend", "phone": "(555) 999-8888", "relationship": "friend"},
-                {"name": "Sister", "phone": "(555) 777-6666", "relationship": "family"}
-            ],
-            professional_contacts=[
-                {"name": "Dr. Smith", "phone": "(555) 123-4567", "role": "therapist"},
-                {"name": "Crisis Hotline", "phone": "988", "role": "crisis_support"}
-            ],
-            environmental_safety=["Remove harmful objects", "Stay with trusted person"],
-            is_active=True
-        )
-        safety_plan = repos['journal'].get_safety_plan_repo().create(safety_plan)
-        logger.info(f"Created safety plan: {safety_plan.plan_id}")
+        # Commit the example's inserts together, or none of them
+        async with db.async_transaction():
+            # 1. Crisis detection in journal entry
+            logger.info("Creating journal entry with crisis indicators...")
+            crisis_journal = JournalEntry(
+                user_id="patient_123",
+                title="Difficult Day",
+                content="I don't see the point anymore. Everything feels hopeless and I can't stop thinking about ending it all.",
+                journal_type=JournalType.FREE_FORM,
+                privacy_level="private"
+            )
+            
+            # The repository scans the content for active crisis keywords and flags them
+            crisis_journal = await repos['journal'].acreate(crisis_journal)
+            logger.info("Created journal with crisis detection: %s", crisis_journal.entry_id)
+            logger.info("Risk indicators: %s", crisis_journal.risk_indicators)
+            
+            # 2. Create crisis detection record
+            logger.info("Creating crisis detection record...")
+            crisis_detection = CrisisDetection(
+                patient_id="patient_123",
+                detection_source="journal_entry",
+                source_id=crisis_journal.entry_id,
+                crisis_type="suicidal_ideation",
+                severity_level=CrisisSeverity.HIGH,
+                risk_factors=["Hopelessness", "Suicidal ideation"],
+                detected_keywords=["hopeless", "ending it all"],
+                confidence_score=0.95,
+                requires_immediate_attention=True
+            )
+            crisis_detection = await repos['journal'].get_crisis_repo().acreate(crisis_detection)
+            logger.info("Created crisis detection: %s", crisis_detection.detection_id)
+            
+            # 3. Create safety plan
+            logger.info("Creating safety plan...")
+            safety_plan = SafetyPlan(
+                patient_id="patient_123",
+                created_by_provider_id="therapist_456",
+                warning_signs=list(_SAFETY_WARNING_SIGNS),
+                coping_strategies=list(_SAFETY_COPING_STRATEGIES),
+                social_contacts=list(_SAFETY_SOCIAL_CONTACTS),
+                professional_contacts=list(_SAFETY_PROFESSIONAL_CONTACTS),
+                environmental_safety=list(_SAFETY_ENVIRONMENT_STEPS),
+                is_active=True
+            )
+            safety_plan = await repos['journal'].get_safety_plan_repo().acreate(safety_plan)
+            logger.info("Created safety plan: %s", safety_plan.plan_id)
         
         logger.info("Crisis management workflow completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Crisis management workflow failed: {e}")
+        logger.error("Crisis management workflow failed: %s", e)
         return False
 
 
-def medication_adherence_example():
+async def medication_adherence_example() -> bool:
     """Demonstrate medication adherence tracking."""
     repos = setup_repositories()
-    logger = get_logger('medication_adherence')
+    logger = ADHERENCE_LOGGER
+    db = get_db_manager()
     
     try:
         # 1. Get existing medication
@@ -435,29 +528,31 @@ def medication_adherence_example():
         
         # 2. Record medication doses
         logger.info("Recording medication doses...")
+        today_8am = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
         dose1 = MedicationDose(
             medication_id="med_123",
             patient_id="patient_123",
-            scheduled_time=datetime.now().replace(hour=8, minute=0, second=0, microsecond=0),
-            actual_time=datetime.now().replace(hour=8, minute=15, second=0, microsecond=0),
+            scheduled_time=today_8am,
+            actual_time=today_8am + timedelta(minutes=15),
             dose_amount="50mg",
             taken_as_prescribed=True,
             taken_status="taken",
             adherence_percentage=100.0
         )
-        dose1 = repos['medication'].get_dose_repo().create(dose1)
         
         dose2 = MedicationDose(
             medication_id="med_123",
             patient_id="patient_123",
-            scheduled_time=datetime.now().replace(hour=8, minute=0, second=0, microsecond=0) - timedelta(days=1),
+            scheduled_time=today_8am - timedelta(days=1),
             dose_amount="50mg",
             taken_as_prescribed=False,
             taken_status="missed",
             adherence_percentage=0.0,
             notes="Forgot to take medication"
         )
-        dose2 = repos['medication'].get_dose_repo().create(dose2)
+        # bulk_create is synchronous and commits on its own connection
+        doses = await db.run_blocking(repos['medication'].get_dose_repo().bulk_create, [dose1, dose2])
+        logger.info("Recorded %s medication doses", len(doses))
         
         # 3. Calculate adherence
         logger.info("Calculating medication adherence...")
@@ -475,166 +570,198 @@ def medication_adherence_example():
             barriers_to_adherence=["Forgetfulness"],
             improvement_suggestions=["Set daily reminder", "Use pill organizer"]
         )
-        adherence = repos['medication'].get_adherence_repo().create(adherence)
-        logger.info(f"Created adherence record: {adherence.adherence_id}")
+        adherence = await repos['medication'].get_adherence_repo().acreate(adherence)
+        logger.info("Created adherence record: %s", adherence.adherence_id)
         
         logger.info("Medication adherence tracking completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Medication adherence tracking failed: {e}")
+        logger.error("Medication adherence tracking failed: %s", e)
         return False
 
 
-def demonstrate_query_operations():
+async def demonstrate_query_operations() -> bool:
     """Demonstrate advanced query operations."""
     repos = setup_repositories()
-    logger = get_logger('query_operations')
+    logger = QUERY_LOGGER
+    db = get_db_manager()
+    
+    def run_queries() -> Tuple[QueryResult, int, QueryResult]:
+        # One pinned connection for every query, so prepared statements are reused
+        with db.transaction():
+            now = datetime.now()
+            
+            # Get recent mood entries with specific criteria
+            mood_options = QueryOptions(
+                filters={
+                    'user_id': 'patient_123',
+                    'mood_rating__gte': 7,  # Mood rating >= 7
+                    'created_at__gte': now - timedelta(days=30)
+                },
+                order_by=['-created_at'],
+                limit=10,
+                prepared=True
+            )
+            recent_good_moods = repos['mood'].list_all(mood_options)
+            
+            # Get appointments by status
+            appointment_options = QueryOptions(
+                filters={
+                    'status__in': ['scheduled', 'confirmed'],
+                    'scheduled_start__gte': now
+                },
+                order_by=['scheduled_start']
+            )
+            # Unbounded and only counted, so stream it rather than load every row
+            upcoming_count = sum(1 for _ in repos['appointment'].stream_all(appointment_options))
+            
+            # Get journal entries with specific tags
+            journal_options = QueryOptions(
+                filters={
+                    'user_id': 'patient_123',
+                    'tags__contains': 'anxiety'  # Contains 'anxiety' tag
+                },
+                order_by=['-created_at'],
+                limit=5,
+                prepared=True
+            )
+            anxiety_journals = repos['journal'].list_all(journal_options)
+            
+            return recent_good_moods, upcoming_count, anxiety_journals
     
     try:
         # 1. Complex filtering
         logger.info("Demonstrating complex queries...")
-        
-        # Get recent mood entries with specific criteria
-        mood_options = QueryOptions(
-            filters={
-                'user_id': 'patient_123',
-                'mood_rating__gte': 7,  # Mood rating >= 7
-                'created_at__gte': datetime.now() - timedelta(days=30)
-            },
-            order_by=['-created_at'],
-            limit=10
-        )
-        recent_good_moods = repos['mood'].list_all(mood_options)
-        logger.info(f"Found {len(recent_good_moods.data)} recent good mood entries")
-        
-        # Get appointments by status
-        appointment_options = QueryOptions(
-            filters={
-                'status__in': ['scheduled', 'confirmed'],
-                'scheduled_start__gte': datetime.now()
-            },
-            order_by=['scheduled_start']
-        )
-        upcoming_appointments = repos['appointment'].list_all(appointment_options)
-        logger.info(f"Found {len(upcoming_appointments.data)} upcoming appointments")
-        
-        # Get journal entries with specific tags
-        journal_options = QueryOptions(
-            filters={
-                'user_id': 'patient_123',
-                'tags__contains': 'anxiety'  # Contains 'anxiety' tag
-            },
-            order_by=['-created_at'],
-            limit=5
-        )
-        anxiety_journals = repos['journal'].list_all(journal_options)
-        logger.info(f"Found {len(anxiety_journals.data)} anxiety-related journal entries")
+        # The queries are synchronous; run them on the I/O executor so the other examples keep going
+        recent_good_moods, upcoming_count, anxiety_journals = await db.run_blocking(run_queries)
+        logger.info("Found %s recent good mood entries", len(recent_good_moods.data))
+        logger.info("Found %s upcoming appointments", upcoming_count)
+        logger.info("Found %s anxiety-related journal entries", len(anxiety_journals.data))
         
         logger.info("Query operations completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Query operations failed: {e}")
+        logger.error("Query operations failed: %s", e)
         return False
 
 
-def demonstrate_analytics_operations():
+async def demonstrate_analytics_operations() -> bool:
     """Demonstrate analytics and reporting operations."""
     repos = setup_repositories()
-    logger = get_logger('analytics_operations')
+    logger = ANALYTICS_LOGGER
+    db = get_db_manager()
+    
+    def run_analytics() -> Tuple[Dict[str, Any], ...]:
+        # One pinned connection for all four reports instead of a pool checkout each
+        with db.transaction():
+            # 1. Mood analytics
+            logger.info("Generating mood analytics...")
+            mood_trends = repos['mood'].calculate_mood_trends(user_id="patient_123", days=30)
+            
+            # 2. Treatment progress analytics
+            logger.info("Analyzing treatment progress...")
+            treatment_progress = repos['treatment'].get_treatment_progress(treatment_plan_id="plan_123")
+            
+            # 3. Medication adherence analytics
+            logger.info("Calculating medication adherence...")
+            adherence_stats = repos['medication'].calculate_adherence_statistics(
+                patient_id="patient_123",
+                period_days=30
+            )
+            
+            # 4. Appointment analytics
+            logger.info("Analyzing appointment patterns...")
+            appointment_stats = repos['appointment'].get_appointment_statistics(
+                provider_id="therapist_456",
+                months_back=3
+            )
+            
+            return mood_trends, treatment_progress, adherence_stats, appointment_stats
     
     try:
-        # 1. Mood analytics
-        logger.info("Generating mood analytics...")
-        mood_trends = repos['mood'].analyze_mood_trends(
-            user_id="patient_123",
-            days_back=30
-        )
-        logger.info(f"Mood trend: {mood_trends.get('trend_direction', 'stable')}")
-        
-        # 2. Treatment progress analytics
-        logger.info("Analyzing treatment progress...")
-        treatment_progress = repos['treatment'].get_treatment_progress(
-            treatment_plan_id="plan_123"
-        )
-        logger.info(f"Treatment completion: {treatment_progress.get('completion_percentage', 0)}%")
-        
-        # 3. Medication adherence analytics
-        logger.info("Calculating medication adherence...")
-        adherence_stats = repos['medication'].calculate_adherence_statistics(
-            patient_id="patient_123",
-            period_days=30
-        )
-        logger.info(f"Overall adherence: {adherence_stats.get('average_adherence', 0):.1f}%")
-        
-        # 4. Appointment analytics
-        logger.info("Analyzing appointment patterns...")
-        appointment_stats = repos['appointment'].get_appointment_statistics(
-            provider_id="therapist_456",
-            months_back=3
-        )
-        logger.info(f"No-show rate: {appointment_stats.get('no_show_rate', 0):.1f}%")
+        mood_trends, treatment_progress, adherence_stats, appointment_stats = await db.run_blocking(run_analytics)
+        logger.info("Mood trend: %s", mood_trends.get('trend_direction', 'stable'))
+        logger.info("Treatment completion: %s%%", treatment_progress.get('completion_percentage', 0))
+        logger.info("Overall adherence: %.1f%%", adherence_stats.get('average_adherence', 0))
+        logger.info("No-show rate: %.1f%%", appointment_stats.get('no_show_rate', 0))
         
         logger.info("Analytics operations completed successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Analytics operations failed: {e}")
+        logger.error("Analytics operations failed: %s", e)
         return False
 
 
-def main():
-    """Main function to run all examples."""
-    print("=" * 60)
-    print("Mental Health Wellness Platform Repository Examples")
-    print("=" * 60)
-    
-    examples = [
-        ("Clinical Workflow", clinical_workflow_example),
-        ("Patient Engagement", patient_engagement_example),
-        ("Care Coordination", care_coordination_example),
-        ("Crisis Management", crisis_management_example),
-        ("Medication Adherence", medication_adherence_example),
-        ("Query Operations", demonstrate_query_operations),
-        ("Analytics Operations", demonstrate_analytics_operations)
-    ]
-    
-    results = {}
-    
-    for name, example_func in examples:
-        print(f"\n--- Running {name} Example ---")
-        try:
-            success = example_func()
-            results[name] = "SUCCESS" if success else "FAILED"
-            print(f"{name}: {'✓' if success else '✗'}")
-        except Exception as e:
-            results[name] = f"ERROR: {e}"
-            print(f"{name}: ✗ (Error: {e})")
+def demonstrate_user_operations(user_repo: UserRepository, audit_repo: AuditRepository) -> Optional[User]:
+    """Demonstrate user repository operations."""
+    SAMPLE_LOGGER.info("=== User Repository Operations ===")
     
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-    for name, result in results.items():
-        print(f"{name:<25} {result}")
-    
-    # Overall success rate
-    success_count = sum(1 for result in results.values() if result == "SUCCESS")
-    total_count = len(results)
-    print(f"\nOverall Success Rate: {success_count}/{total_count} ({success_count/total_count*100:.1f}%)")
+    try:
+        # Create a new user
+        SAMPLE_LOGGER.info("Creating user...")
+        user = user_repo.create_user(
+            email="john.doe@example.com",
+            username="johndoe",
+            password="SecurePassword123!",
+            first_name="John",
+            last_name="Doe",
+            timezone="America/Los_Angeles"
+        )
+        SAMPLE_LOGGER.info(f"Created user: {user.full_name()} (ID: {user.id})")
+        
+        # Log user creation
+        audit_repo.log_user_action(
+            user_id=user.id,
+            action=AuditAction.CREATE.value,
+            resource_type="user",
+            resource_id=str(user.id),
+            details={"email": user.email, "username": user.username}
+        )
+        
+        # Authenticate user
+        SAMPLE_LOGGER.info("Authenticating user...")
+        authenticated = user_repo.authenticate_user("johndoe", "SecurePassword123!")
+        if authenticated:
+            SAMPLE_LOGGER.info(f"Authentication successful for: {authenticated.username}")
+        
+        # Verify the account
+        user = user_repo.verify_user(user.id)
+        SAMPLE_LOGGER.info(f"User verified: {user.is_verified}")
+        
+        return user
+        
+    except Exception as e:
+        SAMPLE_LOGGER.error(f"Error in user operations: {e}")
+        return None
 
 
-if __name__ == "__main__":
-    main()
+def demonstrate_subscription_operations(
+    user: User,
+    subscription_repo: SubscriptionRepository,
+    plan_repo: SubscriptionPlanRepository,
+    audit_repo: AuditRepository
+) -> Optional[Subscription]:
+    """Demonstrate subscription repository operations."""
+    SAMPLE_LOGGER.info("=== Subscription Repository Operations ===")
+    
+    try:
+        # Create subscription plans
+        SAMPLE_LOGGER.info("Creating subscription plans...")
+        
+        # Basic plan
+        basic_plan = SubscriptionPlan(
+            name="Basic Plan",
+            description="Essential mental wellness tools",
+            price=Decimal('9.99'),
+            billing_cycle=BillingCycle.MONTHLY.value,
             features=["mood_tracking", "basic_analytics", "daily_checkins"],
             limits={"journal_entries_per_month": 50, "ai_sessions_per_month": 5},
             trial_days=7
         )
         
-        plan_repo = SubscriptionPlanRepository(subscription_repo.db, subscription_repo.logger)
-        created_basic_plan = plan_repo.create(basic_plan)
-        print(f"Created plan: {created_basic_plan.name} - ${created_basic_plan.price}/month")
-        
         # Premium plan
         premium_plan = SubscriptionPlan(
             name="Premium Plan",
@@ -646,18 +773,22 @@ if __name__ == "__main__":
             trial_days=14
         )
         
-        created_premium_plan = plan_repo.create(premium_plan)
-        print(f"Created plan: {created_premium_plan.name} - ${created_premium_plan.price}/month")
+        # Both plans go in with a single INSERT
+        created_basic_plan, created_premium_plan = plan_repo.create_many(
+            [basic_plan, premium_plan]
+        )
+        for created_plan in (created_basic_plan, created_premium_plan):
+            SAMPLE_LOGGER.info(f"Created plan: {created_plan.name} - ${created_plan.price}/month")
         
         # Create subscription for user
-        print("Creating subscription for user...")
+        SAMPLE_LOGGER.info("Creating subscription for user...")
         subscription = subscription_repo.create_subscription(
             user_id=user.id,
             plan_id=created_basic_plan.id,
             start_trial=True
         )
-        print(f"Created subscription: {subscription.id} (Status: {subscription.status})")
-        print(f"Trial ends: {subscription.trial_end}")
+        SAMPLE_LOGGER.info(f"Created subscription: {subscription.id} (Status: {subscription.status})")
+        SAMPLE_LOGGER.info(f"Trial ends: {subscription.trial_end}")
         
         # Log subscription creation
         audit_repo.log_user_action(
@@ -668,44 +799,46 @@ if __name__ == "__main__":
             details={
                 "plan_id": subscription.plan_id,
                 "status": subscription.status,
-                "trial_end": subscription.trial_end.isoformat() if subscription.trial_end else None
+                "trial_end": subscription.trial_end
             }
         )
         
-        # Get user subscription
-        user_subscription = subscription_repo.get_user_subscription(user.id)
-        print(f"User subscription status: {user_subscription.status}")
-        print(f"Days until trial end: {user_subscription.days_until_trial_end()}")
+        # Get user subscription together with its plan
+        user_subscription, current_plan = subscription_repo.get_user_subscription_with_plan(user.id)
+        SAMPLE_LOGGER.info(f"User subscription status: {user_subscription.status} ({current_plan.name})")
+        SAMPLE_LOGGER.info(f"Days until trial end: {user_subscription.days_until_trial_end()}")
         
         # Upgrade subscription
-        print("Upgrading subscription...")
+        SAMPLE_LOGGER.info("Upgrading subscription...")
         upgraded_subscription = subscription_repo.upgrade_subscription(
             subscription.id, 
             created_premium_plan.id,
             prorate=True
         )
-        print(f"Upgraded to plan: {upgraded_subscription.plan_id}")
+        SAMPLE_LOGGER.info(f"Upgraded to plan: {upgraded_subscription.plan_id}")
         
         # Get subscription history
         history = subscription_repo.get_user_subscription_history(user.id)
-        print(f"User has {len(history)} subscription records")
+        SAMPLE_LOGGER.info(f"User has {len(history)} subscription records")
         
         return subscription
         
     except Exception as e:
-        print(f"Error in subscription operations: {e}")
+        SAMPLE_LOGGER.error(f"Error in subscription operations: {e}")
         return None
 
 
-def demonstrate_session_operations(user: User):
+def demonstrate_session_operations(
+    user: User,
+    session_repo: SessionRepository,
+    audit_repo: AuditRepository
+) -> Optional[UserSession]:
     """Demonstrate session repository operations."""
-    print("\n=== Session Repository Operations ===")
-    
-    _, audit_repo, _, session_repo = setup_repositories()
+    SAMPLE_LOGGER.info("=== Session Repository Operations ===")
     
     try:
         # Create user session
-        print("Creating user session...")
+        SAMPLE_LOGGER.info("Creating user session...")
         session = session_repo.create_session(
             user_id=user.id,
             ip_address="192.168.1.100",
@@ -718,9 +851,9 @@ def demonstrate_session_operations(user: User):
             location={"country": "US", "state": "CA", "city": "San Francisco"},
             is_remember_me=False
         )
-        print(f"Created session: {session.id}")
-        print(f"Session token: {session.token[:20]}...")
-        print(f"Risk score: {session.risk_score}")
+        SAMPLE_LOGGER.info(f"Created session: {session.id}")
+        SAMPLE_LOGGER.info(f"Session token: {session.token[:20]}...")
+        SAMPLE_LOGGER.info(f"Risk score: {session.risk_score}")
         
         # Log session creation
         audit_repo.log_security_event(
@@ -735,13 +868,13 @@ def demonstrate_session_operations(user: User):
         )
         
         # Validate session
-        print("Validating session...")
+        SAMPLE_LOGGER.info("Validating session...")
         validated_session = session_repo.validate_session(session.token)
         if validated_session:
-            print(f"Session validation successful: {validated_session.id}")
+            SAMPLE_LOGGER.info(f"Session validation successful: {validated_session.id}")
         
         # Update session data
-        print("Updating session data...")
+        SAMPLE_LOGGER.info("Updating session data...")
         session_repo.update_session_data(session.id, {
             "last_page": "/dashboard",
             "feature_flags": ["premium_ui", "beta_features"],
@@ -750,10 +883,10 @@ def demonstrate_session_operations(user: User):
         
         # Get user sessions
         user_sessions = session_repo.get_user_sessions(user.id, active_only=True)
-        print(f"User has {len(user_sessions)} active sessions")
+        SAMPLE_LOGGER.info(f"User has {len(user_sessions)} active sessions")
         
         # Extend session
-        print("Extending session...")
+        SAMPLE_LOGGER.info("Extending session...")
         session_repo.extend_session(session.id, timedelta(hours=12))
         
         # Create additional session (different device)
@@ -769,224 +902,305 @@ def demonstrate_session_operations(user: User):
             location={"country": "US", "state": "CA", "city": "Los Angeles"},
             is_remember_me=True
         )
-        print(f"Created mobile session: {mobile_session.id}")
+        SAMPLE_LOGGER.info(f"Created mobile session: {mobile_session.id}")
         
         # Get session analytics
-        print("Generating session analytics...")
+        SAMPLE_LOGGER.info("Generating session analytics...")
         analytics = session_repo.generate_session_analytics(
             start_date=datetime.utcnow() - timedelta(days=30)
         )
-        print(f"Analytics - Total sessions: {analytics.total_sessions}")
-        print(f"Analytics - Unique users: {analytics.unique_users}")
-        print(f"Analytics - Suspicious sessions: {analytics.suspicious_sessions}")
+        SAMPLE_LOGGER.info(f"Analytics - Total sessions: {analytics.total_sessions}")
+        SAMPLE_LOGGER.info(f"Analytics - Unique users: {analytics.unique_users}")
+        SAMPLE_LOGGER.info(f"Analytics - Suspicious sessions: {analytics.suspicious_sessions}")
         
         return session
         
     except Exception as e:
-        print(f"Error in session operations: {e}")
+        SAMPLE_LOGGER.error(f"Error in session operations: {e}")
         return None
 
 
-def demonstrate_audit_operations(user: User):
+def demonstrate_audit_operations(user: User, audit_repo: AuditRepository) -> bool:
     """Demonstrate audit repository operations."""
-    print("\n=== Audit Repository Operations ===")
-    
-    _, audit_repo, _, _ = setup_repositories()
+    SAMPLE_LOGGER.info("=== Audit Repository Operations ===")
     
     try:
-        # Log various audit events
-        print("Logging audit events...")
-        
-        # User action
-        audit_repo.log_user_action(
-            user_id=user.id,
-            action=AuditAction.READ.value,
-            resource_type="profile",
-            resource_id=str(user.id),
-            details={"section": "personal_info"}
-        )
-        
-        # System event
-        audit_repo.log_system_event(
-            action="backup_completed",
-            resource_type="database",
-            details={"backup_size": "2.5GB", "duration": "45 minutes"}
-        )
-        
-        # Security event
-        audit_repo.log_security_event(
-            action="failed_login",
-            user_id=user.id,
-            ip_address="192.168.1.100",
-            details={"reason": "invalid_password", "attempt_count": 3},
-            success=False
-        )
-        
-        # Data modification with old/new values
-        audit_repo.log_audit_event(
-            user_id=user.id,
-            action=AuditAction.UPDATE.value,
-            resource_type="user",
-            resource_id=str(user.id),
-            old_values={"first_name": "John", "email": "john.doe@example.com"},
-            new_values={"first_name": "Jonathan", "email": "john.doe@example.com"},
-            level=AuditLevel.MEDIUM.value,
-            compliance_category="general"
-        )
-        
-        print("Logged various audit events")
+        # Log various audit events in one round-trip
+        SAMPLE_LOGGER.info("Logging audit events...")
+        audit_repo.log_audit_events([
+            # User action
+            AuditEntry(
+                user_id=user.id,
+                action=AuditAction.READ.value,
+                resource_type="profile",
+                resource_id=str(user.id),
+                details={"section": "personal_info"},
+                compliance_category="general"
+            ),
+            # System event
+            AuditEntry(
+                action="backup_completed",
+                resource_type="database",
+                details={"backup_size": "2.5GB", "duration": "45 minutes"},
+                compliance_category="system"
+            ),
+            # Security event
+            AuditEntry(
+                user_id=user.id,
+                action="failed_login",
+                resource_type="security",
+                ip_address="192.168.1.100",
+                details={"reason": "invalid_password", "attempt_count": 3},
+                level=AuditLevel.HIGH.value,
+                success=False,
+                compliance_category="security"
+            ),
+            # Data modification with old/new values
+            AuditEntry(
+                user_id=user.id,
+                action=AuditAction.UPDATE.value,
+                resource_type="user",
+                resource_id=str(user.id),
+                old_values={"first_name": "John", "email": "john.doe@example.com"},
+                new_values={"first_name": "Jonathan", "email": "john.doe@example.com"},
+                level=AuditLevel.MEDIUM.value,
+                compliance_category="general"
+            )
+        ])
+        
+        SAMPLE_LOGGER.info("Logged various audit events")
         
         # Query audit logs
-        print("Querying audit logs...")
+        SAMPLE_LOGGER.info("Querying audit logs...")
         
         from backend.happypath.repository.audit_repository import AuditQuery
         
         # Get user's audit trail
         user_trail = audit_repo.get_user_audit_trail(user.id, limit=10)
-        print(f"User audit trail: {len(user_trail)} entries")
+        SAMPLE_LOGGER.info(f"User audit trail: {len(user_trail)} entries")
         
         # Get security events
         security_events = audit_repo.get_security_events(
             start_time=datetime.utcnow() - timedelta(hours=24),
             limit=5
         )
-        print(f"Recent security events: {len(security_events)} entries")
+        SAMPLE_LOGGER.info(f"Recent security events: {len(security_events)} entries")
         
         # Get failed actions
         failed_actions = audit_repo.get_failed_actions(
             start_time=datetime.utcnow() - timedelta(hours=24),
             limit=5
         )
-        print(f"Failed actions: {len(failed_actions)} entries")
+        SAMPLE_LOGGER.error(f"Failed actions: {len(failed_actions)} entries")
         
         # Generate audit summary
-        print("Generating audit summary...")
+        SAMPLE_LOGGER.info("Generating audit summary...")
         summary = audit_repo.generate_audit_summary(
             start_time=datetime.utcnow() - timedelta(days=7),
             end_time=datetime.utcnow()
         )
-        print(f"Audit summary - Total entries: {summary.total_entries}")
-        print(f"Audit summary - Success rate: {summary.success_rate:.2%}")
-        print(f"Audit summary - Actions breakdown: {summary.actions_breakdown}")
+        SAMPLE_LOGGER.info(f"Audit summary - Total entries: {summary.total_entries}")
+        SAMPLE_LOGGER.info(f"Audit summary - Success rate: {summary.success_rate:.2%}")
+        SAMPLE_LOGGER.info(f"Audit summary - Actions breakdown: {summary.actions_breakdown}")
         
         # Export audit data
-        print("Exporting audit data...")
+        SAMPLE_LOGGER.info("Exporting audit data...")
         query = AuditQuery(
             user_id=user.id,
             start_time=datetime.utcnow() - timedelta(days=1),
             limit=100
         )
         
-        json_export = audit_repo.export_audit_data(query, format="json")
-        print(f"Exported audit data: {len(json_export)} characters")
+        # Streamed in chunks, so only one batch of rows is held at a time
+        export_size = sum(len(chunk) for chunk in audit_repo.stream_audit_export(query))
+        SAMPLE_LOGGER.info(f"Exported audit data: {export_size} bytes")
         
         return True
         
     except Exception as e:
-        print(f"Error in audit operations: {e}")
+        SAMPLE_LOGGER.error(f"Error in audit operations: {e}")
         return False
 
 
-def demonstrate_advanced_queries():
+async def demonstrate_advanced_queries(
+    user_repo: UserRepository,
+    subscription_repo: SubscriptionRepository,
+    session_repo: SessionRepository
+) -> bool:
     """Demonstrate advanced query capabilities."""
-    print("\n=== Advanced Query Operations ===")
+    SAMPLE_LOGGER.info("=== Advanced Query Operations ===")
     
-    user_repo, audit_repo, subscription_repo, session_repo = setup_repositories()
+    db = get_db_manager()
     
     try:
-        # Advanced user queries
-        print("Advanced user queries...")
-        
-        # Get premium users
-        premium_users = user_repo.get_premium_users(limit=10)
-        print(f"Premium users: {len(premium_users)}")
-        
-        # Get users by signup date
-        recent_users = user_repo.get_users_by_signup_date(
-            start_date=datetime.utcnow() - timedelta(days=30)
+        # None of the reads depend on each other, so run them side by side
+        # on the I/O executor; the wait is the slowest query, not the sum
+        SAMPLE_LOGGER.info("Running user, subscription and session queries concurrently...")
+        (
+            premium_users,
+            recent_users,
+            expiring_subs,
+            trial_subs,
+            suspicious_sessions,
+            active_sessions,
+            result
+        ) = await asyncio.gather(
+            db.run_blocking(partial(user_repo.get_premium_users, limit=10)),
+            db.run_blocking(partial(
+                user_repo.get_users_by_signup_date,
+                start_date=datetime.utcnow() - timedelta(days=30)
+            )),
+            db.run_blocking(partial(subscription_repo.get_expiring_subscriptions, days=7)),
+            db.run_blocking(partial(
+                subscription_repo.get_subscriptions_by_status,
+                SubscriptionStatus.TRIAL.value,
+                limit=20
+            )),
+            db.run_blocking(partial(session_repo.get_suspicious_sessions, limit=10)),
+            db.run_blocking(partial(session_repo.get_active_sessions, limit=20)),
+            db.run_blocking(user_repo.list_all, _ACTIVE_VERIFIED_QO)
         )
-        print(f"Users signed up in last 30 days: {len(recent_users)}")
         
-        # Advanced subscription queries
-        print("Advanced subscription queries...")
-        
-        # Get expiring subscriptions
-        expiring_subs = subscription_repo.get_expiring_subscriptions(days=7)
-        print(f"Subscriptions expiring in next 7 days: {len(expiring_subs)}")
+        # Advanced user queries
+        SAMPLE_LOGGER.info(f"Premium users: {len(premium_users)}")
+        SAMPLE_LOGGER.info(f"Users signed up in last 30 days: {len(recent_users)}")
         
-        # Get subscriptions by status
-        trial_subs = subscription_repo.get_subscriptions_by_status(
-            SubscriptionStatus.TRIAL.value, 
-            limit=20
-        )
-        print(f"Trial subscriptions: {len(trial_subs)}")
+        # Advanced subscription queries
+        SAMPLE_LOGGER.info(f"Subscriptions expiring in next 7 days: {len(expiring_subs)}")
+        SAMPLE_LOGGER.info(f"Trial subscriptions: {len(trial_subs)}")
         
         # Advanced session queries
-        print("Advanced session queries...")
-        
-        # Get suspicious sessions
-        suspicious_sessions = session_repo.get_suspicious_sessions(limit=10)
-        print(f"Suspicious sessions: {len(suspicious_sessions)}")
-        
-        # Get active sessions
-        active_sessions = session_repo.get_active_sessions(limit=20)
-        print(f"Active sessions: {len(active_sessions)}")
-        
-        # Custom query with QueryOptions
-        print("Custom queries with QueryOptions...")
+        SAMPLE_LOGGER.info(f"Suspicious sessions: {len(suspicious_sessions)}")
+        SAMPLE_LOGGER.info(f"Active sessions: {len(active_sessions)}")
         
-        # Find users with specific criteria
-        query_options = QueryOptions(
-            filters={
-                'is_active': True,
-                'is_verified': True
-            },
-            order_by=['created_at'],
-            limit=10,
-            include_count=True
+        # Load the session owners with one id = ANY(...) query instead of one per session
+        session_users = await db.run_blocking(
+            user_repo.get_many,
+            {session.user_id for session in suspicious_sessions + active_sessions}
         )
+        SAMPLE_LOGGER.info(f"Users with active or suspicious sessions: {len(session_users)}")
         
-        result = user_repo.list_all(query_options)
-        print(f"Active verified users: {len(result.data)} (Total: {result.total_count})")
+        # Custom query with QueryOptions
+        SAMPLE_LOGGER.info(f"Active verified users: {len(result.data)} (Total: {result.total_count})")
         
         return True
         
     except Exception as e:
-        print(f"Error in advanced queries: {e}")
+        SAMPLE_LOGGER.error(f"Error in advanced queries: {e}")
         return False
 
 
-def demonstrate_repository_pattern():
+async def demonstrate_repository_pattern() -> None:
     """Main demonstration of repository pattern usage."""
-    print("Repository Pattern Demonstration")
-    print("=" * 50)
+    SAMPLE_LOGGER.info("Repository Pattern Demonstration")
+    SAMPLE_LOGGER.info("=" * 50)
+    
+    # Every demonstration shares the same repositories and connection pool
+    repos = setup_repositories()
+    user_repo = repos['user']
+    audit_repo = repos['audit']
+    subscription_repo = repos['subscription']
+    plan_repo = repos['subscription_plan']
+    session_repo = repos['session']
     
     try:
         # Create a user first
-        user = demonstrate_user_operations()
+        user = demonstrate_user_operations(user_repo, audit_repo)
         if not user:
-            print("Failed to create user, skipping other demonstrations")
+            SAMPLE_LOGGER.error("Failed to create user, skipping other demonstrations")
             return
         
         # Demonstrate other operations
-        demonstrate_subscription_operations(user)
-        demonstrate_session_operations(user)
-        demonstrate_audit_operations(user)
-        demonstrate_advanced_queries()
+        demonstrate_subscription_operations(user, subscription_repo, plan_repo, audit_repo)
+        demonstrate_session_operations(user, session_repo, audit_repo)
+        demonstrate_audit_operations(user, audit_repo)
+        await demonstrate_advanced_queries(user_repo, subscription_repo, session_repo)
         
-        print("\n" + "=" * 50)
-        print("Repository pattern demonstration completed successfully!")
+        SAMPLE_LOGGER.info("=" * 50)
+        SAMPLE_LOGGER.info("Repository pattern demonstration completed successfully!")
         
     except Exception as e:
-        print(f"Error in demonstration: {e}")
+        SAMPLE_LOGGER.error(f"Error in demonstration: {e}")
+
+
+async def main() -> None:
+    """Main function to run all examples."""
+    SAMPLE_LOGGER.info("=" * 60)
+    SAMPLE_LOGGER.info("Mental Health Wellness Platform Repository Examples")
+    SAMPLE_LOGGER.info("=" * 60)
+    
+    examples = [
+        ("Clinical Workflow", clinical_workflow_example),
+        ("Patient Engagement", patient_engagement_example),
+        ("Care Coordination", care_coordination_example),
+        ("Crisis Management", crisis_management_example),
+        ("Medication Adherence", medication_adherence_example),
+        ("Query Operations", demonstrate_query_operations),
+        ("Analytics Operations", demonstrate_analytics_operations)
+    ]
+    
+    # The examples are independent, so overlap their database round-trips
+    outcomes = await asyncio.gather(
+        *(example_func() for _, example_func in examples),
+        return_exceptions=True
+    )
+    
+    # One pass builds the per-example output, the summary lines and the tally
+    success_count = 0
+    summary_lines = []
+    
+    for (name, _), outcome in zip(examples, outcomes):
+        SAMPLE_LOGGER.info(f"--- {name} Example ---")
+        if isinstance(outcome, Exception):
+            status = f"ERROR: {outcome}"
+            SAMPLE_LOGGER.info(f"{name}: ✗ (Error: {outcome})")
+        else:
+            status = "SUCCESS" if outcome else "FAILED"
+            success_count += bool(outcome)
+            SAMPLE_LOGGER.info(f"{name}: {'✓' if outcome else '✗'}")
+        summary_lines.append(f"{name:<25} {status}")
+    
+    SAMPLE_LOGGER.info("=" * 60)
+    SAMPLE_LOGGER.info("SUMMARY")
+    SAMPLE_LOGGER.info("=" * 60)
+    SAMPLE_LOGGER.info("\n".join(summary_lines))
+    
+    # Overall success rate
+    total_count = len(summary_lines)
+    SAMPLE_LOGGER.info(f"Overall Success Rate: {success_count}/{total_count} ({success_count/total_count*100:.1f}%)")
+    
+    # Core repository demonstration, on the same event loop and pools
+    await demonstrate_repository_pattern()
+    
+    # Repository writes only queue their change events; handle and store them in one batch
+    processed = await get_event_manager().process_pending_events()
+    SAMPLE_LOGGER.info(f"Processed {processed} repository change events")
+
+
+def setup_logging() -> None:
+    """
+    Send sample output through a buffered root handler.
+    
+    Records are held in a MemoryHandler and written to stdout in batches of
+    up to 1000, or immediately on ERROR, instead of flushing stdout per line.
+    Pending records are flushed at interpreter exit by logging.shutdown.
+    """
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=1000,
+        flushLevel=logging.ERROR,
+        target=console_handler
+    ))
 
 
 if __name__ == "__main__":
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    setup_logging()
     
-    # Run demonstration
-    demonstrate_repository_pattern()
+    # Run the examples, then the core repository demonstration
+    asyncio.run(main())
@@ -19,17 +19,10 @@ Components:
 __version__ = "1.0.0"
 __author__ = "Happy Path Development Team"
 
-# Core component imports
-from .database import DatabaseManager, get_db_connection, execute_query
-from .logging import get_logger, setup_logging, LogLevel
-from .monitoring import HealthChecker, MetricsCollector, PerformanceMonitor
-from .auditing import AuditLogger, SecurityAuditor, ComplianceTracker
-from .config import Config, get_config, Environment
-from .security import SecurityManager, TokenManager, EncryptionService
-from .cache import CacheManager, cache_key, invalidate_cache
-from .events import EventManager, event_handler, publish_event
+import importlib
+from typing import Any
 
-# Core exceptions
+# Core exceptions (dependency-free, imported eagerly)
 from .exceptions import (
     HappyPathError,
     DatabaseError,
@@ -40,30 +33,112 @@ from .exceptions import (
     AuditError
 )
 
+# Core components are imported on first attribute access (PEP 562), so
+# importing the package does not pull in psycopg2, redis, bcrypt, etc.
+# until the component that needs them is actually used.
+_LAZY_ATTRIBUTES = {
+    # Database
+    'DatabaseManager': 'database',
+    'get_db_manager': 'database',
+    'get_db_connection': 'database',
+    'execute_query': 'database',
+    'execute_transaction': 'database',
+    'query_builder': 'database',
+    
+    # Logging
+    'get_logger': 'logging',
+    'setup_logging': 'logging',
+    'LogLevel': 'logging',
+    
+    # Monitoring
+    'HealthChecker': 'monitoring',
+    'MetricsCollector': 'monitoring',
+    'PerformanceMonitor': 'monitoring',
+    'get_health_checker': 'monitoring',
+    'get_metrics_collector': 'monitoring',
+    'get_performance_monitor': 'monitoring',
+    
+    # Auditing
+    'AuditLogger': 'auditing',
+    'SecurityAuditor': 'auditing',
+    'ComplianceTracker': 'auditing',
+    'get_audit_logger': 'auditing',
+    'get_security_auditor': 'auditing',
+    'get_compliance_tracker': 'auditing',
+    
+    # Configuration
+    'Config': 'config',
+    'get_config': 'config',
+    'initialize_config': 'config',
+    'Environment': 'config',
+    
+    # Security
+    'SecurityManager': 'security',
+    'TokenManager': 'security',
+    'EncryptionService': 'security',
+    'get_security_manager': 'security',
+    'get_token_manager': 'security',
+    'get_encryption_service': 'security',
+    'get_permission_manager': 'security',
+    
+    # Cache
+    'CacheManager': 'cache',
+    'cache_key': 'cache',
+    'invalidate_cache': 'cache',
+    'get_cache_manager': 'cache',
+    
+    # Events
+    'EventManager': 'events',
+    'event_handler': 'events',
+    'publish_event': 'events',
+    'get_event_manager': 'events',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import core components lazily on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     # Database
-    'DatabaseManager', 'get_db_connection', 'execute_query',
+    'DatabaseManager', 'get_db_manager', 'get_db_connection', 'execute_query',
+    'execute_transaction', 'query_builder',
     
     # Logging
     'get_logger', 'setup_logging', 'LogLevel',
     
     # Monitoring
     'HealthChecker', 'MetricsCollector', 'PerformanceMonitor',
+    'get_health_checker', 'get_metrics_collector', 'get_performance_monitor',
     
     # Auditing
     'AuditLogger', 'SecurityAuditor', 'ComplianceTracker',
+    'get_audit_logger', 'get_security_auditor', 'get_compliance_tracker',
     
     # Configuration
-    'Config', 'get_config', 'Environment',
+    'Config', 'get_config', 'initialize_config', 'Environment',
     
     # Security
     'SecurityManager', 'TokenManager', 'EncryptionService',
+    'get_security_manager', 'get_token_manager', 'get_encryption_service',
+    'get_permission_manager',
     
     # Cache
-    'CacheManager', 'cache_key', 'invalidate_cache',
+    'CacheManager', 'cache_key', 'invalidate_cache', 'get_cache_manager',
     
     # Events
-    'EventManager', 'event_handler', 'publish_event',
+    'EventManager', 'event_handler', 'publish_event', 'get_event_manager',
     
     # Exceptions
     'HappyPathError', 'DatabaseError', 'ConfigurationError',
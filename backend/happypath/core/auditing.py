@@ -3,21 +3,109 @@ Auditing and compliance system for the Happy Path platform.
 Provides comprehensive audit logging, security monitoring, and compliance tracking.
 """
 
-import json
+import atexit
 import hashlib
+import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import orjson
 
 from .config import get_config
 from .database import get_db_manager, execute_query, execute_transaction
-from .logging import get_logger
+from .cache import CacheManager, get_cache_manager
+from .logging import get_logger, get_queued_logger
 from .exceptions import AuditError
 
 logger = get_logger(__name__)
 
+AUDIT_LOG_COLUMNS = [
+    "audit_id", "event_type", "user_id", "session_id", "ip_address", "user_agent",
+    "timestamp", "severity", "description", "details", "resource_type", "resource_id",
+    "old_values", "new_values", "success", "error_message"
+]
+
+# Single-row insert, run as a prepared statement with values in column order
+_AUDIT_INSERT = (
+    f"INSERT INTO audit_logs ({', '.join(AUDIT_LOG_COLUMNS)}) "
+    f"VALUES ({', '.join(f'%({column})s' for column in AUDIT_LOG_COLUMNS)})"
+)
+
+# Queued in place of an event to stop the audit writer thread
+_STOP_WRITER = object()
+
+# Reconnect backoff for the audit writer's dedicated connection, in seconds
+_WRITER_RECONNECT_MIN = 0.5
+_WRITER_RECONNECT_MAX = 30.0
+
+
+class _UUID7Generator:
+    """
+    Time-ordered UUIDv7 event IDs.
+    
+    IDs sort by creation time, so audit_id inserts append to the right edge
+    of the primary key index instead of landing on random pages. Random bits
+    are sliced from a buffered os.urandom pool rather than one syscall per
+    ID, and a 12-bit sequence keeps IDs from one process strictly increasing
+    within a millisecond.
+    """
+    
+    def __init__(self, pool_size: int = 16 * 1024):
+        self._pool_size = pool_size
+        self._pool = b""
+        self._offset = 0
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence > 0xFFF:
+                    self._last_ms += 1
+                    self._sequence = 0
+            
+            if self._offset + 8 > len(self._pool):
+                self._pool = os.urandom(self._pool_size)
+                self._offset = 0
+            random_bits = int.from_bytes(self._pool[self._offset:self._offset + 8], "big")
+            self._offset += 8
+            
+            timestamp_ms, sequence = self._last_ms, self._sequence
+        
+        value = (
+            (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+            | 0x7 << 76
+            | sequence << 64
+            | 0b10 << 62
+            | random_bits & 0x3FFF_FFFF_FFFF_FFFF
+        )
+        return str(uuid.UUID(int=value))
+
+
+_new_event_id = _UUID7Generator()
+
+
+def _encode_json(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Encode a details/before/after payload for its JSON column; empty payloads become NULL."""
+    if not value:
+        return None
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class AuditEventType(Enum):
     """Types of audit events."""
@@ -82,6 +170,70 @@ class AuditSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Cache each member's string value on the member itself; Enum.value is a
+# descriptor lookup, and these are read for every logged event
+for _enum in (AuditEventType, AuditSeverity):
+    for _member in _enum:
+        _member._str = _member.value
+
+# GDPR report categories, as stored event_type strings
+_DATA_ACCESS_VALUES = frozenset(e.value for e in (
+    AuditEventType.DATA_READ, AuditEventType.DATA_WRITE,
+    AuditEventType.DATA_UPDATE, AuditEventType.DATA_DELETE
+))
+_CONSENT_VALUES = frozenset(e.value for e in (
+    AuditEventType.PRIVACY_CONSENT_GIVEN, AuditEventType.PRIVACY_CONSENT_WITHDRAWN
+))
+_PRIVACY_VALUES = frozenset(e.value for e in (
+    AuditEventType.PRIVACY_DATA_REQUEST, AuditEventType.PRIVACY_DATA_DELETION,
+    AuditEventType.PRIVACY_DATA_PORTABILITY
+))
+_GDPR_EVENT_TYPES = [
+    e for e in AuditEventType
+    if e.value in _DATA_ACCESS_VALUES or e.value in _CONSENT_VALUES or e.value in _PRIVACY_VALUES
+]
+
+# Event types summarized by SecurityAuditor.generate_security_report
+_SECURITY_REPORT_VALUES = [e.value for e in (
+    AuditEventType.SECURITY_LOGIN_FAILED, AuditEventType.SECURITY_ACCOUNT_LOCKED,
+    AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY, AuditEventType.SECURITY_PASSWORD_RESET
+)]
+
+_SECURITY_REPORT_QUERY = """
+    WITH events AS (
+        SELECT event_type, user_id, ip_address
+        FROM audit_logs
+        WHERE event_type = ANY(%(event_types)s) AND timestamp >= %(start_date)s
+    ),
+    failed_by_user AS (
+        SELECT user_id, COUNT(*) AS failed_count
+        FROM events
+        WHERE event_type = %(failed_login)s AND user_id IS NOT NULL
+        GROUP BY user_id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM events) AS total_security_events,
+        (SELECT COUNT(DISTINCT ip_address) FROM events) AS unique_ip_addresses,
+        (SELECT COUNT(*) FROM failed_by_user) AS users_with_failed_logins,
+        (
+            SELECT json_object_agg(event_type, event_count)
+            FROM (SELECT event_type, COUNT(*) AS event_count FROM events GROUP BY event_type) counts
+        ) AS event_counts,
+        (
+            SELECT json_agg(json_build_array(user_id, failed_count) ORDER BY failed_count DESC)
+            FROM (SELECT * FROM failed_by_user ORDER BY failed_count DESC LIMIT 10) top_users
+        ) AS top_failed_login_users
+"""
+
+# LOW events are the bulk of the volume; production log levels filter them out
+_LOG_LEVELS = {
+    AuditSeverity.LOW: logging.DEBUG,
+    AuditSeverity.MEDIUM: logging.WARNING,
+    AuditSeverity.HIGH: logging.ERROR,
+    AuditSeverity.CRITICAL: logging.CRITICAL
+}
+
+
 @dataclass
 class AuditEvent:
     """Audit event data structure."""
@@ -101,15 +253,55 @@ class AuditEvent:
     after_data: Optional[Dict[str, Any]] = None
     success: bool = True
     error_message: Optional[str] = None
+    # audit_logs column values in AUDIT_LOG_COLUMNS order, encoded when the
+    # event is built so the writer only passes them on
+    row: Tuple[Any, ...] = field(default=(), repr=False, compare=False)
+    # Set by the writer once a caller waiting on this event can proceed
+    written: Optional[threading.Event] = field(default=None, repr=False, compare=False)
+    write_error: Optional[Exception] = field(default=None, repr=False, compare=False)
 
 
 class AuditLogger:
-    """Comprehensive audit logging system."""
+    """
+    Comprehensive audit logging system.
+    
+    log_event() only queues the event; a background writer thread stores it,
+    logs it and runs the registered handlers, so callers never wait on the
+    database. The writer collects up to audit.max_rows queued events, waiting
+    at most audit.flush_interval_ms, and stores them with one multi-row
+    INSERT. When the queue is full, or after close(), the event is written
+    inline instead of being dropped. Call flush() to wait for queued events
+    to be written, or pass wait_timeout to log_event() to wait for just that
+    event; both raise AuditError for events that failed to store. close()
+    also runs at interpreter exit so queued events are not lost.
+    
+    The writer owns one connection outside the pool, so it never competes
+    with request threads for a checkout and keeps its prepared insert. If
+    that connection cannot be opened the writer uses the pool and retries
+    with exponential backoff.
+    """
     
     def __init__(self):
         self.config = get_config()
         self.db_manager = get_db_manager()
         self._event_handlers: Dict[AuditEventType, List[callable]] = {}
+        self._has_handlers = False
+        self._event_log = get_queued_logger(f"{__name__}.events")
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=self.config.audit.queue_size)
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._failed_writes = 0
+        self._writer_connection = None
+        self._writer_backoff = 0.0
+        self._writer_retry_at = 0.0
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="happy-path-audit-writer",
+            daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
     
     def log_event(
         self,
@@ -126,23 +318,25 @@ class AuditLogger:
         before_data: Optional[Dict[str, Any]] = None,
         after_data: Optional[Dict[str, Any]] = None,
         success: bool = True,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        wait_timeout: Optional[float] = None
     ) -> str:
-        """Log an audit event."""
+        """
+        Log an audit event.
         
-        event_id = str(uuid.uuid4())
+        With wait_timeout, block until the writer has stored this event (not
+        the whole queue), for at most that many seconds.
+        """
         
-        event = AuditEvent(
-            event_id=event_id,
+        event = self._build_event(
             event_type=event_type,
             user_id=user_id,
             session_id=session_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            timestamp=datetime.now(timezone.utc),
             severity=severity,
-            description=description or self._get_default_description(event_type),
-            details=details or {},
+            description=description,
+            details=details,
             resource_type=resource_type,
             resource_id=resource_id,
             before_data=before_data,
@@ -150,68 +344,323 @@ class AuditLogger:
             success=success,
             error_message=error_message
         )
+        if wait_timeout is not None:
+            event.written = threading.Event()
+        
+        with self._state_lock:
+            queued = False
+            if not self._closed:
+                try:
+                    self._queue.put_nowait(event)
+                    queued = True
+                except queue.Full:
+                    logger.warning("Audit queue full, writing event inline")
+        
+        if queued:
+            if wait_timeout is not None:
+                self._wait_for(event, wait_timeout)
+            return event.event_id
         
         try:
-            # Store in database
-            self._store_audit_event(event)
+            self._write_event(event)
+            return event.event_id
             
-            # Log to application logger
-            log_level = self._get_log_level(severity)
-            logger.log(
-                log_level,
-                f"Audit Event: {event_type.value} - {description}",
-                extra_data={
-                    "audit_event_id": event_id,
-                    "event_type": event_type.value,
-                    "user_id": user_id,
-                    "severity": severity.value,
-                    "success": success
-                }
-            )
+        except Exception as e:
+            logger.error(f"Failed to log audit event: {e}")
+            raise AuditError(f"Audit logging failed: {e}")
+    
+    def flush(self):
+        """
+        Block until every queued audit event has been written.
+        
+        Raises AuditError if any event failed to store since the last flush.
+        """
+        self._queue.join()
+        
+        with self._state_lock:
+            failed, self._failed_writes = self._failed_writes, 0
+        if failed:
+            raise AuditError(f"{failed} audit events failed to write")
+    
+    def close(self):
+        """Write the queued audit events and stop the writer thread."""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        # Outside the lock: on a full queue this waits for the writer, which
+        # takes the lock itself to record failed writes
+        self._queue.put(_STOP_WRITER)
+        self._writer.join()
+        atexit.unregister(self.close)
+    
+    def _wait_for(self, event: AuditEvent, timeout: float):
+        """Wait for the writer to finish with one event, raising if it failed to store."""
+        if not event.written.wait(timeout):
+            logger.warning(f"Timed out after {timeout}s waiting for audit event {event.event_id}")
+            return
+        if event.write_error is not None:
+            raise AuditError(f"Audit logging failed: {event.write_error}")
+    
+    def _mark_written(self, event: AuditEvent, error: Optional[Exception] = None):
+        """Record the outcome of a queued event and release any caller waiting on it."""
+        if error is not None:
+            event.write_error = error
+            with self._state_lock:
+                self._failed_writes += 1
+        if event.written is not None:
+            event.written.set()
+    
+    def _writer_loop(self):
+        """Write queued audit events in batches until close() is called."""
+        max_rows = self.config.audit.max_rows
+        flush_interval = self.config.audit.flush_interval_ms / 1000
+        
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + flush_interval
+            while len(batch) < max_rows and batch[-1] is not _STOP_WRITER:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
             
-            # Call registered event handlers
-            self._call_event_handlers(event)
+            events = [event for event in batch if event is not _STOP_WRITER]
+            try:
+                if events:
+                    self._write_events(events)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            
+            if len(events) != len(batch):
+                self._close_writer_connection()
+                return
+    
+    def _write_events(self, events: List[AuditEvent]):
+        """Store a batch of queued events, then log them and notify handlers."""
+        try:
+            with self._writer_session():
+                self._store_audit_events(events)
+        except Exception as e:
+            # One bad row fails the whole INSERT; retry singly to keep the rest
+            logger.error(f"Failed to write batch of {len(events)} audit events, retrying singly: {e}")
+            for event in events:
+                try:
+                    with self._writer_session():
+                        self._store_audit_event(event)
+                except Exception as e:
+                    logger.error(f"Failed to write audit event {event.event_id}: {e}")
+                    self._mark_written(event, e)
+                    continue
+                self._after_store(event)
+                self._mark_written(event)
+            return
+        
+        for event in events:
+            self._after_store(event)
+            self._mark_written(event)
+    
+    @contextmanager
+    def _writer_session(self):
+        """Run the block's queries on the writer connection and commit them, or on the pool."""
+        connection = self._get_writer_connection()
+        if connection is None:
+            yield
+            return
+        
+        try:
+            with self.db_manager.use_connection(connection):
+                yield
+        except Exception:
+            if connection.closed:
+                self._close_writer_connection()
+            raise
+    
+    def _get_writer_connection(self):
+        """Return the writer's open connection, reconnecting unless backing off."""
+        if self._writer_connection is not None and not self._writer_connection.closed:
+            return self._writer_connection
+        self._writer_connection = None
+        
+        now = time.monotonic()
+        if now < self._writer_retry_at:
+            return None
+        
+        options = {} if self.config.audit.synchronous_commit else {"options": "-c synchronous_commit=off"}
+        try:
+            self._writer_connection = self.db_manager.create_connection(**options)
+        except Exception as e:
+            self._writer_backoff = min(max(self._writer_backoff * 2, _WRITER_RECONNECT_MIN), _WRITER_RECONNECT_MAX)
+            self._writer_retry_at = now + self._writer_backoff
+            logger.warning(f"Audit writer connection failed, using the pool for {self._writer_backoff:.1f}s: {e}")
+            return None
+        
+        self._writer_backoff = 0.0
+        return self._writer_connection
+    
+    def _close_writer_connection(self):
+        """Close the writer's dedicated connection, if open."""
+        connection, self._writer_connection = self._writer_connection, None
+        if connection is not None and not connection.closed:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close audit writer connection: {e}")
+    
+    def _write_event(self, event: AuditEvent):
+        """Store one audit event, then log it and notify handlers."""
+        self._store_audit_event(event)
+        self._after_store(event)
+    
+    def log_events_batch(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Log multiple audit events in a single database round-trip.
+        
+        Each item takes the same keyword arguments as log_event(). All rows
+        are written in one transaction, so either every event is stored or
+        none is.
+        """
+        if not events:
+            return []
+        
+        try:
+            audit_events = [self._build_event(**event) for event in events]
+        except TypeError as e:
+            raise AuditError(f"Invalid audit event in batch: {e}")
+        
+        try:
+            self._store_audit_events(audit_events)
+            
+            for event in audit_events:
+                self._after_store(event)
             
-            return event_id
+            return [event.event_id for event in audit_events]
             
         except Exception as e:
-            logger.error(f"Failed to log audit event: {e}")
-            raise AuditError(f"Audit logging failed: {e}")
+            logger.error(f"Failed to log audit event batch: {e}")
+            raise AuditError(f"Batch audit logging failed: {e}")
     
-    def _store_audit_event(self, event: AuditEvent):
-        """Store audit event in database."""
-        query = """
-            INSERT INTO audit_logs (
-                audit_id, event_type, user_id, session_id, ip_address, user_agent,
-                timestamp, severity, description, details, resource_type, resource_id,
-                before_data, after_data, success, error_message
-            ) VALUES (
-                %(audit_id)s, %(event_type)s, %(user_id)s, %(session_id)s, %(ip_address)s, %(user_agent)s,
-                %(timestamp)s, %(severity)s, %(description)s, %(details)s, %(resource_type)s, %(resource_id)s,
-                %(before_data)s, %(after_data)s, %(success)s, %(error_message)s
+    def _build_event(
+        self,
+        event_type: AuditEventType,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        severity: AuditSeverity = AuditSeverity.MEDIUM,
+        description: str = "",
+        details: Optional[Dict[str, Any]] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        before_data: Optional[Dict[str, Any]] = None,
+        after_data: Optional[Dict[str, Any]] = None,
+        success: bool = True,
+        error_message: Optional[str] = None
+    ) -> AuditEvent:
+        """
+        Create an audit event with generated ID and timestamp.
+        
+        The column row is encoded here, on the caller's thread, so payload
+        dicts the caller changes after logging cannot alter the queued event.
+        """
+        event = AuditEvent(
+            event_id=_new_event_id(),
+            event_type=event_type,
+            user_id=user_id,
+            session_id=session_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            timestamp=datetime.now(timezone.utc),
+            severity=severity,
+            description=description or self._get_default_description(event_type),
+            details=details or {},
+            resource_type=resource_type,
+            resource_id=resource_id,
+            before_data=before_data,
+            after_data=after_data,
+            success=success,
+            error_message=error_message
+        )
+        event.row = self._event_row(event)
+        return event
+    
+    def _after_store(self, event: AuditEvent):
+        """Log a stored audit event and notify registered handlers."""
+        # Log to application logger; skip building the record entirely when
+        # the level is filtered, and leave formatting to the handlers
+        log_level = self._get_log_level(event.severity)
+        if self._event_log.isEnabledFor(log_level):
+            self._event_log.log(
+                log_level,
+                "Audit Event: %s - %s",
+                event.event_type._str,
+                event.description,
+                extra={"extra_data": {
+                    "audit_event_id": event.event_id,
+                    "event_type": event.event_type._str,
+                    "user_id": event.user_id,
+                    "severity": event.severity._str,
+                    "success": event.success
+                }}
             )
+        
+        # Call registered event handlers; none are registered in most deployments
+        if self._has_handlers:
+            self._call_event_handlers(event)
+    
+    def _store_audit_event(self, event: AuditEvent):
         """
+        Store audit event in database.
         
-        params = {
-            "audit_id": event.event_id,
-            "event_type": event.event_type.value,
-            "user_id": event.user_id,
-            "session_id": event.session_id,
-            "ip_address": event.ip_address,
-            "user_agent": event.user_agent,
-            "timestamp": event.timestamp,
-            "severity": event.severity.value,
-            "description": event.description,
-            "details": json.dumps(event.details) if event.details else None,
-            "resource_type": event.resource_type,
-            "resource_id": event.resource_id,
-            "before_data": json.dumps(event.before_data) if event.before_data else None,
-            "after_data": json.dumps(event.after_data) if event.after_data else None,
-            "success": event.success,
-            "error_message": event.error_message
-        }
+        The insert is prepared once per connection, so each event skips
+        parsing and planning; a reconnected connection is prepared again.
+        """
+        self.db_manager.execute_prepared(_AUDIT_INSERT, event.row, fetch_all=False)
+    
+    def _store_audit_events(self, events: List[AuditEvent]):
+        """
+        Store several audit events with one multi-row insert.
         
-        execute_query(query, params, fetch_all=False)
+        Batches of at least audit.bulk_copy_threshold events are streamed
+        with COPY instead, which skips per-statement parsing entirely.
+        """
+        if len(events) == 1:
+            self._store_audit_event(events[0])
+            return
+        
+        rows = [event.row for event in events]
+        
+        if len(rows) >= self.config.audit.bulk_copy_threshold:
+            self.db_manager.copy_records("audit_logs", AUDIT_LOG_COLUMNS, rows)
+            return
+        
+        self.db_manager.execute_batch_insert(
+            "audit_logs", AUDIT_LOG_COLUMNS, rows,
+            page_size=max(self.config.audit.max_rows, 1)
+        )
+    
+    def _event_row(self, event: AuditEvent) -> Tuple[Any, ...]:
+        """Convert an audit event into audit_logs column values, in AUDIT_LOG_COLUMNS order."""
+        return (
+            event.event_id,
+            event.event_type._str,
+            event.user_id,
+            event.session_id,
+            event.ip_address,
+            event.user_agent,
+            event.timestamp,
+            event.severity._str,
+            event.description,
+            _encode_json(event.details),
+            event.resource_type,
+            event.resource_id,
+            _encode_json(event.before_data),
+            _encode_json(event.after_data),
+            event.success,
+            event.error_message
+        )
     
     def _get_default_description(self, event_type: AuditEventType) -> str:
         """Get default description for event type."""
@@ -228,29 +677,22 @@ class AuditLogger:
             AuditEventType.PAYMENT_PROCESSED: "Payment processed",
             AuditEventType.CRISIS_DETECTED: "Crisis situation detected"
         }
-        return descriptions.get(event_type, f"Event: {event_type.value}")
+        return descriptions.get(event_type, f"Event: {event_type._str}")
     
     def _get_log_level(self, severity: AuditSeverity) -> int:
         """Convert audit severity to logging level."""
-        import logging
-        levels = {
-            AuditSeverity.LOW: logging.INFO,
-            AuditSeverity.MEDIUM: logging.WARNING,
-            AuditSeverity.HIGH: logging.ERROR,
-            AuditSeverity.CRITICAL: logging.CRITICAL
-        }
-        return levels.get(severity, logging.INFO)
+        return _LOG_LEVELS.get(severity, logging.INFO)
     
     def register_event_handler(self, event_type: AuditEventType, handler: callable):
         """Register a handler for specific audit events."""
         if event_type not in self._event_handlers:
             self._event_handlers[event_type] = []
         self._event_handlers[event_type].append(handler)
+        self._has_handlers = True
     
     def _call_event_handlers(self, event: AuditEvent):
         """Call registered event handlers."""
-        handlers = self._event_handlers.get(event.event_type, [])
-        for handler in handlers:
+        for handler in self._event_handlers.get(event.event_type, ()):
             try:
                 handler(event)
             except Exception as e:
@@ -321,37 +763,200 @@ class SecurityAuditor:
         self.audit_logger = audit_logger
         self.failed_login_threshold = 5
         self.suspicious_activity_window = 3600  # 1 hour in seconds
+        self.failed_login_write_timeout = 2.0  # seconds to wait for a failed login to be stored
+        self.max_tracked_failure_keys = 10000
+        
+        # Recent failure times per ("user", id) and ("ip", address), least
+        # recently failed first, so most failed logins never reach the database
+        self._recent_failures: "OrderedDict[Tuple[str, str], deque]" = OrderedDict()
+        self._failures_lock = threading.Lock()
+        self._last_failure_sweep = time.monotonic()
+        
+        # Shared failed-login windows in Redis; None while Redis is unavailable,
+        # retried every failure_cache_retry_interval seconds
+        self.failure_cache_retry_interval = 60.0
+        self._failure_cache: Optional[CacheManager] = None
+        self._failure_cache_retry_at = 0.0
     
     def track_login_attempt(self, user_id: str, ip_address: str, user_agent: str, success: bool):
         """Track login attempts for security monitoring."""
         event_type = AuditEventType.USER_LOGIN if success else AuditEventType.SECURITY_LOGIN_FAILED
         severity = AuditSeverity.LOW if success else AuditSeverity.MEDIUM
         
-        self.audit_logger.log_event(
+        # Check for suspicious activity against the failures of all workers,
+        # counted in Redis when available and in the database otherwise.
+        # This process's own recent failures are a lower bound on that count,
+        # so once they reach the threshold the database query is skipped;
+        # below it the query waits for this attempt's own row to be stored
+        local_count = 0
+        wait_timeout = None
+        if not success:
+            local_count = self._record_failure(user_id, ip_address)
+            if self._get_failure_cache() is None and local_count < self.failed_login_threshold:
+                wait_timeout = self.failed_login_write_timeout
+        
+        event_id = self.audit_logger.log_event(
             event_type=event_type,
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
             severity=severity,
-            success=success
+            success=success,
+            wait_timeout=wait_timeout
         )
         
-        # Check for suspicious activity
         if not success:
-            self._check_failed_login_pattern(user_id, ip_address)
+            self._check_failed_login_pattern(user_id, ip_address, event_id, local_count)
+    
+    def _get_failure_cache(self) -> Optional[CacheManager]:
+        """Return the cache manager for failed-login windows, or None while Redis is unavailable."""
+        if self._failure_cache is None and time.monotonic() >= self._failure_cache_retry_at:
+            try:
+                self._failure_cache = get_cache_manager()
+            except Exception as e:
+                self._mark_failure_cache_unavailable(e)
+        return self._failure_cache
     
-    def _check_failed_login_pattern(self, user_id: str, ip_address: str):
+    def _mark_failure_cache_unavailable(self, error: Exception):
+        """Fall back to the database until the next retry interval."""
+        logger.warning(f"Redis unavailable, counting failed logins in the database: {error}")
+        self._failure_cache = None
+        self._failure_cache_retry_at = time.monotonic() + self.failure_cache_retry_interval
+    
+    def _record_failure(self, user_id: str, ip_address: str) -> int:
+        """
+        Record a failed login and return the larger of its user's and its IP's recent failures.
+        
+        Every failure seen here is also in the shared count, so the result
+        is a lower bound on it: reaching the threshold locally is enough to
+        alert, while falling short of it says nothing about other workers.
+        """
+        now = time.monotonic()
+        cutoff = now - self.suspicious_activity_window
+        local_count = 0
+        
+        with self._failures_lock:
+            for key in (("user", user_id), ("ip", ip_address)):
+                if key[1] is None:
+                    continue
+                
+                times = self._recent_failures.pop(key, None)
+                if times is None:
+                    times = deque()
+                times.append(now)
+                while times[0] < cutoff:
+                    times.popleft()
+                self._recent_failures[key] = times
+                local_count = max(local_count, len(times))
+            
+            while len(self._recent_failures) > self.max_tracked_failure_keys:
+                self._recent_failures.popitem(last=False)
+            
+            if now - self._last_failure_sweep >= self.suspicious_activity_window:
+                self._sweep_failures(cutoff)
+                self._last_failure_sweep = now
+        
+        return local_count
+    
+    def _sweep_failures(self, cutoff: float):
+        """Drop keys whose latest failure is older than cutoff; caller holds the lock."""
+        while self._recent_failures:
+            key, times = next(iter(self._recent_failures.items()))
+            if times[-1] >= cutoff:
+                break
+            del self._recent_failures[key]
+    
+    def _check_failed_login_pattern(
+        self,
+        user_id: str,
+        ip_address: str,
+        event_id: Optional[str] = None,
+        local_count: int = 0
+    ):
         """Check for suspicious failed login patterns."""
+        failed_count = self._count_failures_in_cache(user_id, ip_address, event_id)
+        if failed_count is None:
+            if local_count >= self.failed_login_threshold:
+                failed_count = local_count
+            else:
+                failed_count = self._count_failures_in_db(user_id, ip_address)
+        
+        if failed_count >= self.failed_login_threshold:
+            self.audit_logger.log_event(
+                event_type=AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY,
+                user_id=user_id,
+                ip_address=ip_address,
+                severity=AuditSeverity.HIGH,
+                description=f"Suspicious activity detected: {failed_count} failed login attempts",
+                details={
+                    "failed_attempts": failed_count,
+                    "threshold": self.failed_login_threshold,
+                    "window_hours": self.suspicious_activity_window / 3600
+                }
+            )
+    
+    def _count_failures_in_cache(
+        self,
+        user_id: str,
+        ip_address: str,
+        event_id: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Record this failure in Redis and count failures for the user or IP within the window.
+        
+        Each failure is a member of a sliding-window set for its user and
+        one for its IP, so the size of their union is the same count
+        _count_failures_in_db returns. Returns None when Redis cannot be used.
+        """
+        cache = self._get_failure_cache()
+        if cache is None:
+            return None
+        
+        member = event_id or uuid.uuid4().hex
+        keys = []
+        if user_id is not None:
+            keys.append(f"user:{user_id}")
+        if ip_address is not None:
+            keys.append(f"ip:{ip_address}")
+        if not keys:
+            return None
+        
+        try:
+            with cache.pipeline() as pipeline:
+                for key in keys:
+                    pipeline.window_add(key, member, self.suspicious_activity_window, namespace="failed_logins")
+                pipeline.union_count(*keys, namespace="failed_logins")
+                return pipeline.execute()[0]
+            
+        except Exception as e:
+            self._mark_failure_cache_unavailable(e)
+            return None
+    
+    def _count_failures_in_db(self, user_id: str, ip_address: str) -> int:
+        """Count failed logins for the user or IP within the window from audit_logs."""
         # Check failed logins in the last hour
         start_time = datetime.now(timezone.utc).timestamp() - self.suspicious_activity_window
         
+        # Two single-key counts instead of an OR, so each side can use its
+        # partial failed-login index; the IP side skips rows already counted
+        # by the user side, keeping NULL-user rows when user_id is unknown
         query = """
-            SELECT COUNT(*) as failed_count
-            FROM audit_logs
-            WHERE event_type = %(event_type)s
-              AND (user_id = %(user_id)s OR ip_address = %(ip_address)s)
-              AND timestamp >= %(start_time)s
-              AND success = false
+            SELECT (
+                SELECT COUNT(*)
+                FROM audit_logs
+                WHERE event_type = %(event_type)s
+                  AND user_id = %(user_id)s
+                  AND timestamp >= %(start_time)s
+                  AND success = false
+            ) + (
+                SELECT COUNT(*)
+                FROM audit_logs
+                WHERE event_type = %(event_type)s
+                  AND ip_address = %(ip_address)s
+                  AND (user_id = %(user_id)s) IS NOT TRUE
+                  AND timestamp >= %(start_time)s
+                  AND success = false
+            ) AS failed_count
         """
         
         result = execute_query(
@@ -365,69 +970,39 @@ class SecurityAuditor:
             fetch_one=True
         )
         
-        if result and result["failed_count"] >= self.failed_login_threshold:
-            self.audit_logger.log_event(
-                event_type=AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY,
-                user_id=user_id,
-                ip_address=ip_address,
-                severity=AuditSeverity.HIGH,
-                description=f"Suspicious activity detected: {result['failed_count']} failed login attempts",
-                details={
-                    "failed_attempts": result["failed_count"],
-                    "threshold": self.failed_login_threshold,
-                    "window_hours": self.suspicious_activity_window / 3600
-                }
-            )
+        return result["failed_count"] if result else 0
     
     def generate_security_report(self, days: int = 7) -> Dict[str, Any]:
-        """Generate security audit report."""
-        start_date = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        # Get security events
-        security_events = [
-            AuditEventType.SECURITY_LOGIN_FAILED,
-            AuditEventType.SECURITY_ACCOUNT_LOCKED,
-            AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY,
-            AuditEventType.SECURITY_PASSWORD_RESET
-        ]
-        
-        events = self.audit_logger.get_audit_trail(
-            event_types=security_events,
-            start_date=start_date,
-            limit=1000
-        )
+        """
+        Generate security audit report.
         
-        # Analyze events
-        event_counts = {}
-        ip_addresses = set()
-        failed_logins_by_user = {}
+        All counting happens in one aggregate query, so only a single
+        summary row comes back regardless of how many events matched.
+        """
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        for event in events:
-            event_type = event["event_type"]
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-            
-            if event["ip_address"]:
-                ip_addresses.add(event["ip_address"])
-            
-            if event_type == AuditEventType.SECURITY_LOGIN_FAILED.value:
-                user_id = event["user_id"]
-                if user_id:
-                    failed_logins_by_user[user_id] = failed_logins_by_user.get(user_id, 0) + 1
+        result = execute_query(
+            _SECURITY_REPORT_QUERY,
+            {
+                "event_types": _SECURITY_REPORT_VALUES,
+                "failed_login": AuditEventType.SECURITY_LOGIN_FAILED.value,
+                "start_date": start_date
+            },
+            fetch_one=True
+        ) or {}
         
         return {
             "report_period_days": days,
             "generated_at": datetime.now(timezone.utc),
             "summary": {
-                "total_security_events": len(events),
-                "unique_ip_addresses": len(ip_addresses),
-                "users_with_failed_logins": len(failed_logins_by_user)
+                "total_security_events": result.get("total_security_events", 0),
+                "unique_ip_addresses": result.get("unique_ip_addresses", 0),
+                "users_with_failed_logins": result.get("users_with_failed_logins", 0)
             },
-            "event_counts": event_counts,
-            "top_failed_login_users": sorted(
-                failed_logins_by_user.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+            "event_counts": result.get("event_counts") or {},
+            "top_failed_login_users": [
+                tuple(pair) for pair in result.get("top_failed_login_users") or []
+            ]
         }
 
 
@@ -491,47 +1066,71 @@ class ComplianceTracker:
             }
         )
     
-    def generate_gdpr_report(self, user_id: str) -> Dict[str, Any]:
-        """Generate GDPR compliance report for a specific user."""
-        # Get all audit events for the user
-        events = self.audit_logger.get_audit_trail(user_id=user_id, limit=10000)
+    def generate_gdpr_report(self, user_id: str, include_events: bool = True) -> Dict[str, Any]:
+        """
+        Generate GDPR compliance report for a specific user.
         
-        # Categorize events
+        Counts are aggregated in the database. With include_events=False
+        only the summary is returned and no event rows are fetched.
+        """
+        params = {
+            "user_id": user_id,
+            "data_access": sorted(_DATA_ACCESS_VALUES),
+            "consent": sorted(_CONSENT_VALUES),
+            "privacy": sorted(_PRIVACY_VALUES)
+        }
+        counts = execute_query(
+            """
+            SELECT
+                COUNT(*) AS total_events,
+                COUNT(*) FILTER (WHERE event_type = ANY(%(data_access)s)) AS data_access_events,
+                COUNT(*) FILTER (WHERE event_type = ANY(%(consent)s)) AS consent_events,
+                COUNT(*) FILTER (WHERE event_type = ANY(%(privacy)s)) AS privacy_rights_events
+            FROM audit_logs
+            WHERE user_id = %(user_id)s
+            """,
+            params,
+            fetch_one=True
+        ) or {}
+        
+        report = {
+            "user_id": user_id,
+            "generated_at": datetime.now(timezone.utc),
+            "summary": {
+                "total_events": counts.get("total_events", 0),
+                "data_access_events": counts.get("data_access_events", 0),
+                "consent_events": counts.get("consent_events", 0),
+                "privacy_rights_events": counts.get("privacy_rights_events", 0)
+            }
+        }
+        
+        if not include_events:
+            return report
+        
+        # One query for the categorized rows only; bucket them by event type
         data_access_events = []
         consent_events = []
         privacy_events = []
+        events = self.audit_logger.get_audit_trail(
+            user_id=user_id,
+            event_types=_GDPR_EVENT_TYPES,
+            limit=10000
+        )
         
         for event in events:
             event_type = event["event_type"]
             
-            if event_type in [e.value for e in [
-                AuditEventType.DATA_READ, AuditEventType.DATA_WRITE,
-                AuditEventType.DATA_UPDATE, AuditEventType.DATA_DELETE
-            ]]:
+            if event_type in _DATA_ACCESS_VALUES:
                 data_access_events.append(event)
-            elif event_type in [e.value for e in [
-                AuditEventType.PRIVACY_CONSENT_GIVEN, AuditEventType.PRIVACY_CONSENT_WITHDRAWN
-            ]]:
+            elif event_type in _CONSENT_VALUES:
                 consent_events.append(event)
-            elif event_type in [e.value for e in [
-                AuditEventType.PRIVACY_DATA_REQUEST, AuditEventType.PRIVACY_DATA_DELETION,
-                AuditEventType.PRIVACY_DATA_PORTABILITY
-            ]]:
+            elif event_type in _PRIVACY_VALUES:
                 privacy_events.append(event)
         
-        return {
-            "user_id": user_id,
-            "generated_at": datetime.now(timezone.utc),
-            "summary": {
-                "total_events": len(events),
-                "data_access_events": len(data_access_events),
-                "consent_events": len(consent_events),
-                "privacy_rights_events": len(privacy_events)
-            },
-            "data_access_log": data_access_events,
-            "consent_history": consent_events,
-            "privacy_rights_log": privacy_events
-        }
+        report["data_access_log"] = data_access_events
+        report["consent_history"] = consent_events
+        report["privacy_rights_log"] = privacy_events
+        return report
 
 
 # Global instances
@@ -5,10 +5,14 @@ Provides Redis-based caching with automatic serialization and TTL management.
 
 import json
 import pickle
+import threading
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 from functools import wraps
+from contextlib import contextmanager
 import hashlib
 
 import redis
@@ -29,6 +33,12 @@ class CacheManager:
         self._pool: Optional[ConnectionPool] = None
         self._redis: Optional[redis.Redis] = None
         self._initialized = False
+        
+        # Access-interval tracking for set_adaptive(): hint -> (last_seen, ewma_interval)
+        self._access_intervals: "OrderedDict[str, Tuple[float, Optional[float]]]" = OrderedDict()
+        self._adaptive_lock = threading.Lock()
+        self.adaptive_alpha = 0.3
+        self.adaptive_max_hints = 10000
     
     def initialize(self):
         """Initialize Redis connection pool."""
@@ -107,6 +117,49 @@ class CacheManager:
             logger.error(f"Cache set failed for key {key}: {e}")
             raise CacheError(f"Failed to set cache value: {e}")
     
+    def set_adaptive(
+        self,
+        key: str,
+        value: Any,
+        base_ttl: int = 86400,
+        access_hint: Optional[str] = None,
+        min_ttl: int = 3600,
+        namespace: str = "default"
+    ) -> bool:
+        """
+        Set a value with a TTL derived from how often it is refreshed.
+        
+        An exponentially weighted moving average of the interval between
+        writes is kept per access_hint (the key itself if not given). The TTL
+        is twice that interval, clamped to [min_ttl, base_ttl], so entries
+        rewritten often expire sooner while rarely refreshed ones keep the
+        full base_ttl.
+        """
+        ttl = self._adaptive_ttl(access_hint or key, base_ttl, min_ttl)
+        return self.set(key, value, ttl, namespace)
+    
+    def _adaptive_ttl(self, hint: str, base_ttl: int, min_ttl: int) -> int:
+        """Update the access-interval EWMA for a hint and derive a TTL from it."""
+        now = time.monotonic()
+        
+        with self._adaptive_lock:
+            previous = self._access_intervals.pop(hint, None)
+            ewma = None
+            if previous is not None:
+                last_seen, ewma = previous
+                interval = now - last_seen
+                ewma = interval if ewma is None else (
+                    self.adaptive_alpha * interval + (1 - self.adaptive_alpha) * ewma
+                )
+            
+            self._access_intervals[hint] = (now, ewma)
+            if len(self._access_intervals) > self.adaptive_max_hints:
+                self._access_intervals.popitem(last=False)
+        
+        if ewma is None:
+            return base_ttl
+        return int(min(base_ttl, max(min_ttl, 2 * ewma)))
+    
     def get(self, key: str, namespace: str = "default", default: Any = None) -> Any:
         """Get a value from cache."""
         self._ensure_initialized()
@@ -136,6 +189,37 @@ class CacheManager:
             logger.error(f"Cache delete failed for key {key}: {e}")
             raise CacheError(f"Failed to delete cache value: {e}")
     
+    def unlink(self, *keys: str, namespace: str = "default") -> int:
+        """Remove several keys with a single non-blocking UNLINK command."""
+        self._ensure_initialized()
+        
+        if not keys:
+            return 0
+        
+        try:
+            cache_keys = [self._build_key(key, namespace) for key in keys]
+            return self._redis.unlink(*cache_keys)
+            
+        except Exception as e:
+            logger.error(f"Cache unlink failed for keys {keys}: {e}")
+            raise CacheError(f"Failed to unlink cache values: {e}")
+    
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue several cache commands and send them in one round-trip.
+        
+        Commands are buffered client-side until execute() is called; the
+        pipeline is non-transactional (no MULTI/EXEC).
+        """
+        self._ensure_initialized()
+        
+        redis_pipeline = self._redis.pipeline(transaction=False)
+        try:
+            yield CachePipeline(self, redis_pipeline)
+        finally:
+            redis_pipeline.reset()
+    
     def exists(self, key: str, namespace: str = "default") -> bool:
         """Check if a key exists in cache."""
         self._ensure_initialized()
@@ -278,6 +362,135 @@ class CacheManager:
         logger.info("Redis cache connection closed")
 
 
+# Decoder marking a helper command whose reply execute() leaves out
+_DISCARD = object()
+
+
+class CachePipeline:
+    """Buffered cache commands sharing CacheManager key and value encoding."""
+    
+    def __init__(self, cache_manager: CacheManager, redis_pipeline):
+        self.cache = cache_manager
+        self._pipeline = redis_pipeline
+        self._decoders: List[Optional[Callable]] = []
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        namespace: str = "default"
+    ) -> 'CachePipeline':
+        """Queue a SET (or SETEX when a TTL is given)."""
+        cache_key = self.cache._build_key(key, namespace)
+        serialized_value = self.cache._serialize_value(value)
+        
+        if ttl:
+            self._pipeline.setex(cache_key, ttl, serialized_value)
+        else:
+            self._pipeline.set(cache_key, serialized_value)
+        self._decoders.append(bool)
+        return self
+    
+    def get(self, key: str, namespace: str = "default") -> 'CachePipeline':
+        """Queue a GET; the deserialized value is returned by execute()."""
+        self._pipeline.get(self.cache._build_key(key, namespace))
+        self._decoders.append(self._decode)
+        return self
+    
+    def delete(self, *keys: str, namespace: str = "default") -> 'CachePipeline':
+        """Queue a DEL for one or more keys."""
+        self._pipeline.delete(*[self.cache._build_key(key, namespace) for key in keys])
+        self._decoders.append(None)
+        return self
+    
+    def unlink(self, *keys: str, namespace: str = "default") -> 'CachePipeline':
+        """Queue a non-blocking UNLINK for one or more keys."""
+        self._pipeline.unlink(*[self.cache._build_key(key, namespace) for key in keys])
+        self._decoders.append(None)
+        return self
+    
+    def expire(self, key: str, ttl: int, namespace: str = "default") -> 'CachePipeline':
+        """Queue an EXPIRE."""
+        self._pipeline.expire(self.cache._build_key(key, namespace), ttl)
+        self._decoders.append(bool)
+        return self
+    
+    def incr(
+        self,
+        key: str,
+        amount: int = 1,
+        ttl: Optional[int] = None,
+        namespace: str = "default"
+    ) -> 'CachePipeline':
+        """
+        Queue an INCRBY; execute() returns the new count.
+        
+        With a TTL, a missing counter is first created at zero with that
+        expiry, so the count resets once the window passes while later
+        increments keep the original expiry.
+        """
+        cache_key = self.cache._build_key(key, namespace)
+        if ttl:
+            self._pipeline.set(cache_key, 0, ex=ttl, nx=True)
+            self._decoders.append(_DISCARD)
+        self._pipeline.incrby(cache_key, amount)
+        self._decoders.append(int)
+        return self
+    
+    def window_add(
+        self,
+        key: str,
+        member: str,
+        window: int,
+        namespace: str = "default"
+    ) -> 'CachePipeline':
+        """
+        Queue adding member to a sliding-window sorted set; nothing is returned for it.
+        
+        Members are scored by the current time, those older than window
+        seconds are trimmed, and the set expires window seconds after its
+        latest addition.
+        """
+        cache_key = self.cache._build_key(key, namespace)
+        now = time.time()
+        self._pipeline.zadd(cache_key, {member: now})
+        self._pipeline.zremrangebyscore(cache_key, '-inf', now - window)
+        self._pipeline.expire(cache_key, window)
+        self._decoders.extend((_DISCARD, _DISCARD, _DISCARD))
+        return self
+    
+    def union_count(self, *keys: str, namespace: str = "default") -> 'CachePipeline':
+        """Queue counting the distinct members of one or more sorted sets; execute() returns the count."""
+        scratch_key = self.cache._build_key(f"union:{uuid.uuid4().hex}", namespace)
+        self._pipeline.zunionstore(scratch_key, [self.cache._build_key(key, namespace) for key in keys])
+        self._pipeline.unlink(scratch_key)
+        self._decoders.extend((int, _DISCARD))
+        return self
+    
+    def execute(self) -> List[Any]:
+        """Send all queued commands and return their results in order."""
+        try:
+            raw_results = self._pipeline.execute()
+        except Exception as e:
+            logger.error(f"Cache pipeline execution failed: {e}")
+            raise CacheError(f"Failed to execute cache pipeline: {e}")
+        finally:
+            decoders, self._decoders = self._decoders, []
+        
+        return [
+            decoder(result) if decoder else result
+            for decoder, result in zip(decoders, raw_results)
+            if decoder is not _DISCARD
+        ]
+    
+    def _decode(self, data: Optional[bytes]) -> Any:
+        """Deserialize a GET reply, keeping cache misses as None."""
+        if data is None:
+            return None
+        return self.cache._deserialize_value(data)
+
+
 class CacheDecorator:
     """Decorator for caching function results."""
     
@@ -23,17 +23,41 @@ class Environment(Enum):
 
 @dataclass
 class DatabaseConfig:
-    """Database configuration settings."""
+    """
+    Database configuration settings.
+    
+    Pool sizes default to the host's CPU count. The psycopg2 pool keeps at
+    least four warm connections and opens up to four per core; the asyncpg
+    pool is sized separately (async_pool_size, one per core) because only
+    the async repository calls use it. The executor behind run_blocking()
+    borrows from the psycopg2 pool rather than opening connections, and the
+    audit writer holds one connection of its own, so each process opens up
+    to max_connections_per_process connections: pool_size +
+    async_pool_size + 1. Multiplied by the number of worker processes this
+    must stay under PostgreSQL's max_connections. In front of PostgreSQL, PgBouncer
+    with pool_mode=transaction lets many application pools share a small
+    set of server backends; it needs PgBouncer 1.21+ with
+    max_prepared_statements set for the prepared-statement path to work.
+    """
     host: str = "localhost"
     port: int = 5432
     database: str = "happy_path"
     username: str = "postgres"
     password: str = ""
-    pool_size: int = 20
+    pool_size: int = field(default_factory=lambda: max(16, 4 * (os.cpu_count() or 1)))
+    min_pool_size: int = field(default_factory=lambda: max(4, os.cpu_count() or 1))
+    async_pool_size: int = field(default_factory=lambda: max(4, os.cpu_count() or 1))
+    async_min_pool_size: int = 1
     max_overflow: int = 30
     pool_timeout: int = 30
+    pool_max_idle_seconds: float = 60.0
     ssl_mode: str = "prefer"
     application_name: str = "happy_path"
+    
+    @property
+    def max_connections_per_process(self) -> int:
+        """Most connections one process opens: both pools plus the audit writer's."""
+        return self.pool_size + self.async_pool_size + 1
 
 
 @dataclass
@@ -56,6 +80,8 @@ class SecurityConfig:
     jwt_expiry_hours: int = 24
     password_min_length: int = 8
     password_require_special: bool = True
+    password_hash_scheme: str = "bcrypt"  # bcrypt or pbkdf2_sha256
+    pbkdf2_iterations: int = 600000
     session_timeout_minutes: int = 60
     max_login_attempts: int = 5
     lockout_duration_minutes: int = 30
@@ -71,10 +97,24 @@ class LoggingConfig:
     file_path: Optional[str] = None
     max_file_size: int = 100 * 1024 * 1024  # 100MB
     backup_count: int = 5
+    file_buffer_size: int = 64 * 1024  # 64KB
+    file_flush_interval: float = 0.05  # seconds
+    enable_thread_buffer: bool = False  # per-thread record buffers for file output
     enable_json: bool = False
+    enable_binary: bool = False  # interned binary file format, see InternedLogHandler
     enable_console: bool = True
 
 
+@dataclass
+class AuditConfig:
+    """Audit writer settings."""
+    queue_size: int = 10000  # events held for the writer thread before log_event writes inline
+    max_rows: int = 500  # events per multi-row INSERT
+    flush_interval_ms: int = 200  # longest wait to fill a batch once an event is queued
+    bulk_copy_threshold: int = 1000  # batches this large are loaded with COPY instead of INSERT
+    synchronous_commit: bool = True  # False lets the writer's commits skip waiting for WAL flush
+
+
 @dataclass
 class MonitoringConfig:
     """Monitoring and metrics configuration."""
@@ -119,6 +159,7 @@ class Config:
         self.redis = RedisConfig()
         self.security = SecurityConfig()
         self.logging = LoggingConfig()
+        self.audit = AuditConfig()
         self.monitoring = MonitoringConfig()
         self.payment = PaymentConfig()
         self.features = FeatureFlags()
@@ -145,6 +186,10 @@ class Config:
         self.database.username = os.getenv("DB_USER", self.database.username)
         self.database.password = os.getenv("DB_PASSWORD", self.database.password)
         self.database.pool_size = int(os.getenv("DB_POOL_SIZE", self.database.pool_size))
+        self.database.min_pool_size = int(os.getenv("DB_MIN_POOL_SIZE", self.database.min_pool_size))
+        self.database.async_pool_size = int(os.getenv("DB_ASYNC_POOL_SIZE", self.database.async_pool_size))
+        self.database.async_min_pool_size = int(os.getenv("DB_ASYNC_MIN_POOL_SIZE", self.database.async_min_pool_size))
+        self.database.pool_max_idle_seconds = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", self.database.pool_max_idle_seconds))
         
         # Redis configuration
         self.redis.host = os.getenv("REDIS_HOST", self.redis.host)
@@ -166,6 +211,12 @@ class Config:
         self.logging.level = os.getenv("LOG_LEVEL", self.logging.level)
         self.logging.file_path = os.getenv("LOG_FILE_PATH", self.logging.file_path)
         
+        # Audit writer configuration
+        self.audit.max_rows = int(os.getenv("AUDIT_MAX_ROWS", self.audit.max_rows))
+        self.audit.flush_interval_ms = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", self.audit.flush_interval_ms))
+        self.audit.bulk_copy_threshold = int(os.getenv("AUDIT_BULK_COPY_THRESHOLD", self.audit.bulk_copy_threshold))
+        self.audit.synchronous_commit = self._get_bool_env("AUDIT_SYNCHRONOUS_COMMIT", self.audit.synchronous_commit)
+        
         # Feature flags
         self.features.enable_ai_insights = self._get_bool_env("ENABLE_AI_INSIGHTS", self.features.enable_ai_insights)
         self.features.enable_crisis_detection = self._get_bool_env("ENABLE_CRISIS_DETECTION", self.features.enable_crisis_detection)
@@ -209,6 +260,11 @@ class Config:
                 if hasattr(self.logging, key):
                     setattr(self.logging, key, value)
         
+        if "audit" in file_config:
+            for key, value in file_config["audit"].items():
+                if hasattr(self.audit, key):
+                    setattr(self.audit, key, value)
+        
         if "features" in file_config:
             for key, value in file_config["features"].items():
                 if hasattr(self.features, key):
@@ -275,6 +331,8 @@ class Config:
                 "database": self.database.database,
                 "username": self.database.username,
                 "pool_size": self.database.pool_size,
+                "async_pool_size": self.database.async_pool_size,
+                "max_connections_per_process": self.database.max_connections_per_process,
             },
             "redis": {
                 "host": self.redis.host,
@@ -308,8 +366,16 @@ def get_config() -> Config:
     return _config
 
 
-def initialize_config(env: Optional[Environment] = None) -> Config:
-    """Initialize the global configuration."""
+def initialize_config(env: Optional[Environment] = None, reload: bool = False) -> Config:
+    """
+    Initialize the global configuration.
+    
+    An existing configuration for the same environment is reused rather than
+    re-reading environment variables and config files; pass reload=True to
+    force a fresh load.
+    """
     global _config
+    if _config is not None and not reload and (env is None or env == _config.env):
+        return _config
     _config = Config(env)
     return _config
@@ -4,16 +4,26 @@ Provides connection pooling, query execution, and transaction management.
 """
 
 import asyncio
+import itertools
+import json
 import logging
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager, contextmanager
-from typing import Any, Dict, List, Optional, Tuple, Union
-from datetime import datetime, timezone
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from datetime import date, datetime, timezone
+from decimal import Decimal
 import uuid
 
 import asyncpg
 import psycopg2
 from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values
 
 from .config import get_config
 from .exceptions import DatabaseError, ConnectionError, QueryError, TransactionError
@@ -21,6 +31,111 @@ from .logging import get_logger
 
 logger = get_logger(__name__)
 
+_NAMED_PARAM_PATTERN = re.compile(r"%%|%\((\w+)\)s")
+
+# PREPARE parameter types for values whose SQL type is unambiguous; ints,
+# strings and None stay unknown so the server infers them from context
+_PREPARED_PARAM_TYPES = (
+    (bool, "boolean"),
+    (float, "double precision"),
+    (Decimal, "numeric"),
+    (date, "date"),
+    (uuid.UUID, "uuid"),
+)
+
+
+@lru_cache(maxsize=256)
+def _to_positional(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite %(name)s placeholders as $n and %% as % for PREPARE, returning the parameter order."""
+    names: List[str] = []
+    
+    def replace(match):
+        name = match.group(1)
+        if name is None:
+            return "%"
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+    
+    return _NAMED_PARAM_PATTERN.sub(replace, query), tuple(names)
+
+
+def _prepared_param_type(value: Any) -> str:
+    """Return the PREPARE parameter type for a value."""
+    if isinstance(value, datetime):
+        return "timestamptz" if value.tzinfo else "timestamp"
+    for python_type, pg_type in _PREPARED_PARAM_TYPES:
+        if isinstance(value, python_type):
+            return pg_type
+    return "unknown"
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value for COPY text format; dicts and lists become JSON."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        text = value.isoformat()
+    elif isinstance(value, (dict, list, tuple)):
+        text = json.dumps(value, default=str)
+    else:
+        text = str(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def _encode_async_json(value: Any) -> str:
+    """
+    Encode a json/jsonb parameter for asyncpg.
+    
+    Strings are taken as already-encoded JSON and sent unchanged, as psycopg2
+    sends them for the sync pool, so repositories that pre-encode a column
+    store the same value on either path.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+async def _init_async_connection(connection) -> None:
+    """Encode and decode json/jsonb as Python objects, as psycopg2 does for the sync pool."""
+    for type_name in ('json', 'jsonb'):
+        await connection.set_type_codec(
+            type_name,
+            encoder=_encode_async_json,
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
+
+
+class _CopyStream:
+    """File-like reader over COPY lines, so rows are encoded as the server reads them."""
+    
+    def __init__(self, lines: Iterator[bytes]):
+        self._lines = lines
+        self._buffer = b""
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = [self._buffer]
+        buffered = len(self._buffer)
+        while size < 0 or buffered < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            buffered += len(line)
+        
+        data = b"".join(chunks)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
 
 class DatabaseManager:
     """Main database manager with connection pooling and query utilities."""
@@ -29,30 +144,57 @@ class DatabaseManager:
         self.config = get_config()
         self._pool: Optional[pool.ThreadedConnectionPool] = None
         self._async_pool: Optional[asyncpg.Pool] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None
         self._initialized = False
+        
+        # Concurrent first callers must not each build their own pool
+        self._init_lock = threading.Lock()
+        self._async_init_lock: Optional[asyncio.Lock] = None
+        
+        # Server-side prepared statements are per connection: conn -> {(sql, param types): name}
+        self._prepared: "weakref.WeakKeyDictionary[Any, OrderedDict[str, str]]" = weakref.WeakKeyDictionary()
+        self._prepared_counter = itertools.count(1)
+        self.prepared_cache_size = 100
+        self._cursor_counter = itertools.count(1)
+        
+        # Connections pinned by transaction()/async_transaction() for the current context
+        self._transaction_connection: ContextVar = ContextVar("happy_path_transaction_connection", default=None)
+        self._async_transaction_connection: ContextVar = ContextVar("happy_path_async_transaction_connection", default=None)
+        # Callbacks waiting for the current transaction() block to commit
+        self._after_commit_callbacks: ContextVar = ContextVar("happy_path_after_commit_callbacks", default=None)
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Identify this manager's database in shared cache keys."""
+        database = self.config.database
+        return f"{database.host}:{database.port}/{database.database}"
     
     def initialize(self):
         """Initialize the database connection pool."""
         if self._initialized:
             return
         
+        with self._init_lock:
+            if self._initialized:
+                return
+            self._create_pool()
+    
+    def _create_pool(self):
+        """Create the synchronous connection pool."""
         try:
             # Create synchronous connection pool
+            # Keep a few connections open so single queries skip connect/auth
             self._pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
+                minconn=min(self.config.database.min_pool_size, self.config.database.pool_size),
                 maxconn=self.config.database.pool_size,
-                host=self.config.database.host,
-                port=self.config.database.port,
-                database=self.config.database.database,
-                user=self.config.database.username,
-                password=self.config.database.password,
-                application_name=self.config.database.application_name,
-                sslmode=self.config.database.ssl_mode,
-                cursor_factory=RealDictCursor
+                **self._connection_kwargs()
             )
             
             self._initialized = True
-            logger.info("Database connection pool initialized successfully")
+            logger.info(
+                f"Database connection pool initialized successfully "
+                f"(up to {self.config.database.max_connections_per_process} connections per process)"
+            )
             
         except Exception as e:
             logger.error(f"Failed to initialize database connection pool: {e}")
@@ -63,6 +205,16 @@ class DatabaseManager:
         if self._async_pool:
             return
         
+        if self._async_init_lock is None:
+            self._async_init_lock = asyncio.Lock()
+        
+        async with self._async_init_lock:
+            if self._async_pool:
+                return
+            await self._create_async_pool()
+    
+    async def _create_async_pool(self):
+        """Create the asyncpg connection pool."""
         try:
             self._async_pool = await asyncpg.create_pool(
                 host=self.config.database.host,
@@ -70,9 +222,12 @@ class DatabaseManager:
                 database=self.config.database.database,
                 user=self.config.database.username,
                 password=self.config.database.password,
-                min_size=1,
-                max_size=self.config.database.pool_size,
+                min_size=min(self.config.database.async_min_pool_size, self.config.database.async_pool_size),
+                max_size=self.config.database.async_pool_size,
+                # Close connections idle longer than this so bursts don't pin backends
+                max_inactive_connection_lifetime=self.config.database.pool_max_idle_seconds,
                 command_timeout=60,
+                init=_init_async_connection,
                 server_settings={
                     'application_name': self.config.database.application_name,
                     'timezone': 'UTC'
@@ -84,42 +239,207 @@ class DatabaseManager:
             logger.error(f"Failed to initialize async database pool: {e}")
             raise ConnectionError(f"Async database initialization failed: {e}")
     
+    def _connection_kwargs(self) -> Dict[str, Any]:
+        """Connection settings shared by the pool and dedicated connections."""
+        return {
+            "host": self.config.database.host,
+            "port": self.config.database.port,
+            "database": self.config.database.database,
+            "user": self.config.database.username,
+            "password": self.config.database.password,
+            "application_name": self.config.database.application_name,
+            "sslmode": self.config.database.ssl_mode,
+            "cursor_factory": RealDictCursor
+        }
+    
+    def create_connection(self, **overrides):
+        """
+        Open a connection outside the pool for a long-lived owner.
+        
+        Uses the pool's settings, with overrides passed through to
+        psycopg2.connect. The caller is responsible for closing it.
+        """
+        try:
+            return psycopg2.connect(**{**self._connection_kwargs(), **overrides})
+        except Exception as e:
+            logger.error(f"Failed to open dedicated database connection: {e}")
+            raise ConnectionError(f"Dedicated connection failed: {e}")
+    
+    @contextmanager
+    def use_connection(self, connection):
+        """
+        Route get_connection() in the current context to a caller-owned connection.
+        
+        Every query helper in the block runs on that connection, so its
+        server-side prepared statements are reused. The block's work is
+        committed on normal exit and rolled back on error.
+        """
+        token = self._transaction_connection.set(connection)
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            if not connection.closed:
+                connection.rollback()
+            raise
+        finally:
+            self._transaction_connection.reset(token)
+    
     @contextmanager
     def get_connection(self):
-        """Get a database connection from the pool."""
+        """
+        Borrow a database connection from the pool.
+        
+        Work left open on the connection is committed when the block exits
+        normally and rolled back on error; the pool would otherwise roll it
+        back on return. Connections found closed are discarded rather than
+        returned to the pool.
+        """
         if not self._initialized:
             self.initialize()
         
+        # Inside transaction() the pinned connection is shared and committed by its owner
+        bound = self._transaction_connection.get()
+        if bound is not None:
+            yield bound
+            return
+        
         connection = None
+        discard = False
         try:
             connection = self._pool.getconn()
             if connection is None:
                 raise ConnectionError("Failed to get connection from pool")
             
-            # Test connection
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
+            if connection.closed:
+                # Stale socket; replace it instead of probing with a query
+                self._pool.putconn(connection, close=True)
+                connection = self._pool.getconn()
             
             yield connection
             
+            if connection.status != psycopg2.extensions.STATUS_READY:
+                connection.commit()
+            
         except Exception as e:
             if connection:
-                connection.rollback()
+                if connection.closed:
+                    discard = True
+                else:
+                    connection.rollback()
             logger.error(f"Database connection error: {e}")
             raise ConnectionError(f"Connection error: {e}")
         finally:
             if connection:
-                self._pool.putconn(connection)
+                self._pool.putconn(connection, close=discard or bool(connection.closed))
     
     @asynccontextmanager
     async def get_async_connection(self):
         """Get an async database connection from the pool."""
+        bound = self._async_transaction_connection.get()
+        if bound is not None:
+            yield bound
+            return
+        
         if not self._async_pool:
             await self.initialize_async()
         
         async with self._async_pool.acquire() as connection:
             yield connection
     
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed queries on one pooled connection as a single transaction.
+        
+        Queries issued through this manager inside the block, including those
+        made by repositories, reuse the connection and are committed once on
+        exit, or rolled back together on error. Nested blocks join the outer
+        transaction.
+        """
+        bound = self._transaction_connection.get()
+        if bound is not None:
+            yield bound
+            return
+        
+        error = None
+        callbacks: List[Callable[[], Any]] = []
+        with self.get_connection() as conn:
+            token = self._transaction_connection.set(conn)
+            callbacks_token = self._after_commit_callbacks.set(callbacks)
+            try:
+                yield conn
+            except Exception as e:
+                conn.rollback()
+                error = e
+            finally:
+                self._after_commit_callbacks.reset(callbacks_token)
+                self._transaction_connection.reset(token)
+        
+        # Re-raise outside get_connection so callers see the original error
+        if error is not None:
+            raise error
+        
+        # get_connection committed on exit; now run the deferred callbacks
+        for callback in callbacks:
+            self._run_after_commit(callback)
+    
+    def after_commit(self, callback: Callable[[], Any]):
+        """
+        Run callback once the current transaction() block commits.
+        
+        Outside a transaction() block the work has already been committed,
+        so the callback runs immediately. Callbacks are dropped if the
+        transaction rolls back, and their errors are logged, not raised.
+        """
+        callbacks = self._after_commit_callbacks.get()
+        if callbacks is not None:
+            callbacks.append(callback)
+        else:
+            self._run_after_commit(callback)
+    
+    def _connection_pinned(self) -> bool:
+        """Whether get_connection() hands out a connection whose transaction() or use_connection() owner commits it."""
+        return self._transaction_connection.get() is not None
+    
+    def _run_after_commit(self, callback: Callable[[], Any]):
+        """Run one after-commit callback, logging its failure."""
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"After-commit callback failed: {e}")
+    
+    @asynccontextmanager
+    async def async_transaction(self):
+        """Async counterpart of transaction() over the asyncpg pool."""
+        bound = self._async_transaction_connection.get()
+        if bound is not None:
+            yield bound
+            return
+        
+        async with self.get_async_connection() as conn:
+            async with conn.transaction():
+                token = self._async_transaction_connection.set(conn)
+                try:
+                    yield conn
+                finally:
+                    self._async_transaction_connection.reset(token)
+    
+    def get_io_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used to run blocking database calls from async code."""
+        if self._io_executor is None:
+            # One worker per pooled connection; more threads would only wait on getconn()
+            self._io_executor = ThreadPoolExecutor(
+                max_workers=self.config.database.pool_size,
+                thread_name_prefix="happy-path-db"
+            )
+        return self._io_executor
+    
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking database call on the I/O executor without stalling the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_io_executor(), func, *args)
+    
     def execute_query(
         self, 
         query: str, 
@@ -146,6 +466,98 @@ class DatabaseManager:
                 logger.error(f"Query execution failed: {e}, Query: {query[:100]}...")
                 raise QueryError(f"Query execution failed: {e}")
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict, Tuple, List]] = None,
+        batch_size: int = 500
+    ) -> Generator[Dict, None, None]:
+        """
+        Execute a query through a server-side cursor and yield rows as they arrive.
+        
+        Only batch_size rows are held client-side at a time. The connection
+        stays checked out until the generator is exhausted or closed.
+        """
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor(name=f"hp_stream_{next(self._cursor_counter)}") as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(query, params)
+                    for row in cursor:
+                        yield dict(row)
+                        
+            except Exception as e:
+                logger.error(f"Streaming query failed: {e}, Query: {query[:100]}...")
+                raise QueryError(f"Streaming query failed: {e}")
+    
+    def execute_prepared(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True
+    ) -> Union[List[Dict], Dict, None]:
+        """
+        Execute a query with %(name)s parameters as a server-side prepared statement.
+        
+        The statement is prepared once per pooled connection and reused on
+        later calls, so repeated queries skip parsing and planning. Parameter
+        types come from the first call's values (see _prepared_param_type),
+        and a call whose values have different types prepares its own
+        statement. Each connection keeps at most prepared_cache_size
+        statements, evicting the least recently used.
+        
+        params may also be a tuple or list of values in placeholder order,
+        which skips building a dict for hot single-row inserts.
+        """
+        positional_query, names = _to_positional(query)
+        params = params or {}
+        if isinstance(params, (tuple, list)):
+            values = list(params)
+        else:
+            values = [params[param_name] for param_name in names]
+        param_types = tuple(_prepared_param_type(value) for value in values)
+        statement_key = (query, param_types)
+        
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    statements = self._prepared.setdefault(conn, OrderedDict())
+                    name = statements.get(statement_key)
+                    
+                    if name is None:
+                        name = f"hp_stmt_{next(self._prepared_counter)}"
+                        if param_types:
+                            cursor.execute(f"PREPARE {name} ({', '.join(param_types)}) AS {positional_query}")
+                        else:
+                            cursor.execute(f"PREPARE {name} AS {positional_query}")
+                        statements[statement_key] = name
+                        
+                        if len(statements) > self.prepared_cache_size:
+                            _, evicted = statements.popitem(last=False)
+                            cursor.execute(f"DEALLOCATE {evicted}")
+                    else:
+                        statements.move_to_end(statement_key)
+                    
+                    if values:
+                        placeholders = ", ".join(["%s"] * len(values))
+                        cursor.execute(f"EXECUTE {name} ({placeholders})", values)
+                    else:
+                        cursor.execute(f"EXECUTE {name}")
+                    
+                    if fetch_one:
+                        result = cursor.fetchone()
+                        return dict(result) if result else None
+                    elif fetch_all:
+                        results = cursor.fetchall()
+                        return [dict(row) for row in results]
+                    else:
+                        return None
+                        
+            except Exception as e:
+                logger.error(f"Prepared query execution failed: {e}, Query: {query[:100]}...")
+                raise QueryError(f"Prepared query execution failed: {e}")
+    
     async def execute_async_query(
         self,
         query: str,
@@ -171,20 +583,54 @@ class DatabaseManager:
                 raise QueryError(f"Async query execution failed: {e}")
     
     def execute_transaction(self, operations: List[Tuple[str, Optional[Union[Dict, Tuple, List]]]]) -> bool:
-        """Execute multiple queries in a transaction."""
+        """
+        Execute multiple queries in a transaction.
+        
+        Inside transaction() or use_connection() the queries join the
+        owner's transaction, which commits or rolls them back.
+        """
+        pinned = self._connection_pinned()
         with self.get_connection() as conn:
             try:
                 with conn.cursor() as cursor:
                     for query, params in operations:
                         cursor.execute(query, params)
-                    conn.commit()
+                    if not pinned:
+                        conn.commit()
                     return True
                     
             except Exception as e:
-                conn.rollback()
+                if not pinned:
+                    conn.rollback()
                 logger.error(f"Transaction failed: {e}")
                 raise TransactionError(f"Transaction failed: {e}")
     
+    def execute_many(self, query: str, params_seq: Iterable[Union[Dict, Tuple, List]], page_size: int = 100) -> int:
+        """
+        Run one statement for each parameter set on a single pooled connection.
+        
+        The whole batch uses one connection checkout and commits together,
+        with statements sent page_size at a time, instead of paying a pool
+        checkout and round-trip per call. Returns the number of parameter
+        sets executed.
+        """
+        params_list = list(params_seq)
+        if not params_list:
+            return 0
+        
+        pinned = self._connection_pinned()
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    execute_batch(cursor, query, params_list, page_size=page_size)
+                    return len(params_list)
+                    
+            except Exception as e:
+                if not pinned:
+                    conn.rollback()
+                logger.error(f"Batch execution failed: {e}, Query: {query[:100]}...")
+                raise QueryError(f"Batch execution failed: {e}")
+    
     def execute_batch_insert(
         self,
         table: str,
@@ -196,12 +642,13 @@ class DatabaseManager:
         if not data:
             return 0
         
+        pinned = self._connection_pinned()
         with self.get_connection() as conn:
             try:
                 with conn.cursor() as cursor:
-                    # Prepare insert query
-                    placeholders = ', '.join(['%s'] * len(columns))
-                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                    # Prepare insert query; execute_values expands the single
+                    # VALUES placeholder into one multi-row statement per page
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
                     
                     # Convert data to tuples if needed
                     if isinstance(data[0], dict):
@@ -215,14 +662,47 @@ class DatabaseManager:
                         page_size=page_size
                     )
                     
-                    conn.commit()
+                    if not pinned:
+                        conn.commit()
                     return len(data)
                     
             except Exception as e:
-                conn.rollback()
+                if not pinned:
+                    conn.rollback()
                 logger.error(f"Batch insert failed: {e}")
                 raise QueryError(f"Batch insert failed: {e}")
     
+    def copy_records(
+        self,
+        table: str,
+        columns: List[str],
+        rows: Iterable[Sequence[Any]]
+    ) -> int:
+        """
+        Bulk load rows with COPY ... FROM STDIN.
+        
+        Rows are encoded to COPY text format while the server reads them, so
+        any number of rows loads in constant memory with none of the
+        per-statement overhead of INSERT. Returns the number of rows copied.
+        """
+        lines = ("\t".join(_copy_field(value) for value in row).encode() + b"\n" for row in rows)
+        
+        pinned = self._connection_pinned()
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+                        _CopyStream(lines)
+                    )
+                    return cursor.rowcount
+                    
+            except Exception as e:
+                if not pinned:
+                    conn.rollback()
+                logger.error(f"COPY into {table} failed: {e}")
+                raise QueryError(f"COPY into {table} failed: {e}")
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get database health status."""
         try:
@@ -259,6 +739,7 @@ class DatabaseManager:
                         "active_connections": stats["active_connections"],
                         "table_count": table_info["table_count"],
                         "pool_size": self.config.database.pool_size,
+                        "async_pool_size": self.config.database.async_pool_size,
                         "checked_at": datetime.now(timezone.utc)
                     }
                     
@@ -280,20 +761,28 @@ class DatabaseManager:
             asyncio.create_task(self._async_pool.close())
             self._async_pool = None
         
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+        
         self._initialized = False
         logger.info("Database connection pools closed")
 
 
 # Global database manager instance
 _db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
 
 
 def get_db_manager() -> DatabaseManager:
-    """Get the global database manager instance."""
+    """Get the global database manager instance (one connection pool per process)."""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
-        _db_manager.initialize()
+        with _db_manager_lock:
+            if _db_manager is None:
+                manager = DatabaseManager()
+                manager.initialize()
+                _db_manager = manager
     return _db_manager
 
 
@@ -394,9 +883,11 @@ class QueryBuilder:
         
         return query, self._params
     
-    def execute(self) -> List[Dict]:
-        """Execute the built query."""
+    def execute(self, prepared: bool = False) -> List[Dict]:
+        """Execute the built query, optionally as a server-side prepared statement."""
         query, params = self.build()
+        if prepared:
+            return get_db_manager().execute_prepared(query, params)
         return execute_query(query, params)
 
 
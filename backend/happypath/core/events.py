@@ -11,16 +11,21 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from .config import get_config
 from .logging import get_logger
-from .database import execute_query
+from .database import execute_query, get_db_manager
 from .cache import get_cache_manager
 from .exceptions import HappyPathError
 
 logger = get_logger(__name__)
 
+EVENT_LOG_COLUMNS = [
+    "event_id", "event_type", "source", "timestamp", "data",
+    "user_id", "correlation_id", "metadata"
+]
+
 
 class EventType(Enum):
     """System event types."""
@@ -29,6 +34,7 @@ class EventType(Enum):
     USER_LOGIN = "user_login"
     USER_LOGOUT = "user_logout"
     USER_PROFILE_UPDATED = "user_profile_updated"
+    SESSION_CREATED = "session_created"
     
     # Subscription events
     SUBSCRIPTION_CREATED = "subscription_created"
@@ -59,6 +65,12 @@ class EventType(Enum):
     HEALTH_CHECK_FAILED = "health_check_failed"
 
 
+# Cache each member's string value on the member itself; Enum.value is a
+# descriptor lookup, and these are read for every published event
+for _member in EventType:
+    _member._str = _member.value
+
+
 @dataclass
 class Event:
     """Event data structure."""
@@ -98,9 +110,18 @@ class EventManager:
         self._sync_handlers: Dict[EventType, List[Callable]] = defaultdict(list)
         self._event_store_enabled = True
         self._lock = threading.Lock()
+        # append/popleft are atomic, so any thread may enqueue without a lock
+        self._pending: deque = deque()
     
-    def register_handler(self, event_type: EventType, handler: Union[EventHandler, Callable]):
-        """Register an event handler."""
+    def register_handler(self, event_type: Union[EventType, str], handler: Union[EventHandler, Callable]):
+        """
+        Register an event handler.
+        
+        event_type may also be given as its string value, as for enqueue().
+        """
+        if not isinstance(event_type, EventType):
+            event_type = EventType(event_type)
+        
         with self._lock:
             if isinstance(handler, EventHandler):
                 self._handlers[event_type].append(handler)
@@ -111,8 +132,11 @@ class EventManager:
         
         logger.info(f"Event handler registered for {event_type.value}")
     
-    def unregister_handler(self, event_type: EventType, handler: Union[EventHandler, Callable]):
+    def unregister_handler(self, event_type: Union[EventType, str], handler: Union[EventHandler, Callable]):
         """Unregister an event handler."""
+        if not isinstance(event_type, EventType):
+            event_type = EventType(event_type)
+        
         with self._lock:
             if isinstance(handler, EventHandler):
                 if handler in self._handlers[event_type]:
@@ -154,7 +178,7 @@ class EventManager:
         # Handle event
         await self._handle_event_async(event)
         
-        logger.debug(f"Event published: {event_type.value} - {event.event_id}")
+        logger.debug(f"Event published: {event_type._str} - {event.event_id}")
         return event.event_id
     
     def publish(
@@ -185,41 +209,143 @@ class EventManager:
         # Handle event synchronously
         self._handle_event_sync(event)
         
-        logger.debug(f"Event published: {event_type.value} - {event.event_id}")
+        logger.debug(f"Event published: {event_type._str} - {event.event_id}")
+        return event.event_id
+    
+    def enqueue(
+        self,
+        event_type: Union[EventType, str],
+        data: Dict[str, Any],
+        source: str,
+        user_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Queue an event for deferred handling by process_pending_events().
+        
+        event_type may also be given as its string value, so callers such as
+        repositories can publish without importing this module.
+        """
+        if not isinstance(event_type, EventType):
+            event_type = EventType(event_type)
+        
+        event = Event(
+            event_id=str(uuid.uuid4()),
+            event_type=event_type,
+            source=source,
+            timestamp=datetime.now(timezone.utc),
+            data=data,
+            user_id=user_id,
+            correlation_id=correlation_id,
+            metadata=metadata or {}
+        )
+        
+        self._pending.append(event)
+        
+        logger.debug(f"Event queued: {event_type._str} - {event.event_id}")
         return event.event_id
     
+    @property
+    def pending_count(self) -> int:
+        """Number of queued events awaiting processing."""
+        return len(self._pending)
+    
+    async def process_pending_events(self, batch_size: int = 256) -> int:
+        """
+        Drain the pending buffer and dispatch every queued event.
+        
+        Events are popped from the deque in batches rather than awaited one
+        at a time, so no future, timer or condition notify is involved per
+        item. Returns the number of events processed.
+        """
+        pending = self._pending
+        processed = 0
+        
+        while True:
+            batch = []
+            try:
+                while len(batch) < batch_size:
+                    batch.append(pending.popleft())
+            except IndexError:
+                pass
+            
+            if not batch:
+                return processed
+            
+            # Group by type so each handler set sees its events in order,
+            # then persist the batch and run every group concurrently
+            groups: Dict[EventType, List[Event]] = defaultdict(list)
+            for event in batch:
+                groups[event.event_type].append(event)
+            
+            flushes = [self._handle_event_group(events) for events in groups.values()]
+            if self._event_store_enabled:
+                flushes.append(self._store_events(batch))
+            await asyncio.gather(*flushes)
+            
+            processed += len(batch)
+            
+            # Let other tasks run between batches
+            await asyncio.sleep(0)
+    
+    async def run_event_processor(self, poll_interval: float = 0.001, batch_size: int = 256):
+        """Continuously process queued events, sleeping only while the queue is empty."""
+        while True:
+            if not await self.process_pending_events(batch_size):
+                await asyncio.sleep(poll_interval)
+    
+    async def _handle_event_group(self, events: List[Event]):
+        """Handle events of one type in order."""
+        for event in events:
+            await self._handle_event_async(event)
+    
     async def _handle_event_async(self, event: Event):
-        """Handle event with async handlers."""
+        """
+        Handle event with async handlers.
+        
+        Plain function handlers are called inline; only EventHandler objects
+        and ``async def`` handlers are awaited. When an event type has no
+        awaitable handlers the sync path is taken directly, so no coroutine
+        or executor job is created for it.
+        """
+        handlers = self._handlers.get(event.event_type)
+        async_handlers = self._async_handlers.get(event.event_type)
+        
+        if not handlers and not async_handlers:
+            self._handle_event_sync(event)
+            return
+        
         try:
             # Run object-based handlers
-            for handler in self._handlers[event.event_type]:
+            for handler in handlers or ():
                 try:
                     await handler.handle(event)
                 except Exception as e:
                     logger.error(f"Event handler {handler.name} failed: {e}")
             
             # Run async function handlers
-            for handler in self._async_handlers[event.event_type]:
+            for handler in async_handlers or ():
                 try:
                     await handler(event)
                 except Exception as e:
                     logger.error(f"Async event handler failed: {e}")
             
-            # Run sync function handlers in thread pool
-            for handler in self._sync_handlers[event.event_type]:
-                try:
-                    await asyncio.get_event_loop().run_in_executor(None, handler, event)
-                except Exception as e:
-                    logger.error(f"Sync event handler failed: {e}")
+            # Run sync function handlers
+            self._handle_event_sync(event)
                     
         except Exception as e:
             logger.error(f"Event handling failed for {event.event_type.value}: {e}")
     
     def _handle_event_sync(self, event: Event):
         """Handle event with sync handlers only."""
+        sync_handlers = self._sync_handlers.get(event.event_type)
+        if not sync_handlers:
+            return
+        
         try:
             # Run sync function handlers
-            for handler in self._sync_handlers[event.event_type]:
+            for handler in sync_handlers:
                 try:
                     handler(event)
                 except Exception as e:
@@ -238,14 +364,13 @@ class EventManager:
                 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            # Use thread pool for database operation
-            await asyncio.get_event_loop().run_in_executor(
-                None,
+            # Run the blocking insert on the database I/O executor
+            await get_db_manager().run_blocking(
                 execute_query,
                 query,
                 (
                     event.event_id,
-                    event.event_type.value,
+                    event.event_type._str,
                     event.source,
                     event.timestamp,
                     json.dumps(event.data),
@@ -260,6 +385,34 @@ class EventManager:
         except Exception as e:
             logger.error(f"Failed to store event {event.event_id}: {e}")
     
+    async def _store_events(self, events: List[Event]):
+        """Store a batch of events with one multi-row insert."""
+        try:
+            rows = [
+                (
+                    event.event_id,
+                    event.event_type._str,
+                    event.source,
+                    event.timestamp,
+                    json.dumps(event.data),
+                    event.user_id,
+                    event.correlation_id,
+                    json.dumps(event.metadata) if event.metadata else None
+                )
+                for event in events
+            ]
+            
+            db_manager = get_db_manager()
+            await db_manager.run_blocking(
+                db_manager.execute_batch_insert,
+                "event_log",
+                EVENT_LOG_COLUMNS,
+                rows
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to store {len(events)} events: {e}")
+    
     def _store_event_sync(self, event: Event):
         """Store event in database synchronously."""
         try:
@@ -274,7 +427,7 @@ class EventManager:
                 query,
                 (
                     event.event_id,
-                    event.event_type.value,
+                    event.event_type._str,
                     event.source,
                     event.timestamp,
                     json.dumps(event.data),
@@ -494,7 +647,7 @@ class AuditEventHandler(EventHandler):
                 audit_logger.log_event(
                     event_type=audit_type,
                     user_id=event.user_id,
-                    description=f"Event: {event.event_type.value}",
+                    description=f"Event: {event.event_type._str}",
                     details=event.data,
                     severity=AuditSeverity.MEDIUM
                 )
@@ -3,14 +3,21 @@ Structured logging system for the Happy Path platform.
 Provides centralized logging with multiple outputs, levels, and formats.
 """
 
+import atexit
 import logging
 import logging.handlers
 import json
+import os
+import queue
+import struct
 import sys
+import threading
+from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
 from contextvars import ContextVar
 
 from .config import get_config
@@ -45,12 +52,13 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
         
-        # Add context information
-        request_id = request_id_ctx.get()
+        # Add context information (captured on the record when it was
+        # formatted off the logging thread, see ThreadLocalBufferHandler)
+        request_id = getattr(record, 'ctx_request_id', None) or request_id_ctx.get()
         if request_id:
             log_data["request_id"] = request_id
         
-        user_id = user_id_ctx.get()
+        user_id = getattr(record, 'ctx_user_id', None) or user_id_ctx.get()
         if user_id:
             log_data["user_id"] = user_id
         
@@ -115,6 +123,492 @@ class SecurityFilter(logging.Filter):
         return value
 
 
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that batches writes instead of flushing per record.
+    
+    Records accumulate in a buffer of ``buffer_size`` bytes that is written
+    out when full, and a background thread flushes whatever is pending every
+    ``flush_interval`` seconds, so bursts of log calls cost one write()
+    instead of one per record.
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        encoding: Optional[str] = None,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 0.05
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._bytes_written = 0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name="happy-path-log-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+    
+    def _open(self):
+        """Open the log file with a large write buffer."""
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+        self._bytes_written = os.path.getsize(self.baseFilename)
+        return stream
+    
+    def emit(self, record: logging.LogRecord):
+        """Buffer a record, rolling over when the size limit would be exceeded."""
+        try:
+            msg = self.format(record) + self.terminator
+            
+            # Size is tracked locally; the base class seeks the stream for
+            # every record, which would flush the buffer each time.
+            if self.maxBytes > 0 and self._bytes_written + len(msg) >= self.maxBytes:
+                self.doRollover()
+            
+            if self.stream is None:
+                self.stream = self._open()
+            
+            self.stream.write(msg)
+            self._bytes_written += len(msg)
+            
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _flush_loop(self):
+        """Flush buffered records until the handler is closed."""
+        while not self._stop_flushing.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
+    
+    def close(self):
+        """Stop the flush thread and write out any buffered records."""
+        self._stop_flushing.set()
+        super().close()
+
+
+class InternedLogHandler(logging.handlers.RotatingFileHandler):
+    """
+    Compact binary log writer with interned message templates.
+    
+    Each distinct message template and logger name is written once as a
+    definition record and referenced by integer ID afterwards. Log records
+    only carry (level, timestamp, template ID, logger ID) plus the format
+    arguments and extra data, so repeated messages cost a few bytes instead
+    of a full JSON document. Use read_interned_log() to decode the file.
+    
+    Interning works on the unformatted template, so callers should pass
+    %-style arguments rather than pre-formatted f-strings. Arguments that
+    are None, bool, int, float or str are packed with their type and
+    formatted when the file is read; a record with any other argument
+    stores its formatted message instead. Files rotate like
+    RotatingFileHandler, and every file starts its own definitions so each
+    one decodes on its own.
+    """
+    
+    DEFINITION = 0
+    RECORD = 1
+    
+    _definition_header = struct.Struct("<BII")
+    _record_header = struct.Struct("<BBdIIII")
+    
+    ARG_NONE, ARG_FALSE, ARG_TRUE, ARG_INT, ARG_FLOAT, ARG_STR = range(6)
+    _int_arg = struct.Struct("<q")
+    _float_arg = struct.Struct("<d")
+    _str_length = struct.Struct("<I")
+    
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        buffer_size: int = 64 * 1024
+    ):
+        self.buffer_size = buffer_size
+        self._ids: Dict[str, int] = {}
+        self._bytes_written = 0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        self.mode = "ab"
+        self.stream = self._open()
+    
+    def _open(self):
+        """Open the log file in binary mode; a new file needs its own definitions."""
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size)
+        self._bytes_written = os.path.getsize(self.baseFilename)
+        self._ids = {}
+        return stream
+    
+    def _write(self, data: bytes):
+        """Write bytes to the current file, tracking its size."""
+        self.stream.write(data)
+        self._bytes_written += len(data)
+    
+    def _intern(self, text: str) -> int:
+        """Return the ID for a string, writing its definition on first use."""
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self._ids)
+            self._ids[text] = string_id
+            encoded = text.encode("utf-8")
+            self._write(self._definition_header.pack(self.DEFINITION, string_id, len(encoded)))
+            self._write(encoded)
+        return string_id
+    
+    def _pack_args(self, args: Any) -> Optional[bytes]:
+        """Pack primitive arguments with their types, or return None if any is not primitive."""
+        if not isinstance(args, tuple):
+            return None
+        
+        parts = []
+        for arg in args:
+            if arg is None:
+                parts.append(bytes((self.ARG_NONE,)))
+            elif arg is False or arg is True:
+                parts.append(bytes((self.ARG_TRUE if arg else self.ARG_FALSE,)))
+            elif type(arg) is int and -2 ** 63 <= arg < 2 ** 63:
+                parts.append(bytes((self.ARG_INT,)) + self._int_arg.pack(arg))
+            elif type(arg) is float:
+                parts.append(bytes((self.ARG_FLOAT,)) + self._float_arg.pack(arg))
+            elif type(arg) is str:
+                encoded = arg.encode("utf-8")
+                parts.append(bytes((self.ARG_STR,)) + self._str_length.pack(len(encoded)) + encoded)
+            else:
+                return None
+        return b"".join(parts)
+    
+    def emit(self, record: logging.LogRecord):
+        """Write a record as template/logger IDs plus packed arguments."""
+        try:
+            packed_args = b""
+            payload = {}
+            if record.args:
+                packed_args = self._pack_args(record.args)
+                if packed_args is None:
+                    packed_args = b""
+                    payload["message"] = record.getMessage()
+            extra_data = getattr(record, "extra_data", None)
+            if extra_data:
+                payload["extra"] = extra_data
+            if record.exc_info:
+                payload["exception"] = logging.Formatter().formatException(record.exc_info)
+            packed_payload = json.dumps(payload, default=str).encode("utf-8") if payload else b""
+            
+            # Size is tracked locally, as in BufferedRotatingFileHandler
+            size = self._record_header.size + len(packed_args) + len(packed_payload)
+            if self.maxBytes > 0 and self._bytes_written and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            
+            if self.stream is None:
+                self.stream = self._open()
+            
+            template_id = self._intern(str(record.msg))
+            logger_id = self._intern(record.name)
+            self._write(self._record_header.pack(
+                self.RECORD,
+                record.levelno,
+                record.created,
+                template_id,
+                logger_id,
+                len(packed_args),
+                len(packed_payload)
+            ))
+            self._write(packed_args)
+            self._write(packed_payload)
+            
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+                
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _unpack_interned_args(data: bytes) -> Tuple[Any, ...]:
+    """Decode arguments packed by InternedLogHandler._pack_args()."""
+    handler = InternedLogHandler
+    args: List[Any] = []
+    offset = 0
+    
+    while offset < len(data):
+        tag = data[offset]
+        offset += 1
+        if tag == handler.ARG_NONE:
+            args.append(None)
+        elif tag in (handler.ARG_FALSE, handler.ARG_TRUE):
+            args.append(tag == handler.ARG_TRUE)
+        elif tag == handler.ARG_INT:
+            args.append(handler._int_arg.unpack_from(data, offset)[0])
+            offset += handler._int_arg.size
+        elif tag == handler.ARG_FLOAT:
+            args.append(handler._float_arg.unpack_from(data, offset)[0])
+            offset += handler._float_arg.size
+        else:
+            length = handler._str_length.unpack_from(data, offset)[0]
+            offset += handler._str_length.size
+            args.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+    
+    return tuple(args)
+
+
+def read_interned_log(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Decode a file written by InternedLogHandler into JSON-style dicts."""
+    definition_header = InternedLogHandler._definition_header
+    record_header = InternedLogHandler._record_header
+    strings: Dict[int, str] = {}
+    
+    with open(file_path, "rb") as f:
+        while True:
+            kind = f.read(1)
+            if not kind:
+                return
+            
+            if kind[0] == InternedLogHandler.DEFINITION:
+                _, string_id, length = definition_header.unpack(kind + f.read(definition_header.size - 1))
+                strings[string_id] = f.read(length).decode("utf-8")
+                continue
+            
+            _, levelno, created, template_id, logger_id, args_length, payload_length = record_header.unpack(
+                kind + f.read(record_header.size - 1)
+            )
+            args = _unpack_interned_args(f.read(args_length)) if args_length else ()
+            payload = json.loads(f.read(payload_length)) if payload_length else {}
+            
+            message = payload.get("message", strings.get(template_id, ""))
+            if args:
+                try:
+                    message = message % args
+                except (TypeError, ValueError):
+                    message = f"{message} {args}"
+            
+            log_data = {
+                "timestamp": datetime.fromtimestamp(created, tz=timezone.utc).isoformat(),
+                "level": logging.getLevelName(levelno),
+                "logger": strings.get(logger_id, ""),
+                "message": message
+            }
+            if "exception" in payload:
+                log_data["exception"] = payload["exception"]
+            log_data.update(payload.get("extra", {}))
+            
+            yield log_data
+
+
+class ThreadLocalBufferHandler(logging.Handler):
+    """
+    Per-thread record buffering in front of another handler.
+    
+    Each thread appends records to its own deque without taking any lock, and
+    a background thread periodically merges all buffers (ordered by record
+    time) into the target handler under a single acquisition of its lock. A
+    thread whose buffer reaches ``capacity`` drains it inline.
+    
+    Records pass the target's filters and are rendered to their final message
+    before buffering, like QueueHandler.prepare(): args and exc_info are
+    cleared so buffered records neither change with mutable arguments nor
+    keep traceback frames alive. Exceptions therefore reach the target as
+    text within the message.
+    """
+    
+    def __init__(self, target: logging.Handler, capacity: int = 1024, flush_interval: float = 0.05):
+        super().__init__(level=target.level)
+        self.target = target
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, Deque[logging.LogRecord]]] = []
+        self._registry_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        
+        self._stop_draining = threading.Event()
+        self._drainer = threading.Thread(
+            target=self._drain_loop,
+            name="happy-path-log-drainer",
+            daemon=True
+        )
+        self._drainer.start()
+    
+    def _thread_buffer(self) -> Deque[logging.LogRecord]:
+        """Get the calling thread's buffer, registering it on first use."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = deque()
+            with self._registry_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        return buffer
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and buffer a record without taking the handler lock."""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def emit(self, record: logging.LogRecord):
+        """Render a record and append it to the calling thread's buffer."""
+        # Context variables are not visible from the drain thread
+        record.ctx_request_id = request_id_ctx.get()
+        record.ctx_user_id = user_id_ctx.get()
+        
+        # Target filters may redact args, so they run before args are rendered
+        if not self.target.filter(record):
+            return
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        
+        buffer = self._thread_buffer()
+        buffer.append(record)
+        
+        if len(buffer) >= self.capacity:
+            self.flush()
+    
+    def flush(self):
+        """Merge all thread buffers into the target handler."""
+        with self._drain_lock:
+            with self._registry_lock:
+                buffers = list(self._buffers)
+            
+            records = []
+            for thread, buffer in buffers:
+                # popleft is atomic, so owners can keep appending meanwhile
+                for _ in range(len(buffer)):
+                    records.append(buffer.popleft())
+            
+            with self._registry_lock:
+                self._buffers = [
+                    (thread, buffer) for thread, buffer in self._buffers
+                    if thread.is_alive() or buffer
+                ]
+            
+            if not records:
+                return
+            
+            records.sort(key=lambda r: r.created)
+            
+            self.target.acquire()
+            try:
+                for record in records:
+                    if record.levelno >= self.target.level:
+                        self.target.emit(record)
+            finally:
+                self.target.release()
+            self.target.flush()
+    
+    def _drain_loop(self):
+        """Periodically drain thread buffers until the handler is closed."""
+        while not self._stop_draining.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
+    
+    def close(self):
+        """Drain remaining records and close the target handler."""
+        self._stop_draining.set()
+        self.flush()
+        self.target.close()
+        super().close()
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that carries request context to the QueueListener thread.
+    
+    Context variables are not visible from the listener, so they are copied
+    onto the record the same way ThreadLocalBufferHandler does.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Capture request context, then prepare the record for queuing."""
+        record.ctx_request_id = request_id_ctx.get()
+        record.ctx_user_id = user_id_ctx.get()
+        return super().prepare(record)
+
+
+# One queue and listener thread shared by every get_queued_logger() logger;
+# setup_logging() points the listener at the current root handlers
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = ContextQueueHandler(_log_queue)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queued_logger_names: set = set()
+_queue_lock = threading.Lock()
+
+
+def get_queued_logger(name: str) -> logging.Logger:
+    """
+    Get a stdlib logger whose records reach the root handlers through a queue.
+    
+    Callers only enqueue the record, so concurrent writers never wait on
+    handler locks or I/O. Until setup_logging() has started the listener
+    the logger simply propagates.
+    """
+    with _queue_lock:
+        _queued_logger_names.add(name)
+        queued_logger = logging.getLogger(name)
+        _route_queued_logger(queued_logger)
+    return queued_logger
+
+
+def _route_queued_logger(queued_logger: logging.Logger):
+    """Send a queued logger to the listener when it runs, else let it propagate; caller holds the lock."""
+    if _queue_listener is not None:
+        queued_logger.handlers = [_queue_handler]
+        queued_logger.propagate = False
+    else:
+        queued_logger.handlers = []
+        queued_logger.propagate = True
+
+
+def _restart_queue_listener(handlers: List[logging.Handler]):
+    """Drain the running listener, then start one emitting to handlers."""
+    global _queue_listener
+    
+    with _queue_lock:
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            _queue_listener = None
+        if handlers:
+            _queue_listener = logging.handlers.QueueListener(
+                _log_queue, *handlers, respect_handler_level=True
+            )
+            _queue_listener.start()
+        
+        for name in _queued_logger_names:
+            _route_queued_logger(logging.getLogger(name))
+
+
+def _stop_queue_listener():
+    """Emit the queued records and stop the listener thread."""
+    _restart_queue_listener([])
+
+
+atexit.register(_stop_queue_listener)
+
+
 class HappyPathLogger:
     """Enhanced logger with context and security features."""
     
@@ -132,6 +626,9 @@ class HappyPathLogger:
     
     def _log_with_context(self, level: int, message: str, *args, **kwargs):
         """Log with additional context."""
+        if not self.logger.isEnabledFor(level):
+            return
+        
         extra_data = self._extra_context.copy()
         extra_data.update(kwargs.pop('extra_data', {}))
         
@@ -140,6 +637,10 @@ class HappyPathLogger:
         
         self.logger.log(level, message, *args, extra=extra, **kwargs)
     
+    def log(self, level: int, message: str, *args, **kwargs):
+        """Log message at the given level."""
+        self._log_with_context(level, message, *args, **kwargs)
+    
     def debug(self, message: str, *args, **kwargs):
         """Log debug message."""
         self._log_with_context(logging.DEBUG, message, *args, **kwargs)
@@ -171,7 +672,8 @@ def setup_logging(
     enable_console: Optional[bool] = None,
     enable_file: Optional[bool] = None,
     file_path: Optional[str] = None,
-    enable_json: Optional[bool] = None
+    enable_json: Optional[bool] = None,
+    enable_binary: Optional[bool] = None
 ) -> None:
     """Setup logging configuration."""
     config = get_config()
@@ -182,6 +684,7 @@ def setup_logging(
     file_enabled = enable_file if enable_file is not None else bool(config.logging.file_path)
     log_file = file_path or config.logging.file_path
     json_enabled = enable_json if enable_json is not None else config.logging.enable_json
+    binary_enabled = enable_binary if enable_binary is not None else config.logging.enable_binary
     
     # Configure root logger
     root_logger = logging.getLogger()
@@ -213,20 +716,40 @@ def setup_logging(
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Rotating file handler
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file,
-                maxBytes=config.logging.max_file_size,
-                backupCount=config.logging.backup_count,
-                encoding='utf-8'
-            )
-            file_handler.setFormatter(formatter)
+            if binary_enabled:
+                # Interned binary records; decode with read_interned_log()
+                file_handler = InternedLogHandler(
+                    log_file,
+                    maxBytes=config.logging.max_file_size,
+                    backupCount=config.logging.backup_count,
+                    buffer_size=config.logging.file_buffer_size
+                )
+            else:
+                # Rotating file handler with buffered, interval-flushed writes
+                file_handler = BufferedRotatingFileHandler(
+                    log_file,
+                    maxBytes=config.logging.max_file_size,
+                    backupCount=config.logging.backup_count,
+                    encoding='utf-8',
+                    buffer_size=config.logging.file_buffer_size,
+                    flush_interval=config.logging.file_flush_interval
+                )
+                file_handler.setFormatter(formatter)
             file_handler.addFilter(security_filter)
+            
+            # The thread buffer renders messages up front, which would defeat
+            # the binary handler's template interning
+            if config.logging.enable_thread_buffer and not binary_enabled:
+                file_handler = ThreadLocalBufferHandler(file_handler)
+            
             root_logger.addHandler(file_handler)
             
         except Exception as e:
             raise ConfigurationError(f"Failed to setup file logging: {e}")
     
+    # Queued loggers now emit to the new root handlers
+    _restart_queue_listener(list(root_logger.handlers))
+    
     # Setup application logger
     app_logger = logging.getLogger('happy_path')
     app_logger.setLevel(getattr(logging, log_level.upper()))
@@ -236,8 +759,15 @@ def setup_logging(
     logger.info(f"Logging setup completed - Level: {log_level}, Console: {console_enabled}, File: {file_enabled}")
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> HappyPathLogger:
-    """Get a logger instance with Happy Path enhancements."""
+    """
+    Get a logger instance with Happy Path enhancements.
+    
+    Instances are cached per name, like logging.getLogger, so repeated
+    lookups are a dictionary hit. Context set with set_context() is
+    therefore shared by every caller using the same name.
+    """
     return HappyPathLogger(name)
 
 
@@ -4,6 +4,9 @@ Provides system metrics, performance monitoring, and health checks.
 """
 
 import asyncio
+import os
+import re
+import sys
 import time
 import psutil
 import threading
@@ -20,6 +23,9 @@ from .exceptions import MonitoringError
 
 logger = get_logger(__name__)
 
+_MEMINFO_PATTERN = re.compile(r"^(MemTotal|MemAvailable):\s+(\d+) kB", re.MULTILINE)
+_PROC_AVAILABLE = sys.platform.startswith("linux") and os.path.exists("/proc/stat")
+
 
 @dataclass
 class HealthStatus:
@@ -303,9 +309,16 @@ class MetricsCollector:
         self.metrics_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_data_points))
         self.start_time = time.time()
         self._lock = threading.Lock()
+        self._last_cpu_times: Optional[tuple] = None
     
     def collect_system_metrics(self) -> SystemMetrics:
         """Collect current system metrics."""
+        if _PROC_AVAILABLE:
+            try:
+                return self._collect_proc_metrics()
+            except Exception as e:
+                logger.warning(f"Falling back to psutil for system metrics: {e}")
+        
         try:
             # CPU metrics
             cpu_percent = psutil.cpu_percent(interval=0.1)
@@ -347,6 +360,64 @@ class MetricsCollector:
             logger.error(f"Failed to collect system metrics: {e}")
             raise MonitoringError(f"System metrics collection failed: {e}")
     
+    def _collect_proc_metrics(self) -> SystemMetrics:
+        """
+        Build a metrics snapshot from a single read of /proc and statvfs.
+        
+        CPU usage is measured against the previous snapshot (since boot on
+        the first call), so no sampling sleep is needed.
+        """
+        with open("/proc/stat") as f:
+            cpu_fields = [int(value) for value in f.readline().split()[1:]]
+        with open("/proc/meminfo") as f:
+            meminfo = dict(_MEMINFO_PATTERN.findall(f.read()))
+        with open("/proc/net/dev") as f:
+            interfaces = f.readlines()[2:]
+        disk = os.statvfs("/")
+        
+        # CPU: busy = total - idle - iowait
+        total = sum(cpu_fields[:8])
+        idle = cpu_fields[3] + cpu_fields[4]
+        previous = self._last_cpu_times
+        self._last_cpu_times = (total, idle)
+        if previous and total > previous[0]:
+            total_delta, idle_delta = total - previous[0], idle - previous[1]
+        else:
+            total_delta, idle_delta = total, idle
+        cpu_percent = 100.0 * (total_delta - idle_delta) / total_delta if total_delta else 0.0
+        
+        # Memory (kB)
+        memory_total = int(meminfo["MemTotal"])
+        memory_available = int(meminfo["MemAvailable"])
+        memory_used = memory_total - memory_available
+        
+        # Disk
+        disk_free = disk.f_bavail * disk.f_frsize
+        disk_used = (disk.f_blocks - disk.f_bfree) * disk.f_frsize
+        disk_total = disk_used + disk_free
+        
+        # Network: receive bytes is the first field, transmit bytes the ninth
+        bytes_recv = bytes_sent = 0
+        for line in interfaces:
+            counters = line.split(":", 1)[1].split()
+            bytes_recv += int(counters[0])
+            bytes_sent += int(counters[8])
+        
+        return SystemMetrics(
+            cpu_percent=round(cpu_percent, 1),
+            memory_percent=round(100.0 * memory_used / memory_total, 1) if memory_total else 0.0,
+            memory_used_mb=memory_used / 1024,
+            memory_available_mb=memory_available / 1024,
+            disk_percent=round(100.0 * disk_used / disk_total, 1) if disk_total else 0.0,
+            disk_used_gb=disk_used / (1024**3),
+            disk_free_gb=disk_free / (1024**3),
+            network_sent_mb=bytes_sent / (1024**2),
+            network_recv_mb=bytes_recv / (1024**2),
+            uptime_seconds=time.time() - self.start_time,
+            load_average=list(os.getloadavg()),
+            timestamp=datetime.now(timezone.utc)
+        )
+    
     def record_metric(self, name: str, value: float, tags: Optional[Dict[str, str]] = None, unit: str = ""):
         """Record a custom metric."""
         metric = MetricData(
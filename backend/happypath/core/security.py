@@ -7,13 +7,13 @@ import jwt
 import bcrypt
 import secrets
 import hashlib
+import hmac
 import base64
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import re
 
 from .config import get_config
@@ -65,23 +65,54 @@ class SecurityManager:
         if len(self.config.security.secret_key) < 32:
             raise SecurityError("SECRET_KEY must be at least 32 characters")
     
+    PBKDF2_PREFIX = "pbkdf2_sha256"
+    
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
+        """Hash a password using the configured scheme (bcrypt by default)."""
         if not self._validate_password_strength(password):
             raise SecurityError("Password does not meet security requirements")
         
+        if self.config.security.password_hash_scheme == self.PBKDF2_PREFIX:
+            return self._hash_password_pbkdf2(password)
+        
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
     def verify_password(self, password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash."""
+        """Verify a password against its hash, whichever scheme produced it."""
         try:
+            if hashed_password.startswith(self.PBKDF2_PREFIX + "$"):
+                return self._verify_password_pbkdf2(password, hashed_password)
             return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
         except Exception as e:
             logger.error(f"Password verification failed: {e}")
             return False
     
+    def _hash_password_pbkdf2(self, password: str) -> str:
+        """Hash a password with PBKDF2-HMAC-SHA256 ("pbkdf2_sha256$iterations$salt$hash")."""
+        iterations = self.config.security.pbkdf2_iterations
+        salt = secrets.token_bytes(16)
+        # hashlib.pbkdf2_hmac runs the whole key stretch inside OpenSSL
+        derived = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+        return "$".join([
+            self.PBKDF2_PREFIX,
+            str(iterations),
+            base64.b64encode(salt).decode('ascii'),
+            base64.b64encode(derived).decode('ascii')
+        ])
+    
+    def _verify_password_pbkdf2(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against a pbkdf2_sha256 hash."""
+        _, iterations, salt, expected = hashed_password.split("$")
+        derived = hashlib.pbkdf2_hmac(
+            'sha256',
+            password.encode('utf-8'),
+            base64.b64decode(salt),
+            int(iterations)
+        )
+        return hmac.compare_digest(derived, base64.b64decode(expected))
+    
     def _validate_password_strength(self, password: str) -> bool:
         """Validate password strength requirements."""
         min_length = self.config.security.password_min_length
@@ -267,13 +298,14 @@ class EncryptionService:
                 return Fernet(key)
             
             # Otherwise, derive key from password
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=b'happy_path_salt',  # In production, use random salt per encryption
-                iterations=100000,
+            derived = hashlib.pbkdf2_hmac(
+                'sha256',
+                self.config.security.encryption_key.encode(),
+                b'happy_path_salt',  # In production, use random salt per encryption
+                100000,
+                dklen=32
             )
-            key = base64.urlsafe_b64encode(kdf.derive(self.config.security.encryption_key.encode()))
+            key = base64.urlsafe_b64encode(derived)
             return Fernet(key)
             
         except Exception as e:
@@ -361,26 +393,29 @@ class PermissionManager:
         """Get permissions for a user role."""
         return self.ROLE_PERMISSIONS.get(role, [])
     
-    def has_permission(self, user_role: str, required_permission: str) -> bool:
-        """Check if a user role has a specific permission."""
-        user_permissions = self.get_user_permissions(user_role)
-        
-        # Superadmin has all permissions
-        if "*" in user_permissions:
-            return True
-        
-        # Check exact permission match
-        if required_permission in user_permissions:
+    def permissions_for(self, roles: Iterable[str]) -> FrozenSet[str]:
+        """Get the combined permission set for one or more roles (cached per role set)."""
+        if isinstance(roles, str):
+            roles = (roles,)
+        return _role_permission_set(tuple(sorted(set(roles))))
+    
+    @staticmethod
+    def grants(permissions: FrozenSet[str], required_permission: str) -> bool:
+        """Check a permission against a set returned by permissions_for()."""
+        # Exact match, or superadmin has all permissions
+        if required_permission in permissions or "*" in permissions:
             return True
         
-        # Check wildcard permissions
-        for permission in user_permissions:
-            if permission.endswith(":*"):
-                permission_prefix = permission[:-1]  # Remove the *
-                if required_permission.startswith(permission_prefix):
-                    return True
-        
-        return False
+        # Check wildcard permissions, e.g. "mood:*"
+        parts = required_permission.split(":")
+        return any(
+            ":".join(parts[:depth]) + ":*" in permissions
+            for depth in range(1, len(parts))
+        )
+    
+    def has_permission(self, user_role: str, required_permission: str) -> bool:
+        """Check if a user role has a specific permission."""
+        return self.grants(self.permissions_for((user_role,)), required_permission)
     
     def can_access_user_data(self, accessor_role: str, accessor_id: str, target_user_id: str) -> bool:
         """Check if a user can access another user's data."""
@@ -408,6 +443,15 @@ class PermissionManager:
         return False
 
 
+@lru_cache(maxsize=128)
+def _role_permission_set(roles: Tuple[str, ...]) -> FrozenSet[str]:
+    """Union of the permissions granted by a sorted tuple of roles."""
+    permissions = set()
+    for role in roles:
+        permissions.update(PermissionManager.ROLE_PERMISSIONS.get(role, ()))
+    return frozenset(permissions)
+
+
 class AuthenticationService:
     """User authentication service."""
     
@@ -0,0 +1,30 @@
+"""
+Time helpers for the Happy Path platform.
+Provides cheap timestamps for high-frequency code paths.
+"""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+# (epoch second, formatted timestamp); replaced as a whole so readers on
+# other threads never see a mismatched pair
+_iso_cache: Tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Current local time as an ISO 8601 string with second resolution.
+    
+    The formatted string is cached and only rebuilt when the wall-clock
+    second changes, so bursts of calls skip datetime construction and
+    formatting. Use datetime.now() directly when sub-second precision matters.
+    """
+    global _iso_cache
+    
+    second = int(time.time())
+    cached_second, cached_iso = _iso_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _iso_cache = (second, cached_iso)
+    return cached_iso
@@ -25,7 +25,12 @@ from .base_repository import (
     NotFoundError,
     DuplicateError,
     build_where_clause,
-    build_order_clause
+    build_order_clause,
+    with_slots,
+    set_repository_context,
+    clear_repository_context,
+    unit_of_work,
+    memoized_query
 )
 
 # User management repositories
@@ -118,6 +123,7 @@ from .medication_repository import (
     Medication,
     MedicationDose,
     MedicationAdherence,
+    MedicationDoseBatch,
     MedicationRepository,
     MedicationDoseRepository,
     MedicationAdherenceRepository
@@ -155,137 +161,137 @@ from .care_coordination_repository import (
 )
 
 # Repository factory functions for core repositories
-def create_user_repository(db_manager, logger=None):
+def create_user_repository(db_manager=None, logger=None):
     """Create a UserRepository instance."""
     return UserRepository(db_manager, logger)
 
-def create_audit_repository(db_manager, logger=None):
+def create_audit_repository(db_manager=None, logger=None):
     """Create an AuditRepository instance."""
     return AuditRepository(db_manager, logger)
 
-def create_subscription_repository(db_manager, logger=None):
-    """Create a SubscriptionRepository instance."""
-    return SubscriptionRepository(db_manager, logger)
+def create_subscription_repository(db_manager=None, logger=None, plan_repo=None):
+    """Create a SubscriptionRepository instance, optionally sharing a plan repository."""
+    return SubscriptionRepository(db_manager, logger, plan_repo)
 
-def create_session_repository(db_manager, logger=None):
+def create_session_repository(db_manager=None, logger=None):
     """Create a SessionRepository instance."""
     return SessionRepository(db_manager, logger)
 
-def create_subscription_plan_repository(db_manager, logger=None):
+def create_subscription_plan_repository(db_manager=None, logger=None):
     """Create a SubscriptionPlanRepository instance."""
     return SubscriptionPlanRepository(db_manager, logger)
 
-def create_payment_repository(db_manager, logger=None):
+def create_payment_repository(db_manager=None, logger=None):
     """Create a PaymentRepository instance."""
     return PaymentRepository(db_manager, logger)
 
 # Factory functions for clinical repositories
-def create_therapeutic_relationship_repository(db_manager, logger=None):
+def create_therapeutic_relationship_repository(db_manager=None, logger=None):
     """Create a TherapeuticRelationshipRepository instance."""
     return TherapeuticRelationshipRepository(db_manager, logger)
 
-def create_treatment_plan_repository(db_manager, logger=None):
+def create_treatment_plan_repository(db_manager=None, logger=None):
     """Create a TreatmentPlanRepository instance."""
     return TreatmentPlanRepository(db_manager, logger)
 
-def create_therapy_session_repository(db_manager, logger=None):
+def create_therapy_session_repository(db_manager=None, logger=None):
     """Create a TherapySessionRepository instance."""
     return TherapySessionRepository(db_manager, logger)
 
-def create_mood_entry_repository(db_manager, logger=None):
+def create_mood_entry_repository(db_manager=None, logger=None):
     """Create a MoodEntryRepository instance."""
     return MoodEntryRepository(db_manager, logger)
 
-def create_mood_pattern_repository(db_manager, logger=None):
+def create_mood_pattern_repository(db_manager=None, logger=None):
     """Create a MoodPatternRepository instance."""
     return MoodPatternRepository(db_manager, logger)
 
-def create_mood_goal_repository(db_manager, logger=None):
+def create_mood_goal_repository(db_manager=None, logger=None):
     """Create a MoodGoalRepository instance."""
     return MoodGoalRepository(db_manager, logger)
 
-def create_journal_entry_repository(db_manager, logger=None):
+def create_journal_entry_repository(db_manager=None, logger=None):
     """Create a JournalEntryRepository instance."""
     return JournalEntryRepository(db_manager, logger)
 
-def create_journal_prompt_repository(db_manager, logger=None):
+def create_journal_prompt_repository(db_manager=None, logger=None):
     """Create a JournalPromptRepository instance."""
     return JournalPromptRepository(db_manager, logger)
 
-def create_crisis_detection_repository(db_manager, logger=None):
+def create_crisis_detection_repository(db_manager=None, logger=None):
     """Create a CrisisDetectionRepository instance."""
     return CrisisDetectionRepository(db_manager, logger)
 
-def create_crisis_escalation_repository(db_manager, logger=None):
+def create_crisis_escalation_repository(db_manager=None, logger=None):
     """Create a CrisisEscalationRepository instance."""
     return CrisisEscalationRepository(db_manager, logger)
 
-def create_safety_plan_repository(db_manager, logger=None):
+def create_safety_plan_repository(db_manager=None, logger=None):
     """Create a SafetyPlanRepository instance."""
     return SafetyPlanRepository(db_manager, logger)
 
-def create_appointment_repository(db_manager, logger=None):
+def create_appointment_repository(db_manager=None, logger=None):
     """Create an AppointmentRepository instance."""
     return AppointmentRepository(db_manager, logger)
 
-def create_provider_calendar_repository(db_manager, logger=None):
+def create_provider_calendar_repository(db_manager=None, logger=None):
     """Create a ProviderCalendarRepository instance."""
     return ProviderCalendarRepository(db_manager, logger)
 
-def create_medication_repository(db_manager, logger=None):
+def create_medication_repository(db_manager=None, logger=None):
     """Create a MedicationRepository instance."""
     return MedicationRepository(db_manager, logger)
 
-def create_medication_dose_repository(db_manager, logger=None):
+def create_medication_dose_repository(db_manager=None, logger=None):
     """Create a MedicationDoseRepository instance."""
     return MedicationDoseRepository(db_manager, logger)
 
-def create_medication_adherence_repository(db_manager, logger=None):
+def create_medication_adherence_repository(db_manager=None, logger=None):
     """Create a MedicationAdherenceRepository instance."""
     return MedicationAdherenceRepository(db_manager, logger)
 
-def create_conversation_repository(db_manager, logger=None):
+def create_conversation_repository(db_manager=None, logger=None):
     """Create a ConversationRepository instance."""
     return ConversationRepository(db_manager, logger)
 
-def create_chat_message_repository(db_manager, logger=None):
+def create_chat_message_repository(db_manager=None, logger=None):
     """Create a ChatMessageRepository instance."""
     return ChatMessageRepository(db_manager, logger)
 
-def create_user_account_repository(db_manager, logger=None):
+def create_user_account_repository(db_manager=None, logger=None):
     """Create a UserAccountRepository instance."""
     return UserAccountRepository(db_manager, logger)
 
-def create_audit_log_repository(db_manager, logger=None):
+def create_audit_log_repository(db_manager=None, logger=None):
     """Create an AuditLogRepository instance."""
     return AuditLogRepository(db_manager, logger)
 
-def create_system_configuration_repository(db_manager, logger=None):
+def create_system_configuration_repository(db_manager=None, logger=None):
     """Create a SystemConfigurationRepository instance."""
     return SystemConfigurationRepository(db_manager, logger)
 
-def create_provider_repository(db_manager, logger=None):
+def create_provider_repository(db_manager=None, logger=None):
     """Create a ProviderRepository instance."""
     return ProviderRepository(db_manager, logger)
 
-def create_referral_repository(db_manager, logger=None):
+def create_referral_repository(db_manager=None, logger=None):
     """Create a ReferralRepository instance."""
     return ReferralRepository(db_manager, logger)
 
-def create_care_team_repository(db_manager, logger=None):
+def create_care_team_repository(db_manager=None, logger=None):
     """Create a CareTeamRepository instance."""
     return CareTeamRepository(db_manager, logger)
 
 # Async repository factory functions
-def create_async_user_repository(db_manager, logger=None):
+def create_async_user_repository(db_manager=None, logger=None):
     """Create an AsyncUserRepository instance."""
     return AsyncUserRepository(db_manager, logger)
 
-def create_async_audit_repository(db_manager, logger=None):
+def create_async_audit_repository(db_manager=None, logger=None):
     """Create an AsyncAuditRepository instance."""
     return AsyncAuditRepository(db_manager, logger)
 
-def create_async_session_repository(db_manager, logger=None):
+def create_async_session_repository(db_manager=None, logger=None):
     """Create an AsyncSessionRepository instance."""
     return AsyncSessionRepository(db_manager, logger)
 
@@ -301,6 +307,11 @@ __all__ = [
     'DuplicateError',
     'build_where_clause',
     'build_order_clause',
+    'with_slots',
+    'set_repository_context',
+    'clear_repository_context',
+    'unit_of_work',
+    'memoized_query',
     
     # User management entities and repositories
     'User',
@@ -381,6 +392,7 @@ __all__ = [
     'Medication',
     'MedicationDose',
     'MedicationAdherence',
+    'MedicationDoseBatch',
     'MedicationRepository',
     'MedicationDoseRepository',
     'MedicationAdherenceRepository',
@@ -12,7 +12,7 @@ from enum import Enum
 from decimal import Decimal
 import logging
 
-from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
+from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult, with_slots
 from .base_repository import ValidationError, NotFoundError
 
 
@@ -116,6 +116,7 @@ class ProviderCalendar:
     updated_at: Optional[datetime] = None
 
 
+@with_slots
 @dataclass
 class Appointment:
     """Appointment entity."""
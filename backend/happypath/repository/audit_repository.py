@@ -3,17 +3,39 @@ Audit Repository
 
 Repository implementation for audit logging and compliance tracking.
 Handles audit trail creation, querying, and compliance reporting.
+
+Ingestion jobs loading many entries should use AuditRepository.bulk_ingest(),
+which streams rows with COPY rather than one INSERT per event.
 """
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Generator, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
-import json
+from pathlib import Path
 import logging
 
+import orjson
+
 from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
-from .base_repository import ValidationError, NotFoundError
+from .base_repository import ValidationError, NotFoundError, _hour_bucket
+
+
+def _encode_json(value: Any) -> Optional[str]:
+    """
+    Encode a details/old_values/new_values payload for a JSONB column.
+    
+    orjson serializes datetimes, dates, UUIDs and dataclasses natively, so
+    callers can pass them without converting them first. Naive datetimes are
+    treated as UTC.
+    """
+    if value is None:
+        return None
+    return orjson.dumps(value, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSONB columns encoded by _to_row() and in CSV exports
+_JSON_COLUMNS = ('details', 'old_values', 'new_values')
 
 
 class AuditAction(Enum):
@@ -90,6 +112,7 @@ class AuditQuery:
     limit: Optional[int] = None
     offset: Optional[int] = None
     order_by: Optional[List[str]] = None
+    prepared: bool = False  # Run as a server-side prepared statement
 
 
 @dataclass
@@ -109,6 +132,10 @@ class AuditSummary:
 class AuditRepository(BaseRepository[AuditEntry, int]):
     """Repository for audit logging operations."""
     
+    # The log is append-only and written on nearly every request, so cached
+    # summaries expire by TTL rather than on each new entry
+    result_cache_invalidate_on_write = False
+    
     def __init__(self, db_manager, logger: logging.Logger = None):
         super().__init__(db_manager, "audit_logs", logger)
         
@@ -170,6 +197,13 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             'created_at': entity.created_at
         }
     
+    def _to_row(self, entity: AuditEntry) -> Dict[str, Any]:
+        """Build the audit_logs column values, encoding the JSONB payloads."""
+        row = self._to_dict(entity)
+        for column in _JSON_COLUMNS:
+            row[column] = _encode_json(row[column])
+        return row
+    
     def _validate_entity(self, entity: AuditEntry, is_update: bool = False) -> None:
         """Validate AuditEntry entity."""
         if not entity.action:
@@ -245,6 +279,21 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
         
         return self.create(audit_entry)
     
+    def log_audit_events(self, entries: List[AuditEntry]) -> List[AuditEntry]:
+        """
+        Log several audit events with a single multi-row INSERT.
+        
+        Each entry is validated as in log_audit_event, so missing timestamps
+        and retention dates are filled in before the batch is written.
+        
+        Args:
+            entries: Audit entries to record
+            
+        Returns:
+            Created AuditEntry objects, in input order
+        """
+        return self.bulk_create(entries)
+    
     def log_user_action(self, user_id: int, action: str, resource_type: str,
                        resource_id: Optional[str] = None, **kwargs) -> AuditEntry:
         """Log a user action (convenience method)."""
@@ -284,6 +333,88 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             **kwargs
         )
     
+    def _audit_logs_sql(self, query: AuditQuery) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Build the SELECT and COUNT statements for an audit query.
+        
+        Returns:
+            Tuple of (select_query, count_query, parameters)
+        """
+        # Build filters
+        filters = {}
+        if query.user_id is not None:
+            filters['user_id'] = query.user_id
+        if query.session_id:
+            filters['session_id'] = query.session_id
+        if query.action:
+            filters['action'] = query.action
+        if query.resource_type:
+            filters['resource_type'] = query.resource_type
+        if query.resource_id:
+            filters['resource_id'] = query.resource_id
+        if query.level:
+            filters['level'] = query.level
+        if query.success is not None:
+            filters['success'] = query.success
+        if query.ip_address:
+            filters['ip_address'] = query.ip_address
+        if query.compliance_category:
+            filters['compliance_category'] = query.compliance_category
+        if query.is_sensitive is not None:
+            filters['is_sensitive'] = query.is_sensitive
+        
+        # Handle time range filtering
+        where_conditions = []
+        params = {}
+        
+        if query.start_time:
+            where_conditions.append("timestamp >= %(start_time)s")
+            params['start_time'] = query.start_time
+        
+        if query.end_time:
+            where_conditions.append("timestamp <= %(end_time)s")
+            params['end_time'] = query.end_time
+        
+        # Build main query
+        query_parts = [f"SELECT * FROM {self.table_name}"]
+        
+        # Add basic filters
+        if filters:
+            filter_conditions = []
+            for key, value in filters.items():
+                filter_conditions.append(f"{key} = %({key})s")
+                params[key] = value
+            where_conditions.extend(filter_conditions)
+        
+        if where_conditions:
+            query_parts.append(f"WHERE {' AND '.join(where_conditions)}")
+        
+        # Add ordering
+        order_by = query.order_by or ['-timestamp']  # Default to newest first
+        order_clauses = []
+        for order_field in order_by:
+            if order_field.startswith('-'):
+                order_clauses.append(f"{order_field[1:]} DESC")
+            else:
+                order_clauses.append(f"{order_field} ASC")
+        query_parts.append(f"ORDER BY {', '.join(order_clauses)}")
+        
+        # Get total count
+        count_query = f"SELECT COUNT(*) as count FROM {self.table_name}"
+        if where_conditions:
+            count_query += f" WHERE {' AND '.join(where_conditions)}"
+        
+        # Add pagination
+        if query.limit:
+            query_parts.append(f"LIMIT %(limit)s")
+            params['limit'] = query.limit
+            
+            if query.offset:
+                query_parts.append(f"OFFSET %(offset)s")
+                params['offset'] = query.offset
+        
+        return ' '.join(query_parts), count_query, params
+    
     def query_audit_logs(self, query: AuditQuery) -> QueryResult:
         """
         Query audit logs with filters.
@@ -295,85 +426,15 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             QueryResult with matching audit entries
         """
         try:
-            # Build filters
-            filters = {}
-            if query.user_id is not None:
-                filters['user_id'] = query.user_id
-            if query.session_id:
-                filters['session_id'] = query.session_id
-            if query.action:
-                filters['action'] = query.action
-            if query.resource_type:
-                filters['resource_type'] = query.resource_type
-            if query.resource_id:
-                filters['resource_id'] = query.resource_id
-            if query.level:
-                filters['level'] = query.level
-            if query.success is not None:
-                filters['success'] = query.success
-            if query.ip_address:
-                filters['ip_address'] = query.ip_address
-            if query.compliance_category:
-                filters['compliance_category'] = query.compliance_category
-            if query.is_sensitive is not None:
-                filters['is_sensitive'] = query.is_sensitive
-            
-            # Handle time range filtering
-            where_conditions = []
-            params = {}
-            
-            if query.start_time:
-                where_conditions.append("timestamp >= %(start_time)s")
-                params['start_time'] = query.start_time
-            
-            if query.end_time:
-                where_conditions.append("timestamp <= %(end_time)s")
-                params['end_time'] = query.end_time
-            
-            # Build main query
-            query_parts = [f"SELECT * FROM {self.table_name}"]
-            
-            # Add basic filters
-            if filters:
-                filter_conditions = []
-                for key, value in filters.items():
-                    filter_conditions.append(f"{key} = %({key})s")
-                    params[key] = value
-                where_conditions.extend(filter_conditions)
-            
-            if where_conditions:
-                query_parts.append(f"WHERE {' AND '.join(where_conditions)}")
-            
-            # Add ordering
-            order_by = query.order_by or ['-timestamp']  # Default to newest first
-            order_clauses = []
-            for order_field in order_by:
-                if order_field.startswith('-'):
-                    order_clauses.append(f"{order_field[1:]} DESC")
-                else:
-                    order_clauses.append(f"{order_field} ASC")
-            query_parts.append(f"ORDER BY {', '.join(order_clauses)}")
-            
-            # Get total count
-            count_query = f"SELECT COUNT(*) as count FROM {self.table_name}"
-            if where_conditions:
-                count_query += f" WHERE {' AND '.join(where_conditions)}"
-            
-            count_result = self.db.execute_query(count_query, params)
-            total_count = count_result[0]['count'] if count_result else 0
+            sql_query, count_query, params = self._audit_logs_sql(query)
             
-            # Add pagination
-            if query.limit:
-                query_parts.append(f"LIMIT %(limit)s")
-                params['limit'] = query.limit
-                
-                if query.offset:
-                    query_parts.append(f"OFFSET %(offset)s")
-                    params['offset'] = query.offset
+            execute = self.db.execute_prepared if query.prepared else self.db.execute_query
+            
+            count_result = execute(count_query, params)
+            total_count = count_result[0]['count'] if count_result else 0
             
             # Execute query
-            sql_query = ' '.join(query_parts)
-            result = self.db.execute_query(sql_query, params)
+            result = execute(sql_query, params)
             
             # Convert to entities
             entries = [self._to_entity(row) for row in result] if result else []
@@ -422,7 +483,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             start_time=start_time,
             end_time=end_time,
             limit=limit,
-            order_by=['-timestamp']
+            order_by=['-timestamp'],
+            prepared=True
         )
         
         result = self.query_audit_logs(query)
@@ -451,7 +513,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             start_time=start_time,
             end_time=end_time,
             limit=limit,
-            order_by=['-timestamp']
+            order_by=['-timestamp'],
+            prepared=True
         )
         
         result = self.query_audit_logs(query)
@@ -478,7 +541,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             end_time=end_time,
             success=success,
             limit=limit,
-            order_by=['-timestamp']
+            order_by=['-timestamp'],
+            prepared=True
         )
         
         result = self.query_audit_logs(query)
@@ -502,7 +566,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             start_time=start_time,
             end_time=end_time,
             limit=limit,
-            order_by=['-timestamp']
+            order_by=['-timestamp'],
+            prepared=True
         )
         
         result = self.query_audit_logs(query)
@@ -526,7 +591,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             start_time=start_time,
             end_time=end_time,
             limit=limit,
-            order_by=['-timestamp']
+            order_by=['-timestamp'],
+            prepared=True
         )
         
         result = self.query_audit_logs(query)
@@ -536,6 +602,10 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
         """
         Generate audit summary for a time period.
         
+        The queries cover exactly the requested period. The result is cached
+        for result_cache_ttl seconds under the whole hours the period spans,
+        so repeated calls within the same hours reuse the first computation.
+        
         Args:
             start_time: Start of analysis period
             end_time: End of analysis period
@@ -543,6 +613,13 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
         Returns:
             AuditSummary with statistics
         """
+        return self._cached_result(
+            ('audit_summary', *_hour_bucket(start_time, end_time)),
+            lambda: self._compute_audit_summary(start_time, end_time)
+        )
+    
+    def _compute_audit_summary(self, start_time: datetime, end_time: datetime) -> AuditSummary:
+        """Run the audit summary queries for a time period."""
         try:
             # Get basic counts
             base_query = f"""
@@ -647,6 +724,7 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             
             self.db.execute_query(delete_query, {'current_time': current_time})
             deleted_count = self.db.get_affected_rows()
+            self._evict()
             
             if deleted_count > 0:
                 self.logger.info(f"Cleaned up {deleted_count} expired audit log entries")
@@ -666,7 +744,7 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
             format: Export format ("json", "csv")
             
         Returns:
-            Exported data as string or bytes
+            UTF-8 encoded JSON bytes, or CSV text
         """
         try:
             # Log the export action
@@ -699,7 +777,7 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
                         for entry in result.data
                     ]
                 }
-                return json.dumps(export_data, indent=2, default=str)
+                return orjson.dumps(export_data, default=str, option=orjson.OPT_INDENT_2)
             
             elif format.lower() == "csv":
                 # Convert to CSV
@@ -721,6 +799,8 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
                                 row[key] = value.isoformat()
                             elif value is None:
                                 row[key] = ''
+                            elif key in _JSON_COLUMNS:
+                                row[key] = _encode_json(value)
                         writer.writerow(row)
                 
                 return output.getvalue()
@@ -731,6 +811,66 @@ class AuditRepository(BaseRepository[AuditEntry, int]):
         except Exception as e:
             self.logger.error(f"Failed to export audit data: {e}")
             raise
+    
+    def stream_audit_export(self, query: AuditQuery, batch_size: int = 1000) -> Generator[bytes, None, None]:
+        """
+        Export audit data as JSON, yielding the document in chunks.
+        
+        Rows are read through a server-side cursor and encoded with orjson
+        batch_size entries at a time, so memory stays proportional to one
+        batch rather than the whole export. The concatenated chunks form a
+        single JSON object with metadata, audit_entries and total_records.
+        
+        Args:
+            query: Query parameters for data to export
+            batch_size: Rows fetched and encoded per chunk
+            
+        Yields:
+            UTF-8 encoded JSON fragments
+        """
+        self.log_system_event(
+            action="data_export",
+            resource_type="audit_logs",
+            details={"format": "json", "query": query.__dict__},
+            level=AuditLevel.MEDIUM.value,
+            compliance_category="security"
+        )
+        
+        sql_query, _, params = self._audit_logs_sql(query)
+        metadata = {
+            'exported_at': datetime.utcnow(),
+            'query_parameters': query.__dict__
+        }
+        yield b'{"metadata":' + orjson.dumps(metadata, default=str) + b',"audit_entries":['
+        
+        total = 0
+        batch = []
+        try:
+            for row in self.db.stream_query(sql_query, params, batch_size=batch_size):
+                batch.append(orjson.dumps(self._to_dict(self._to_entity(row)), default=str))
+                if len(batch) >= batch_size:
+                    yield (b"," if total else b"") + b",".join(batch)
+                    total += len(batch)
+                    batch = []
+            
+            if batch:
+                yield (b"," if total else b"") + b",".join(batch)
+                total += len(batch)
+                
+        except Exception as e:
+            self.logger.error(f"Failed to stream audit export: {e}")
+            raise
+        
+        yield b'],"total_records":' + str(total).encode() + b'}'
+    
+    def export_audit_data_to_file(self, query: AuditQuery, path: Union[str, Path]) -> int:
+        """Stream a JSON audit export to a file, returning the number of bytes written."""
+        written = 0
+        with open(path, 'wb') as output:
+            for chunk in self.stream_audit_export(query):
+                output.write(chunk)
+                written += len(chunk)
+        return written
 
 
 class AsyncAuditRepository(AsyncBaseRepository[AuditEntry, int]):
@@ -797,6 +937,13 @@ class AsyncAuditRepository(AsyncBaseRepository[AuditEntry, int]):
             'created_at': entity.created_at
         }
     
+    def _to_row(self, entity: AuditEntry) -> Dict[str, Any]:
+        """Build the audit_logs column values, encoding the JSONB payloads."""
+        row = self._to_dict(entity)
+        for column in _JSON_COLUMNS:
+            row[column] = _encode_json(row[column])
+        return row
+    
     async def _validate_entity(self, entity: AuditEntry, is_update: bool = False) -> None:
         """Async validate AuditEntry entity."""
         if not entity.action:
@@ -6,13 +6,25 @@ Includes common database operations, transaction handling, and query utilities.
 """
 
 import asyncio
+import copy
+import hashlib
+import itertools
+import pickle
+import sys
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import (
     Any, Dict, List, Optional, Union, Tuple, Generic, TypeVar,
-    Callable, AsyncGenerator, Generator
+    Callable, AsyncGenerator, Generator, Iterable, Mapping, Sequence
 )
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from functools import wraps
 import logging
 
 # Type variables for generic repository
@@ -31,15 +43,58 @@ class QueryResult:
     has_previous: bool = False
 
 
-@dataclass
+def with_slots(cls):
+    """
+    Rebuild a dataclass with __slots__ in place of a per-instance __dict__.
+    
+    Equivalent to dataclass(slots=True) on Python 3.10+, including pickle and
+    copy support for frozen classes. Apply it above @dataclass. Instances
+    take less memory and attribute access is faster, but attributes outside
+    the declared fields can no longer be set.
+    """
+    field_names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        # Defaults live in the generated __init__; as class attributes they
+        # would clash with the slot descriptors
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = field_names
+    if cls.__dataclass_params__.frozen:
+        # Without a __dict__, pickle and copy restore slots via setattr,
+        # which a frozen dataclass rejects; dataclass(slots=True) does the same
+        namespace['__getstate__'] = _slots_getstate
+        namespace['__setstate__'] = _slots_setstate
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _slots_getstate(self):
+    return [getattr(self, field.name) for field in fields(self)]
+
+
+def _slots_setstate(self, state):
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+@with_slots
+@dataclass(frozen=True)
 class QueryOptions:
-    """Options for database queries."""
+    """
+    Options for database queries.
+    
+    Instances are immutable, so options that never change can be built once
+    at module level (with tuple order_by and MappingProxyType filters) and
+    passed to every call instead of being rebuilt each time.
+    """
     limit: Optional[int] = None
     offset: Optional[int] = None
-    order_by: Optional[List[str]] = None
-    filters: Optional[Dict[str, Any]] = None
+    order_by: Optional[Sequence[str]] = None
+    filters: Optional[Mapping[str, Any]] = None
     include_count: bool = False
     for_update: bool = False  # SELECT FOR UPDATE
+    prepared: bool = False  # Run as a server-side prepared statement
 
 
 class RepositoryError(Exception):
@@ -66,6 +121,128 @@ class DuplicateError(RepositoryError):
     pass
 
 
+# Database manager and logger used by repositories constructed without one
+_db_manager_context: ContextVar = ContextVar("repository_db_manager", default=None)
+_logger_context: ContextVar = ContextVar("repository_logger", default=None)
+# Shared cache for memoized_query reads; None keeps every read on the database
+_query_cache_context: ContextVar = ContextVar("repository_query_cache", default=None)
+# Receives change events from repository writes; None publishes nothing
+_event_manager_context: ContextVar = ContextVar("repository_event_manager", default=None)
+
+
+def set_repository_context(db_manager, logger: logging.Logger = None, query_cache=None,
+                           event_manager=None) -> None:
+    """
+    Set the dependencies shared by repositories created in this context.
+    
+    query_cache is any object with the CacheManager get/set/clear_namespace
+    interface; without one, memoized reads always query the database.
+    event_manager receives change events through EventManager.enqueue()
+    after each write commits; the caller drains it with
+    process_pending_events() or run_event_processor().
+    """
+    _db_manager_context.set(db_manager)
+    _logger_context.set(logger)
+    _query_cache_context.set(query_cache)
+    _event_manager_context.set(event_manager)
+
+
+def clear_repository_context() -> None:
+    """Clear the shared repository dependencies."""
+    _db_manager_context.set(None)
+    _logger_context.set(None)
+    _query_cache_context.set(None)
+    _event_manager_context.set(None)
+
+
+# Memoized-query namespaces each event manager already drops on invalidate_on events
+_registered_invalidations: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registered_invalidations_lock = threading.Lock()
+
+
+# Identity maps of the active unit_of_work(), keyed by table name
+_identity_scope: ContextVar = ContextVar("repository_identity_map", default=None)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Share an identity map across repositories for the duration of the block.
+    
+    Inside the block, get_by_id() and get_many() serve rows already loaded or
+    written in the same block from memory; outside one, every lookup reads
+    the database, so long-lived repositories never serve stale rows. Nested
+    blocks reuse the outer map. Callers always get copies, so changing a
+    returned entity does not change the cached one.
+    """
+    if _identity_scope.get() is not None:
+        yield
+        return
+    
+    token = _identity_scope.set({})
+    try:
+        yield
+    finally:
+        _identity_scope.reset(token)
+
+
+def _resolve_db_manager(db_manager):
+    """Return db_manager, falling back to the one set with set_repository_context()."""
+    db_manager = db_manager if db_manager is not None else _db_manager_context.get()
+    if db_manager is None:
+        raise RepositoryError("No database manager given and none set with set_repository_context()")
+    return db_manager
+
+
+_MISSING = object()
+
+
+def memoized_query(ttl: int = 60):
+    """
+    Cache a repository read in the repository's query_cache for ttl seconds.
+    
+    Entries are keyed on a digest of the arguments, under a namespace naming
+    the repository class, table and database, so repositories on different
+    databases never share results. Cached values leave the process: memoize
+    IDs or other projections rather than entities carrying secrets. List the
+    method in memoized_queries so writes through the repository drop it.
+    """
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self.query_cache
+            if cache is None:
+                return func(self, *args, **kwargs)
+            
+            namespace = self._query_namespace(func.__name__)
+            try:
+                payload = pickle.dumps((args, sorted(kwargs.items())))
+                key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+                cached_result = cache.get(key, namespace, _MISSING)
+            except Exception as e:
+                self.logger.debug(f"Query cache unavailable for {func.__qualname__}: {e}")
+                return func(self, *args, **kwargs)
+            
+            if cached_result is not _MISSING:
+                return cached_result
+            
+            result = func(self, *args, **kwargs)
+            try:
+                cache.set(key, result, ttl, namespace)
+            except Exception as e:
+                self.logger.debug(f"Query cache store failed for {func.__qualname__}: {e}")
+            return result
+        return wrapper
+    return decorator
+
+
+def _hour_bucket(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Return the whole hours covering a time range, so nearby report windows share a cache key."""
+    start = start.replace(minute=0, second=0, microsecond=0)
+    end_floor = end.replace(minute=0, second=0, microsecond=0)
+    return start, end_floor if end_floor == end else end_floor + timedelta(hours=1)
+
+
 class BaseRepository(ABC, Generic[T, ID]):
     """
     Abstract base repository class for synchronous database operations.
@@ -74,18 +251,44 @@ class BaseRepository(ABC, Generic[T, ID]):
     inherited by specific repository implementations.
     """
     
+    # Maximum number of entities kept in the identity map
+    identity_map_size = 4096
+    
+    # Lifetime in seconds and maximum count of cached aggregate results
+    result_cache_ttl = 300
+    result_cache_size = 64
+    # Whether writes through this repository drop its cached results
+    result_cache_invalidate_on_write = True
+    # Names of memoized_query methods whose results writes invalidate
+    memoized_queries: Tuple[str, ...] = ()
+    # EventType values whose events also drop them, for changes made
+    # through other repositories
+    invalidate_on: Tuple[str, ...] = ()
+    
     def __init__(self, db_manager, table_name: str, logger: logging.Logger = None):
         """
         Initialize the repository.
         
         Args:
-            db_manager: Database manager instance
+            db_manager: Database manager instance, or None for the shared one
             table_name: Primary table name for this repository
             logger: Optional logger instance
         """
-        self.db = db_manager
+        self.db = _resolve_db_manager(db_manager)
         self.table_name = table_name
-        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.logger = logger or _logger_context.get() or logging.getLogger(self.__class__.__name__)
+        self.query_cache = _query_cache_context.get()
+        self.event_manager = _event_manager_context.get()
+        self._register_invalidation()
+        
+        # Generated INSERT statements keyed by (columns, positional)
+        self._insert_sql_cache: Dict[Tuple[Tuple[str, ...], bool], str] = {}
+        
+        # Generated list_all (select, count) statements keyed by query shape
+        self._list_sql_cache: Dict[Tuple, Tuple[str, Optional[str]]] = {}
+        
+        # Aggregate results keyed by report and window: key -> (expires_at, value)
+        self._result_cache: Dict[Tuple, Tuple[float, Any]] = {}
         
     # Abstract methods that must be implemented by subclasses
     
@@ -98,12 +301,176 @@ class BaseRepository(ABC, Generic[T, ID]):
     def _to_dict(self, entity: T) -> Dict[str, Any]:
         """Convert entity object to dictionary for database operations."""
         pass
+    
+    def _to_row(self, entity: T) -> Dict[str, Any]:
+        """
+        Build the column values written for an entity; defaults to _to_dict().
+        
+        Override to encode values only on the write path, leaving _to_dict()
+        as the entity's plain dictionary form (e.g. for exports).
+        """
+        return self._to_dict(entity)
         
     @abstractmethod
     def _validate_entity(self, entity: T, is_update: bool = False) -> None:
         """Validate entity before database operations."""
         pass
         
+    # Identity map
+    
+    def _identity_map(self, table_name: Optional[str] = None) -> "Optional[OrderedDict[ID, T]]":
+        """Return the active unit of work's map for a table (this one by default), if any."""
+        scope = _identity_scope.get()
+        if scope is None:
+            return None
+        return scope.setdefault(table_name or self.table_name, OrderedDict())
+    
+    def _remember(self, entity: T) -> T:
+        """Store a copy of an entity in the active identity map and return the entity."""
+        identity_map = self._identity_map()
+        entity_id = getattr(entity, 'id', None)
+        if identity_map is not None and entity_id is not None:
+            if isinstance(entity_id, str):
+                # IDs are compared and hashed on every lookup; share one copy
+                entity_id = sys.intern(entity_id)
+            identity_map[entity_id] = copy.deepcopy(entity)
+            identity_map.move_to_end(entity_id)
+            if len(identity_map) > self.identity_map_size:
+                identity_map.popitem(last=False)
+        return entity
+    
+    def _recall(self, entity_id: ID) -> Optional[T]:
+        """Return a copy of a cached entity from the active identity map, if present."""
+        identity_map = self._identity_map()
+        cached = identity_map.get(entity_id) if identity_map is not None else None
+        if cached is None:
+            return None
+        identity_map.move_to_end(entity_id)
+        return copy.deepcopy(cached)
+    
+    def _evict(self, entity_id: Optional[ID] = None, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached entities after a write that bypassed update() or delete().
+        
+        Evicts one ID, or every entity of the table when entity_id is None.
+        """
+        identity_map = self._identity_map(table_name)
+        if identity_map is None:
+            return
+        if entity_id is None:
+            identity_map.clear()
+        else:
+            identity_map.pop(entity_id, None)
+    
+    def clear_identity_map(self) -> None:
+        """Drop all cached entities, forcing the next lookups to hit the database."""
+        self._evict()
+    
+    # Result cache
+    
+    def _cached_result(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, or compute and cache it.
+        
+        Meant for read-mostly reports. Entries live for result_cache_ttl
+        seconds and, unless result_cache_invalidate_on_write is False, are
+        dropped whenever this repository writes.
+        """
+        now = time.monotonic()
+        cached = self._result_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        value = compute()
+        if len(self._result_cache) >= self.result_cache_size:
+            self._result_cache.clear()
+        self._result_cache[key] = (now + self.result_cache_ttl, value)
+        return value
+    
+    def clear_result_cache(self) -> None:
+        """Drop all cached aggregate results."""
+        self._result_cache.clear()
+    
+    def _invalidate_results(self) -> None:
+        """Drop cached results after a write, unless the repository opts out."""
+        if self.result_cache_invalidate_on_write:
+            self._result_cache.clear()
+        if self.query_cache is None:
+            return
+        for name in self.memoized_queries:
+            try:
+                self.query_cache.clear_namespace(self._query_namespace(name))
+            except Exception as e:
+                self.logger.warning(f"Failed to invalidate cached {name} results: {e}")
+    
+    def _register_invalidation(self) -> None:
+        """
+        Have the event manager drop this repository's memoized reads on invalidate_on events.
+        
+        Handlers are registered once per event manager and set of
+        namespaces, however many repositories are created, and run when the
+        event manager drains its queue. Registration failures are logged;
+        cached reads then expire with their ttl.
+        """
+        event_manager = self.event_manager
+        if event_manager is None or self.query_cache is None or not (self.invalidate_on and self.memoized_queries):
+            return
+        
+        namespaces = tuple(self._query_namespace(name) for name in self.memoized_queries)
+        with _registered_invalidations_lock:
+            registered = _registered_invalidations.setdefault(event_manager, set())
+            if namespaces in registered:
+                return
+            registered.add(namespaces)
+        
+        query_cache = self.query_cache
+        logger = self.logger
+        
+        def invalidate(event) -> None:
+            for namespace in namespaces:
+                try:
+                    query_cache.clear_namespace(namespace)
+                except Exception as e:
+                    logger.warning(f"Failed to invalidate cached {namespace} results: {e}")
+        
+        for event_type in self.invalidate_on:
+            try:
+                event_manager.register_handler(event_type, invalidate)
+            except Exception as e:
+                logger.warning(f"Failed to register {event_type} invalidation, relying on ttl: {e}")
+    
+    def _query_namespace(self, name: str) -> str:
+        """Return the query cache namespace for one memoized method of this repository."""
+        database = getattr(self.db, 'cache_namespace', '')
+        return f"q:{type(self).__qualname__}.{name}:{self.table_name}@{database}"
+    
+    def _publish_change(self, event_type: str, data: Dict[str, Any], user_id: Optional[Any] = None) -> None:
+        """
+        Queue a change event on the injected event manager once the surrounding transaction commits.
+        
+        event_type is an EventType value such as "user_registered". Events
+        are only queued here; handlers and the event_log insert run when the
+        event manager drains its queue, so writes never wait on them.
+        Publishing failures are logged and never fail the write that
+        triggered them. Without an event manager nothing is published.
+        """
+        event_manager = self.event_manager
+        if event_manager is None:
+            return
+        
+        def publish():
+            try:
+                event_manager.enqueue(
+                    event_type,
+                    data,
+                    source=f"{self.table_name}_repository",
+                    user_id=str(user_id) if user_id is not None else None
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to publish {event_type} event: {e}")
+        
+        self.db.after_commit(publish)
+    
     # Common CRUD operations
     
     def create(self, entity: T) -> T:
@@ -121,46 +488,97 @@ class BaseRepository(ABC, Generic[T, ID]):
             DuplicateError: If entity already exists
         """
         try:
-            self._validate_entity(entity, is_update=False)
-            data = self._to_dict(entity)
+            data = self._prepare_insert_data(entity)
             
-            # Remove ID if present (will be auto-generated)
-            data.pop('id', None)
+            result = self.db.execute_query(self._insert_sql(tuple(data)), data)
+            if not result:
+                raise RepositoryError(f"Failed to create {self.table_name} record")
             
-            # Add creation timestamp
-            data['created_at'] = datetime.utcnow()
-            data['updated_at'] = datetime.utcnow()
+            return self._after_create(result[0])
             
-            # Build insert query
-            columns = list(data.keys())
-            placeholders = [f"%({col})s" for col in columns]
+        except Exception as e:
+            if "duplicate key" in str(e).lower():
+                raise DuplicateError(f"Duplicate {self.table_name} record", details={"entity": str(entity)})
+            self.logger.error(f"Failed to create {self.table_name} record: {e}")
+            raise RepositoryError(f"Failed to create {self.table_name} record: {e}")
+    
+    async def acreate(self, entity: T) -> T:
+        """
+        Create a new entity over the async (asyncpg) connection pool.
+        
+        Lets independent inserts from async callers overlap instead of
+        blocking the event loop on a pooled psycopg2 connection. Validation
+        may query the database synchronously, so it runs on the I/O executor.
+        
+        Args:
+            entity: Entity to create
             
-            query = f"""
-                INSERT INTO {self.table_name} ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                RETURNING *
-            """
+        Returns:
+            Created entity with populated ID and metadata
+        """
+        try:
+            data = await self.db.run_blocking(self._prepare_insert_data, entity)
+            query = self._insert_sql(tuple(data), positional=True)
             
-            result = self.db.execute_query(query, data)
+            result = await self.db.execute_async_query(query, list(data.values()))
             if not result:
                 raise RepositoryError(f"Failed to create {self.table_name} record")
-                
-            created_entity = self._to_entity(result[0])
             
-            self.logger.info(f"Created {self.table_name} record", extra={
-                "table": self.table_name,
-                "id": getattr(created_entity, 'id', None),
-                "operation": "create"
-            })
-            
-            return created_entity
+            return self._after_create(result[0])
             
+        except ValidationError:
+            raise
         except Exception as e:
             if "duplicate key" in str(e).lower():
                 raise DuplicateError(f"Duplicate {self.table_name} record", details={"entity": str(entity)})
             self.logger.error(f"Failed to create {self.table_name} record: {e}")
             raise RepositoryError(f"Failed to create {self.table_name} record: {e}")
     
+    def _after_create(self, row: Dict[str, Any]) -> T:
+        """Build the created entity from its row, drop stale cached results and log it."""
+        created_entity = self._remember(self._to_entity(row))
+        self._invalidate_results()
+        
+        self.logger.info(f"Created {self.table_name} record", extra={
+            "table": self.table_name,
+            "id": getattr(created_entity, 'id', None),
+            "operation": "create"
+        })
+        
+        return created_entity
+    
+    def _insert_sql(self, columns: Tuple[str, ...], positional: bool = False) -> str:
+        """
+        Get the INSERT statement for a column layout.
+        
+        _to_dict produces the same columns for every entity of a repository,
+        so the statement is generated once per layout and reused.
+        """
+        key = (columns, positional)
+        query = self._insert_sql_cache.get(key)
+        if query is None:
+            if positional:
+                placeholders = [f"${index}" for index in range(1, len(columns) + 1)]
+            else:
+                placeholders = [f"%({col})s" for col in columns]
+            query = f"""
+                INSERT INTO {self.table_name} ({', '.join(columns)})
+                VALUES ({', '.join(placeholders)})
+                RETURNING *
+            """
+            self._insert_sql_cache[key] = query
+        return query
+    
+    def _prepare_insert_data(self, entity: T, now: datetime = None) -> Dict[str, Any]:
+        """Validate an entity and build its column values for an INSERT."""
+        self._validate_entity(entity, is_update=False)
+        data = self._to_row(entity)
+        data.pop('id', None)
+        now = now or datetime.utcnow()
+        data['created_at'] = now
+        data['updated_at'] = now
+        return data
+    
     def get_by_id(self, entity_id: ID) -> Optional[T]:
         """
         Retrieve entity by ID.
@@ -171,18 +589,60 @@ class BaseRepository(ABC, Generic[T, ID]):
         Returns:
             Entity if found, None otherwise
         """
+        cached = self._recall(entity_id)
+        if cached is not None:
+            return cached
+        
         try:
             query = f"SELECT * FROM {self.table_name} WHERE id = %(id)s"
             result = self.db.execute_query(query, {"id": entity_id})
             
             if result:
-                return self._to_entity(result[0])
+                return self._remember(self._to_entity(result[0]))
             return None
             
         except Exception as e:
             self.logger.error(f"Failed to get {self.table_name} by ID {entity_id}: {e}")
             raise RepositoryError(f"Failed to retrieve {self.table_name} record: {e}")
     
+    def get_many(self, entity_ids: Iterable[ID]) -> Dict[ID, T]:
+        """
+        Retrieve several entities by ID with one query.
+        
+        IDs already in the unit of work's identity map are served from it; the rest are
+        fetched with ``id = ANY(%(ids)s)``, passing the IDs as a single
+        array parameter so the statement is the same for any number of IDs.
+        
+        Args:
+            entity_ids: Primary keys to look up; duplicates are ignored
+            
+        Returns:
+            Dict mapping each found ID to its entity
+        """
+        found: Dict[ID, T] = {}
+        missing = []
+        for entity_id in dict.fromkeys(entity_ids):
+            cached = self._recall(entity_id)
+            if cached is not None:
+                found[entity_id] = cached
+            else:
+                missing.append(entity_id)
+        
+        if not missing:
+            return found
+        
+        try:
+            query = f"SELECT * FROM {self.table_name} WHERE id = ANY(%(ids)s)"
+            result = self.db.execute_query(query, {"ids": missing}) or []
+            for row in result:
+                entity = self._remember(self._to_entity(row))
+                found[entity.id] = entity
+            return found
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get {self.table_name} records by ID: {e}")
+            raise RepositoryError(f"Failed to get {self.table_name} records: {e}")
+    
     def get_by_id_or_raise(self, entity_id: ID) -> T:
         """
         Retrieve entity by ID or raise NotFoundError.
@@ -217,17 +677,12 @@ class BaseRepository(ABC, Generic[T, ID]):
         """
         try:
             self._validate_entity(entity, is_update=True)
-            data = self._to_dict(entity)
+            data = self._to_row(entity)
             entity_id = data.get('id')
             
             if not entity_id:
                 raise ValidationError("Entity must have ID for update operation")
             
-            # Check if entity exists
-            existing = self.get_by_id(entity_id)
-            if not existing:
-                raise NotFoundError(f"{self.table_name} with ID {entity_id} not found")
-            
             # Remove ID from update data and add updated timestamp
             update_data = {k: v for k, v in data.items() if k != 'id'}
             update_data['updated_at'] = datetime.utcnow()
@@ -244,10 +699,13 @@ class BaseRepository(ABC, Generic[T, ID]):
             params = {**update_data, 'id': entity_id}
             result = self.db.execute_query(query, params)
             
+            # No row back means no row matched the ID
             if not result:
-                raise RepositoryError(f"Failed to update {self.table_name} record")
+                self._evict(entity_id)
+                raise NotFoundError(f"{self.table_name} with ID {entity_id} not found")
                 
-            updated_entity = self._to_entity(result[0])
+            updated_entity = self._remember(self._to_entity(result[0]))
+            self._invalidate_results()
             
             self.logger.info(f"Updated {self.table_name} record", extra={
                 "table": self.table_name,
@@ -275,6 +733,8 @@ class BaseRepository(ABC, Generic[T, ID]):
         """
         try:
             query = f"DELETE FROM {self.table_name} WHERE id = %(id)s"
+            self._evict(entity_id)
+            self._invalidate_results()
             result = self.db.execute_query(query, {"id": entity_id})
             
             deleted = self.db.get_affected_rows() > 0
@@ -318,62 +778,26 @@ class BaseRepository(ABC, Generic[T, ID]):
         """
         try:
             options = options or QueryOptions()
+            query, count_query, params = self._list_query(options)
             
-            # Build base query
-            query_parts = [f"SELECT * FROM {self.table_name}"]
-            params = {}
+            execute = self.db.execute_prepared if options.prepared else self.db.execute_query
             
-            # Add WHERE clause if filters provided
-            if options.filters:
-                where_clauses = []
-                for key, value in options.filters.items():
-                    param_name = f"filter_{key}"
-                    if isinstance(value, list):
-                        placeholders = ', '.join([f"%({param_name}_{i})s" for i in range(len(value))])
-                        where_clauses.append(f"{key} IN ({placeholders})")
-                        for i, v in enumerate(value):
-                            params[f"{param_name}_{i}"] = v
-                    else:
-                        where_clauses.append(f"{key} = %({param_name})s")
-                        params[param_name] = value
-                
-                if where_clauses:
-                    query_parts.append(f"WHERE {' AND '.join(where_clauses)}")
+            # Execute query
+            result = execute(query, params)
             
-            # Add ORDER BY clause
-            if options.order_by:
-                order_clauses = []
-                for order_field in options.order_by:
-                    if order_field.startswith('-'):
-                        order_clauses.append(f"{order_field[1:]} DESC")
-                    else:
-                        order_clauses.append(f"{order_field} ASC")
-                query_parts.append(f"ORDER BY {', '.join(order_clauses)}")
-            
-            # Get total count if requested
+            # The total rides along on every row as a window count; only a
+            # page past the end, which returns no rows, needs the COUNT query
             total_count = None
             if options.include_count:
-                count_query = f"SELECT COUNT(*) as count FROM {self.table_name}"
-                if options.filters:
-                    where_clause = query_parts[1] if len(query_parts) > 1 and query_parts[1].startswith('WHERE') else None
-                    if where_clause:
-                        count_query += f" {where_clause}"
-                
-                count_result = self.db.execute_query(count_query, params)
-                total_count = count_result[0]['count'] if count_result else 0
-            
-            # Add LIMIT and OFFSET
-            if options.limit:
-                query_parts.append(f"LIMIT %(limit)s")
-                params['limit'] = options.limit
-                
-                if options.offset:
-                    query_parts.append(f"OFFSET %(offset)s")
-                    params['offset'] = options.offset
-            
-            # Execute query
-            query = ' '.join(query_parts)
-            result = self.db.execute_query(query, params)
+                if result:
+                    total_count = result[0]['__total']
+                    for row in result:
+                        del row['__total']
+                elif options.offset:
+                    count_result = execute(count_query, params)
+                    total_count = count_result[0]['count'] if count_result else 0
+                else:
+                    total_count = 0
             
             # Convert to entities
             entities = [self._to_entity(row) for row in result] if result else []
@@ -408,6 +832,177 @@ class BaseRepository(ABC, Generic[T, ID]):
             self.logger.error(f"Failed to list {self.table_name} records: {e}")
             raise RepositoryError(f"Failed to list {self.table_name} records: {e}")
     
+    def stream_all(self, options: QueryOptions = None, batch_size: int = 500) -> Generator[T, None, None]:
+        """
+        Iterate over matching entities without materializing the result set.
+        
+        Rows are pulled batch_size at a time through a server-side cursor, so
+        memory stays flat however many rows match. include_count is ignored.
+        
+        Args:
+            options: Query options for filtering, ordering, and limits
+            batch_size: Rows fetched per round-trip
+            
+        Yields:
+            Entities in query order
+        """
+        query, _, params = self._list_query(options or QueryOptions())
+        
+        try:
+            for row in self.db.stream_query(query, params, batch_size=batch_size):
+                yield self._to_entity(row)
+                
+        except Exception as e:
+            self.logger.error(f"Failed to stream {self.table_name} records: {e}")
+            raise RepositoryError(f"Failed to stream {self.table_name} records: {e}")
+    
+    def iter_all(self, filters: Dict[str, Any] = None, batch_size: int = 500) -> Generator[T, None, None]:
+        """
+        Iterate over matching entities, newest first, one keyset page at a time.
+        
+        Each page is a separate short query that continues below the last
+        row seen, so memory stays bounded without holding a cursor open and
+        without OFFSET rescanning earlier pages.
+        
+        Args:
+            filters: Optional equality filters
+            batch_size: Rows fetched per page
+            
+        Yields:
+            Entities ordered by created_at, id descending
+        """
+        filters = filters or {}
+        conditions = [f"{key} = %(filter_{key})s" for key in filters]
+        params = {f"filter_{key}": value for key, value in filters.items()}
+        
+        after = None
+        while True:
+            page = self._keyset_page(conditions, params, batch_size, after)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = page[-1]
+    
+    def _keyset_page(
+        self,
+        conditions: List[str],
+        params: Dict[str, Any],
+        limit: int,
+        after: Optional[T] = None
+    ) -> List[T]:
+        """
+        Fetch one page of rows ordered by created_at, id descending.
+        
+        Args:
+            conditions: SQL conditions ANDed into the WHERE clause
+            params: Parameters referenced by the conditions
+            limit: Maximum rows to return; required
+            after: Last entity of the previous page, or None for the first page
+            
+        Returns:
+            Up to limit entities
+        """
+        if limit is None or limit < 1:
+            raise ValidationError(f"A positive limit is required to page {self.table_name} records")
+        
+        params = {**params, 'limit': limit}
+        if after is not None:
+            # Row comparison on (created_at, id) matches the sort order, so
+            # rows sharing a timestamp are neither skipped nor repeated
+            conditions = [*conditions, "(created_at, id) < (%(after_created_at)s, %(after_id)s)"]
+            params['after_created_at'] = after.created_at
+            params['after_id'] = after.id
+        
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (
+            f"SELECT * FROM {self.table_name}{where_clause} "
+            f"ORDER BY created_at DESC, id DESC LIMIT %(limit)s"
+        )
+        
+        try:
+            result = self.db.execute_query(query, params)
+            return [self._to_entity(row) for row in result] if result else []
+            
+        except Exception as e:
+            self.logger.error(f"Failed to page {self.table_name} records: {e}")
+            raise RepositoryError(f"Failed to page {self.table_name} records: {e}")
+    
+    def _list_query(self, options: QueryOptions) -> Tuple[str, Optional[str], Dict[str, Any]]:
+        """
+        Get the list_all statements and parameters for query options.
+        
+        Only the values change between calls with the same shape, so the SQL
+        is generated once per shape and reused.
+        
+        Returns:
+            Tuple of (select_query, count_query or None, parameters)
+        """
+        filters = options.filters or {}
+        shape = (
+            tuple((key, isinstance(value, list)) for key, value in filters.items()),
+            tuple(options.order_by or ()),
+            bool(options.limit),
+            bool(options.limit and options.offset),
+            options.include_count
+        )
+        statements = self._list_sql_cache.get(shape)
+        if statements is None:
+            statements = self._list_sql(shape)
+            self._list_sql_cache[shape] = statements
+        query, count_query = statements
+        
+        params = {f"filter_{key}": value for key, value in filters.items()}
+        
+        if options.limit:
+            params['limit'] = options.limit
+            if options.offset:
+                params['offset'] = options.offset
+        
+        return query, count_query, params
+    
+    def _list_sql(self, shape: Tuple) -> Tuple[str, Optional[str]]:
+        """
+        Build the list_all SELECT and optional COUNT statements for a query shape.
+        
+        With include_count the SELECT also returns the total match count as a
+        COUNT(*) OVER() column, __total; the COUNT statement is only needed
+        when the requested page is empty.
+        
+        Args:
+            shape: (filter keys with is-list flags, order_by, has limit, has offset, include count)
+            
+        Returns:
+            Tuple of (select_query, count_query or None)
+        """
+        filter_shape, order_by, has_limit, has_offset, include_count = shape
+        
+        where_clause = ""
+        if filter_shape:
+            where_clauses = []
+            for key, is_list in filter_shape:
+                param_name = f"filter_{key}"
+                if is_list:
+                    # One array parameter, so the statement text is the same for any list length
+                    where_clauses.append(f"{key} = ANY(%({param_name})s)")
+                else:
+                    where_clauses.append(f"{key} = %({param_name})s")
+            where_clause = f" WHERE {' AND '.join(where_clauses)}"
+        
+        columns = "*, COUNT(*) OVER() AS __total" if include_count else "*"
+        query = f"SELECT {columns} FROM {self.table_name}{where_clause}"
+        if order_by:
+            query += f" {build_order_clause(list(order_by))}"
+        if has_limit:
+            query += " LIMIT %(limit)s"
+            if has_offset:
+                query += " OFFSET %(offset)s"
+        
+        count_query = None
+        if include_count:
+            count_query = f"SELECT COUNT(*) as count FROM {self.table_name}{where_clause}"
+        
+        return query, count_query
+    
     def exists(self, entity_id: ID) -> bool:
         """
         Check if entity exists by ID.
@@ -460,6 +1055,30 @@ class BaseRepository(ABC, Generic[T, ID]):
             self.logger.error(f"Failed to count {self.table_name} records: {e}")
             raise RepositoryError(f"Failed to count {self.table_name} records: {e}")
     
+    def estimated_count(self) -> int:
+        """
+        Approximate the table's row count from planner statistics.
+        
+        Reads pg_class.reltuples instead of scanning the table, so it is
+        cheap on large tables but only as fresh as the last VACUUM or
+        ANALYZE. Falls back to an exact count() for tables that have never
+        been analyzed.
+        
+        Returns:
+            Estimated number of rows
+        """
+        try:
+            query = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = %(table)s::regclass"
+            result = self.db.execute_query(query, {"table": self.table_name})
+            
+        except Exception as e:
+            self.logger.error(f"Failed to estimate {self.table_name} row count: {e}")
+            raise RepositoryError(f"Failed to estimate {self.table_name} row count: {e}")
+        
+        if not result or result[0]['estimate'] < 0:
+            return self.count()
+        return result[0]['estimate']
+    
     def find_by(self, **kwargs) -> List[T]:
         """
         Find entities by field values.
@@ -507,12 +1126,17 @@ class BaseRepository(ABC, Generic[T, ID]):
             raise NotFoundError(f"{self.table_name} with {filter_desc} not found")
         return entity
     
-    def bulk_create(self, entities: List[T]) -> List[T]:
+    def bulk_create(self, entities: List[T], batch_size: int = 1000) -> List[T]:
         """
-        Create multiple entities in a single transaction.
+        Create multiple entities with multi-row INSERT statements.
+        
+        Rows are sent in batches of ``batch_size`` so that statement parsing,
+        planning and the network round-trip are paid once per batch rather
+        than once per entity.
         
         Args:
             entities: List of entities to create
+            batch_size: Maximum number of rows per INSERT statement
             
         Returns:
             List of created entities with IDs
@@ -521,20 +1145,83 @@ class BaseRepository(ABC, Generic[T, ID]):
             return []
         
         try:
-            created_entities = []
+            now = datetime.utcnow()
+            rows = [self._prepare_insert_data(entity, now) for entity in entities]
             
-            with self.db.transaction():
-                for entity in entities:
-                    created = self.create(entity)
-                    created_entities.append(created)
+            # Every row must supply the same column list
+            columns = list(dict.fromkeys(col for row in rows for col in row))
             
+            created_entities = []
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                params = {}
+                value_groups = []
+                for index, row in enumerate(batch):
+                    placeholders = []
+                    for col in columns:
+                        key = f"{col}_{index}"
+                        params[key] = row.get(col)
+                        placeholders.append(f"%({key})s")
+                    value_groups.append(f"({', '.join(placeholders)})")
+                
+                query = f"""
+                    INSERT INTO {self.table_name} ({', '.join(columns)})
+                    VALUES {', '.join(value_groups)}
+                    RETURNING *
+                """
+                
+                result = self.db.execute_query(query, params) or []
+                created_entities.extend(self._remember(self._to_entity(row)) for row in result)
+            
+            self._invalidate_results()
             self.logger.info(f"Bulk created {len(created_entities)} {self.table_name} records")
             return created_entities
             
+        except ValidationError:
+            raise
         except Exception as e:
+            if "duplicate key" in str(e).lower():
+                raise DuplicateError(f"Duplicate {self.table_name} record in bulk create")
             self.logger.error(f"Failed to bulk create {self.table_name} records: {e}")
             raise RepositoryError(f"Failed to bulk create {self.table_name} records: {e}")
     
+    def bulk_ingest(self, entities: Iterable[T]) -> int:
+        """
+        Load entities with COPY instead of INSERT.
+        
+        Meant for ingestion jobs: entities are validated and encoded as the
+        database reads them, so an iterator of any size loads in constant
+        memory. Unlike bulk_create, created rows are not returned.
+        
+        Args:
+            entities: Entities to load; every one must produce the same columns
+            
+        Returns:
+            Number of rows loaded
+        """
+        now = datetime.utcnow()
+        rows = (self._prepare_insert_data(entity, now) for entity in entities)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        
+        columns = list(first)
+        try:
+            count = self.db.copy_records(
+                self.table_name,
+                columns,
+                ([row.get(col) for col in columns] for row in itertools.chain((first,), rows))
+            )
+        except ValidationError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to bulk ingest {self.table_name} records: {e}")
+            raise RepositoryError(f"Failed to bulk ingest {self.table_name} records: {e}")
+        
+        self._invalidate_results()
+        self.logger.info(f"Bulk ingested {count} {self.table_name} records")
+        return count
+    
     def bulk_update(self, entities: List[T]) -> List[T]:
         """
         Update multiple entities in a single transaction.
@@ -577,13 +1264,13 @@ class AsyncBaseRepository(ABC, Generic[T, ID]):
         Initialize the async repository.
         
         Args:
-            db_manager: Async database manager instance
+            db_manager: Async database manager instance, or None for the shared one
             table_name: Primary table name for this repository
             logger: Optional logger instance
         """
-        self.db = db_manager
+        self.db = _resolve_db_manager(db_manager)
         self.table_name = table_name
-        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.logger = logger or _logger_context.get() or logging.getLogger(self.__class__.__name__)
     
     # Abstract methods (same as BaseRepository)
     
@@ -596,6 +1283,15 @@ class AsyncBaseRepository(ABC, Generic[T, ID]):
     def _to_dict(self, entity: T) -> Dict[str, Any]:
         """Convert entity object to dictionary for database operations."""
         pass
+    
+    def _to_row(self, entity: T) -> Dict[str, Any]:
+        """
+        Build the column values written for an entity; defaults to _to_dict().
+        
+        Override to encode values only on the write path, leaving _to_dict()
+        as the entity's plain dictionary form (e.g. for exports).
+        """
+        return self._to_dict(entity)
         
     @abstractmethod
     async def _validate_entity(self, entity: T, is_update: bool = False) -> None:
@@ -608,7 +1304,7 @@ class AsyncBaseRepository(ABC, Generic[T, ID]):
         """Async version of create operation."""
         try:
             await self._validate_entity(entity, is_update=False)
-            data = self._to_dict(entity)
+            data = self._to_row(entity)
             
             # Remove ID if present (will be auto-generated)
             data.pop('id', None)
@@ -665,7 +1361,7 @@ class AsyncBaseRepository(ABC, Generic[T, ID]):
         """Async version of update operation."""
         try:
             await self._validate_entity(entity, is_update=True)
-            data = self._to_dict(entity)
+            data = self._to_row(entity)
             entity_id = data.get('id')
             
             if not entity_id:
@@ -779,10 +1475,8 @@ def build_where_clause(filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         elif isinstance(value, list):
             if not value:
                 continue
-            placeholders = ', '.join([f"%({param_name}_{i})s" for i in range(len(value))])
-            where_clauses.append(f"{key} IN ({placeholders})")
-            for i, v in enumerate(value):
-                params[f"{param_name}_{i}"] = v
+            where_clauses.append(f"{key} = ANY(%({param_name})s)")
+            params[param_name] = value
         elif isinstance(value, dict):
             # Support for operators like {'gte': 100}, {'lt': 50}
             for op, op_value in value.items():
@@ -5,7 +5,7 @@ Repository implementation for AI chat interactions, conversation management,
 and conversational agent functionality.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 from enum import Enum
@@ -14,7 +14,7 @@ import logging
 import json
 
 from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
-from .base_repository import ValidationError, NotFoundError
+from .base_repository import ValidationError, NotFoundError, RepositoryError
 
 
 class ConversationType(Enum):
@@ -128,7 +128,7 @@ class ChatMessage:
     intent: Optional[str] = None
     intent_confidence: Optional[IntentConfidence] = None
     entities: Optional[List[Dict[str, Any]]] = None
-    sentiment_score: Optional[Decimal] = None  # -1 to 1
+    sentiment_score: Optional[float] = None  # -1 to 1, stored as DECIMAL(3,2)
     emotion_analysis: Optional[Dict[str, Any]] = None
     
     # Crisis and safety
@@ -427,7 +427,7 @@ class ChatMessageRepository(BaseRepository[ChatMessage, str]):
             intent=row.get('intent'),
             intent_confidence=IntentConfidence(row['intent_confidence']) if row.get('intent_confidence') else None,
             entities=row.get('entities', []),
-            sentiment_score=Decimal(str(row['sentiment_score'])) if row.get('sentiment_score') else None,
+            sentiment_score=float(row['sentiment_score']) if row.get('sentiment_score') is not None else None,
             emotion_analysis=row.get('emotion_analysis'),
             crisis_indicators=row.get('crisis_indicators', []),
             safety_concern_level=row.get('safety_concern_level'),
@@ -530,6 +530,60 @@ class ChatMessageRepository(BaseRepository[ChatMessage, str]):
         
         return created_message
     
+    def append_messages(self, conversation_id: str, messages: List[ChatMessage]) -> List[ChatMessage]:
+        """
+        Append several messages to a conversation in one insert.
+        
+        The insert and the conversation stats update share a transaction, so
+        message_count never drifts from the stored messages; if either fails
+        both are rolled back and RepositoryError is raised.
+        """
+        if not messages:
+            return []
+        
+        for message in messages:
+            message.conversation_id = conversation_id
+        
+        # Bump the conversation stats in place rather than read-modify-write
+        query = """
+            UPDATE conversations
+            SET message_count = message_count + %(count)s,
+                last_activity = %(last_activity)s
+            WHERE conversation_id = %(conversation_id)s
+        """
+        
+        try:
+            with self.db.transaction():
+                created_messages = self.bulk_create(messages)
+                self.db.execute_query(query, {
+                    'count': len(created_messages),
+                    'last_activity': datetime.now(),
+                    'conversation_id': conversation_id
+                }, fetch_all=False)
+        except RepositoryError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to append messages to conversation {conversation_id}: {e}")
+            raise RepositoryError(f"Failed to append messages to conversation {conversation_id}: {e}")
+        finally:
+            self._evict(conversation_id, table_name="conversations")
+        
+        return created_messages
+    
+    def add_messages_bulk(self, conversation_id: str, user_id: str,
+                          messages: List[Tuple[str, MessageSender]],
+                          message_type: MessageType = MessageType.TEXT) -> List[ChatMessage]:
+        """Add several (content, sender) turns to a conversation in one insert."""
+        return self.append_messages(conversation_id, [
+            ChatMessage(
+                user_id=user_id,
+                sender=sender,
+                message_type=message_type,
+                content=content
+            )
+            for content, sender in messages
+        ])
+    
     def get_conversation_messages(self, conversation_id: str, 
                                 limit: Optional[int] = None,
                                 offset: int = 0) -> List[ChatMessage]:
@@ -5,17 +5,42 @@ Repository implementation for crisis detection, escalation protocols,
 emergency response, and safety planning functionality.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
+import json
 import logging
+import re
 
-from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
+from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult, with_slots
 from .base_repository import ValidationError, NotFoundError
 
 
+class EncodedJSON(str):
+    """A JSON value that has already been serialized."""
+
+
+def _encode_json_list(items: Optional[List[Any]]) -> Optional[str]:
+    """Serialize a list for a JSONB column, reusing pre-encoded items as-is."""
+    if items is None:
+        return None
+    return "[" + ",".join(
+        item if isinstance(item, EncodedJSON) else json.dumps(item, default=str)
+        for item in items
+    ) + "]"
+
+
+# Contacts that appear unchanged in most safety plans, serialized once
+CRISIS_HOTLINE_CONTACT = EncodedJSON(json.dumps(
+    {"name": "988 Suicide & Crisis Lifeline", "phone": "988", "role": "crisis_support"}
+))
+EMERGENCY_SERVICES_CONTACT = EncodedJSON(json.dumps(
+    {"name": "Emergency Services", "phone": "911", "role": "emergency"}
+))
+
+
 class CrisisSeverity(Enum):
     """Crisis severity enumeration."""
     LOW = "low"
@@ -78,6 +103,7 @@ class CrisisKeyword:
     updated_at: Optional[datetime] = None
 
 
+@with_slots
 @dataclass
 class CrisisDetection:
     """Crisis detection entity."""
@@ -163,6 +189,7 @@ class CrisisEscalation:
     updated_at: Optional[datetime] = None
 
 
+@with_slots
 @dataclass
 class SafetyPlan:
     """Safety plan entity."""
@@ -243,9 +270,106 @@ class CrisisAnalytics:
     crisis_contacts_made: int
 
 
+# Leading inline flags, e.g. (?i), which must stay at the start of a pattern
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _letter_mask(text: str) -> int:
+    """Return a bitmask of the ASCII letters a-z that occur in text, ignoring case."""
+    mask = 0
+    for char in set(text.lower()):
+        if 'a' <= char <= 'z':
+            mask |= 1 << (ord(char) - 97)
+    return mask
+
+
+class CrisisKeywordMatcher:
+    """
+    Scans text for a fixed set of crisis keywords in a single pass.
+    
+    Literal keywords are compiled into one alternation pattern with a named
+    group per keyword, so a text is scanned once regardless of how many
+    literal keywords are active. Regex keywords are compiled on their own,
+    keeping their inline flags and group numbering intact; one that does
+    not compile is logged and skipped rather than failing every scan.
+    
+    Before scanning, the letters of the text are folded into a bitmask and
+    compared with the letter mask of each literal keyword; when no keyword
+    has all of its letters present the literal scan is skipped. Regex
+    keywords have no letter mask and always force the full scan.
+    """
+    
+    def __init__(self, keywords: Sequence[CrisisKeyword], logger: logging.Logger = None):
+        self.keywords = list(keywords)
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        
+        masks = set()
+        alternatives = []
+        self._regex_patterns = []
+        for index, keyword in enumerate(self.keywords):
+            if keyword.is_regex:
+                pattern = self._compile_regex(keyword)
+                if pattern is not None:
+                    masks.add(0)
+                    self._regex_patterns.append((index, pattern))
+                continue
+            masks.add(_letter_mask(keyword.keyword_phrase))
+            pattern = re.escape(keyword.keyword_phrase)
+            if keyword.word_boundary_required:
+                pattern = rf"\b{pattern}\b"
+            if not keyword.case_sensitive:
+                pattern = f"(?i:{pattern})"
+            alternatives.append(f"(?P<k{index}>{pattern})")
+        
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+        self._keyword_masks = frozenset(masks)
+    
+    def _compile_regex(self, keyword: CrisisKeyword) -> Optional["re.Pattern"]:
+        """Compile a regex keyword on its own, or log and return None when it is invalid."""
+        pattern = keyword.keyword_phrase
+        if keyword.word_boundary_required:
+            # Global inline flags such as (?i) must stay at the very start
+            flags = _GLOBAL_FLAGS.match(pattern)
+            prefix = flags.group(0) if flags else ""
+            pattern = rf"{prefix}\b(?:{pattern[len(prefix):]})\b"
+        try:
+            return re.compile(pattern, 0 if keyword.case_sensitive else re.IGNORECASE)
+        except re.error as e:
+            self.logger.error(f"Skipping invalid crisis keyword regex {keyword.keyword_phrase!r} "
+                              f"({keyword.keyword_id}): {e}")
+            return None
+    
+    def might_match(self, text: str) -> bool:
+        """Return False when text cannot contain any keyword, judged by its letters alone."""
+        if 0 in self._keyword_masks:
+            return True
+        text_mask = _letter_mask(text)
+        return any(mask & ~text_mask == 0 for mask in self._keyword_masks)
+    
+    def scan(self, text: str) -> List[CrisisKeyword]:
+        """Return the keywords found in text, in order of first occurrence."""
+        if not text or not self.might_match(text):
+            return []
+        
+        first_seen = {}
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                first_seen.setdefault(int(match.lastgroup[1:]), match.start())
+        for index, pattern in self._regex_patterns:
+            match = pattern.search(text)
+            if match:
+                first_seen[index] = match.start()
+        return [self.keywords[index] for index in sorted(first_seen, key=lambda i: (first_seen[i], i))]
+
+
 class CrisisKeywordRepository(BaseRepository[CrisisKeyword, str]):
     """Repository for crisis keyword management."""
     
+    # Compiled matchers are result-cache entries: writes through this
+    # repository drop them, and keywords changed elsewhere (another
+    # repository or process) are picked up within this many seconds
+    result_cache_ttl = 60
+    
     def __init__(self, db_manager, logger: logging.Logger = None):
         super().__init__(db_manager, "crisis_keywords", logger)
     
@@ -317,6 +441,17 @@ class CrisisKeywordRepository(BaseRepository[CrisisKeyword, str]):
         result = self.list_all(options)
         return result.data
     
+    def get_matcher(self, crisis_type: CrisisType = None, refresh: bool = False) -> CrisisKeywordMatcher:
+        """Get a compiled matcher for the active keywords, rebuilt once it expires."""
+        key = ('matcher', crisis_type)
+        if refresh:
+            self._result_cache.pop(key, None)
+        return self._cached_result(key, lambda: CrisisKeywordMatcher(self.get_active_keywords(crisis_type), self.logger))
+    
+    def detect_keywords(self, text: str, crisis_type: CrisisType = None) -> List[CrisisKeyword]:
+        """Find active crisis keywords in text."""
+        return self.get_matcher(crisis_type).scan(text)
+    
     def update_effectiveness(self, keyword_id: str, is_true_positive: bool) -> bool:
         """Update keyword effectiveness tracking."""
         try:
@@ -665,11 +800,11 @@ class SafetyPlanRepository(BaseRepository[SafetyPlan, str]):
             'internal_coping_strategies': entity.internal_coping_strategies,
             'external_coping_strategies': entity.external_coping_strategies,
             'distraction_techniques': entity.distraction_techniques,
-            'supportive_people': entity.supportive_people,
-            'professional_contacts': entity.professional_contacts,
-            'emergency_contacts': entity.emergency_contacts,
+            'supportive_people': _encode_json_list(entity.supportive_people),
+            'professional_contacts': _encode_json_list(entity.professional_contacts),
+            'emergency_contacts': _encode_json_list(entity.emergency_contacts),
             'crisis_hotlines': entity.crisis_hotlines,
-            'local_emergency_services': entity.local_emergency_services,
+            'local_emergency_services': json.dumps(entity.local_emergency_services, default=str) if entity.local_emergency_services is not None else None,
             'lethal_means_removal': entity.lethal_means_removal,
             'safe_environment_steps': entity.safe_environment_steps,
             'reasons_for_living': entity.reasons_for_living,
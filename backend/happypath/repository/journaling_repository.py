@@ -12,8 +12,9 @@ from enum import Enum
 from decimal import Decimal
 import logging
 
-from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
+from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult, with_slots
 from .base_repository import ValidationError, NotFoundError
+from .crisis_repository import CrisisKeywordRepository
 
 
 class JournalEntryType(Enum):
@@ -57,6 +58,7 @@ class IntensityScale(Enum):
     TEN = "10"
 
 
+@with_slots
 @dataclass
 class JournalEntry:
     """Journal entry entity."""
@@ -219,6 +221,7 @@ class JournalEntryRepository(BaseRepository[JournalEntry, str]):
     
     def __init__(self, db_manager, logger: logging.Logger = None):
         super().__init__(db_manager, "journal_entries", logger)
+        self._crisis_keyword_repo: Optional[CrisisKeywordRepository] = None
     
     def _to_entity(self, row: Dict[str, Any]) -> JournalEntry:
         """Convert database row to JournalEntry entity."""
@@ -331,10 +334,27 @@ class JournalEntryRepository(BaseRepository[JournalEntry, str]):
         if entity.writing_duration_minutes and entity.writing_duration_minutes < 0:
             raise ValidationError("Writing duration must be non-negative")
         
+        # Flag crisis language on new entries unless the caller already assessed them.
+        # Failures propagate: a failed keyword query aborts any surrounding
+        # transaction, and an unscanned entry must not pass as crisis-free
+        if not is_update and entity.risk_indicators is None:
+            entity.risk_indicators = self.detect_risk_indicators(entity.content) or None
+        
         if not entity.entry_id and not is_update:
             import uuid
             entity.entry_id = str(uuid.uuid4())
     
+    def detect_risk_indicators(self, content: str) -> List[str]:
+        """
+        Return the active crisis keyword phrases found in content.
+        
+        Uses the crisis keyword repository's compiled matcher, so the text is
+        scanned once however many keywords are active.
+        """
+        if self._crisis_keyword_repo is None:
+            self._crisis_keyword_repo = CrisisKeywordRepository(self.db, self.logger)
+        return [keyword.keyword_phrase for keyword in self._crisis_keyword_repo.detect_keywords(content)]
+    
     def get_user_entries(self, user_id: str, start_date: date = None, 
                         end_date: date = None, entry_type: JournalEntryType = None,
                         limit: Optional[int] = None) -> List[JournalEntry]:
@@ -592,6 +612,7 @@ class JournalPromptRepository(BaseRepository[JournalPrompt, str]):
             """
             
             self.db.execute_query(query, {'prompt_id': prompt_id})
+            self._evict(prompt_id)
             return self.db.get_affected_rows() > 0
             
         except Exception as e:
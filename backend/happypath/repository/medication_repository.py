@@ -6,13 +6,16 @@ and medication management functionality.
 """
 
 from typing import List, Optional, Dict, Any
+from array import array
+from bisect import bisect_left
+import calendar
 from datetime import datetime, date, time, timedelta
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
 import logging
 
-from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
+from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult, with_slots
 from .base_repository import ValidationError, NotFoundError
 
 
@@ -134,6 +137,7 @@ class Medication:
     updated_at: Optional[datetime] = None
 
 
+@with_slots
 @dataclass
 class MedicationDose:
     """Medication dose entity."""
@@ -209,6 +213,61 @@ class MedicationAdherence:
     created_at: Optional[datetime] = None
 
 
+# Compact codes for AdherenceStatus values in MedicationDoseBatch.status
+ADHERENCE_STATUS_CODES = {status.value: code for code, status in enumerate(AdherenceStatus)}
+
+
+@dataclass
+class MedicationDoseBatch:
+    """
+    Column-oriented view of a set of doses for adherence calculations.
+    
+    Each field is a parallel typed array, one slot per dose, so aggregate
+    calculations scan contiguous buffers instead of dose objects.
+    Missing timestamps are stored as -1.
+    """
+    scheduled_ts: array  # epoch seconds ('q')
+    actual_ts: array  # epoch seconds ('q')
+    status: array  # ADHERENCE_STATUS_CODES ('B')
+    user_id: Optional[str] = None
+    
+    def __len__(self) -> int:
+        return len(self.status)
+    
+    def window(self, start: datetime, end: datetime) -> "MedicationDoseBatch":
+        """
+        Doses scheduled in [start, end).
+        
+        Batches are ordered by scheduled time, so the window is located by
+        binary search and sliced rather than compared dose by dose. Naive
+        datetimes are taken as UTC, matching EXTRACT(EPOCH FROM ...).
+        """
+        low = bisect_left(self.scheduled_ts, calendar.timegm(start.utctimetuple()))
+        high = bisect_left(self.scheduled_ts, calendar.timegm(end.utctimetuple()), low)
+        return MedicationDoseBatch(
+            scheduled_ts=self.scheduled_ts[low:high],
+            actual_ts=self.actual_ts[low:high],
+            status=self.status[low:high],
+            user_id=self.user_id
+        )
+    
+    def count(self, status: AdherenceStatus) -> int:
+        """Number of doses with the given adherence status."""
+        return self.status.count(ADHERENCE_STATUS_CODES[status.value])
+    
+    def average_delay_minutes(self, status: AdherenceStatus = AdherenceStatus.LATE) -> Optional[float]:
+        """Mean delay between scheduled and actual time for doses with a status."""
+        code = ADHERENCE_STATUS_CODES[status.value]
+        delays = [
+            actual - scheduled
+            for scheduled, actual, dose_status in zip(self.scheduled_ts, self.actual_ts, self.status)
+            if dose_status == code and actual >= 0 and scheduled >= 0
+        ]
+        if not delays:
+            return None
+        return sum(delays) / len(delays) / 60
+
+
 @dataclass
 class MedicationReminder:
     """Medication reminder entity."""
@@ -594,6 +653,32 @@ class MedicationDoseRepository(BaseRepository[MedicationDose, str]):
         result = self.list_all(options)
         return result.data
     
+    def get_doses_batch(self, medication_id: str, start_date: date,
+                        end_date: date) -> MedicationDoseBatch:
+        """Get doses for a medication as a column-oriented batch."""
+        query = f"""
+            SELECT user_id,
+                   COALESCE(EXTRACT(EPOCH FROM scheduled_time)::bigint, -1) AS scheduled_ts,
+                   COALESCE(EXTRACT(EPOCH FROM actual_time)::bigint, -1) AS actual_ts,
+                   adherence_status
+            FROM {self.table_name}
+            WHERE medication_id = %(medication_id)s
+              AND scheduled_time BETWEEN %(start_time)s AND %(end_time)s
+            ORDER BY scheduled_time
+        """
+        rows = self.db.execute_query(query, {
+            'medication_id': medication_id,
+            'start_time': datetime.combine(start_date, datetime.min.time()),
+            'end_time': datetime.combine(end_date, datetime.max.time())
+        }) or []
+        
+        return MedicationDoseBatch(
+            scheduled_ts=array('q', [row['scheduled_ts'] for row in rows]),
+            actual_ts=array('q', [row['actual_ts'] for row in rows]),
+            status=array('B', [ADHERENCE_STATUS_CODES[row['adherence_status']] for row in rows]),
+            user_id=rows[0]['user_id'] if rows else None
+        )
+    
     def get_missed_doses(self, user_id: str, hours_overdue: int = 2) -> List[MedicationDose]:
         """Get missed doses that are overdue."""
         cutoff_time = datetime.now() - timedelta(hours=hours_overdue)
@@ -696,13 +781,13 @@ class MedicationAdherenceRepository(BaseRepository[MedicationAdherence, str]):
         try:
             # Get all scheduled doses in the period
             dose_repo = MedicationDoseRepository(self.db, self.logger)
-            doses = dose_repo.get_medication_doses(medication_id, start_date, end_date)
+            doses = dose_repo.get_doses_batch(medication_id, start_date, end_date)
             
             total_scheduled = len(doses)
-            taken = len([d for d in doses if d.adherence_status == AdherenceStatus.TAKEN])
-            late = len([d for d in doses if d.adherence_status == AdherenceStatus.LATE])
-            missed = len([d for d in doses if d.adherence_status == AdherenceStatus.MISSED])
-            skipped = len([d for d in doses if d.adherence_status == AdherenceStatus.SKIPPED])
+            taken = doses.count(AdherenceStatus.TAKEN)
+            late = doses.count(AdherenceStatus.LATE)
+            missed = doses.count(AdherenceStatus.MISSED)
+            skipped = doses.count(AdherenceStatus.SKIPPED)
             
             total_taken = taken + late
             
@@ -711,15 +796,13 @@ class MedicationAdherenceRepository(BaseRepository[MedicationAdherence, str]):
             on_time_pct = (taken / total_scheduled * 100) if total_scheduled > 0 else 0
             
             # Calculate average delay for late doses
-            late_doses = [d for d in doses if d.adherence_status == AdherenceStatus.LATE and d.actual_time and d.scheduled_time]
-            avg_delay = None
-            if late_doses:
-                total_delay = sum((d.actual_time - d.scheduled_time).total_seconds() / 60 for d in late_doses)
-                avg_delay = Decimal(str(total_delay / len(late_doses)))
+            avg_delay = doses.average_delay_minutes(AdherenceStatus.LATE)
+            if avg_delay is not None:
+                avg_delay = Decimal(str(avg_delay))
             
             adherence = MedicationAdherence(
                 medication_id=medication_id,
-                user_id=doses[0].user_id if doses else None,
+                user_id=doses.user_id,
                 period_start=start_date,
                 period_end=end_date,
                 period_type="custom",
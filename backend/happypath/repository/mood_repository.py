@@ -5,14 +5,14 @@ Repository implementation for mood tracking, patterns analysis,
 and mood-related goal management.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
 import logging
 
-from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
+from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult, with_slots
 from .base_repository import ValidationError, NotFoundError
 
 
@@ -66,6 +66,7 @@ class StressLevel(Enum):
     OVERWHELMING = "overwhelming"
 
 
+@with_slots
 @dataclass
 class MoodEntry:
     """Mood entry entity."""
@@ -222,6 +223,26 @@ class MoodAnalytics:
     goal_success_rate: float
 
 
+def _pearson(x: Sequence[float], y: Sequence[float]) -> float:
+    """Pearson correlation coefficient computed in a single pass."""
+    n = len(x)
+    sum_x = sum_y = sum_xx = sum_yy = sum_xy = 0.0
+    for a, b in zip(x, y):
+        sum_x += a
+        sum_y += b
+        sum_xx += a * a
+        sum_yy += b * b
+        sum_xy += a * b
+    
+    numerator = sum_xy - sum_x * sum_y / n
+    x_var = sum_xx - sum_x * sum_x / n
+    y_var = sum_yy - sum_y * sum_y / n
+    variance_product = x_var * y_var
+    
+    # Rounding can push a zero variance slightly negative
+    return numerator / variance_product ** 0.5 if variance_product > 0 else 0.0
+
+
 class MoodEntryRepository(BaseRepository[MoodEntry, str]):
     """Repository for mood entry management."""
     
@@ -356,30 +377,30 @@ class MoodEntryRepository(BaseRepository[MoodEntry, str]):
         """Calculate mood trends over specified period."""
         try:
             start_date = date.today() - timedelta(days=days)
-            entries = self.get_user_entries(user_id, start_date)
-            
-            if not entries:
-                return {}
             
-            # Convert mood values to integers for calculation
-            mood_values = [int(entry.overall_mood.value) for entry in entries if entry.overall_mood]
+            # Aggregate in one pass on the server instead of loading every entry;
+            # the slope is per entry, taken in chronological order
+            query = """
+                SELECT COUNT(*) AS total_entries,
+                       AVG(mood) AS average_mood,
+                       VAR_SAMP(mood) AS mood_variance,
+                       REGR_SLOPE(mood, position) AS trend_slope
+                FROM (
+                    SELECT overall_mood::TEXT::INTEGER AS mood,
+                           ROW_NUMBER() OVER (ORDER BY entry_date, entry_time) AS position
+                    FROM mood_entries
+                    WHERE user_id = %(user_id)s AND entry_date >= %(start_date)s
+                ) entries
+            """
+            row = self.db.execute_query(query, {'user_id': user_id, 'start_date': start_date}, fetch_one=True)
             
-            if not mood_values:
+            if not row or not row['total_entries']:
                 return {}
             
-            average_mood = sum(mood_values) / len(mood_values)
+            total_entries = row['total_entries']
+            slope = float(row['trend_slope'] or 0)
             
-            # Calculate trend (simple linear regression)
-            x_values = list(range(len(mood_values)))
-            if len(x_values) > 1:
-                x_mean = sum(x_values) / len(x_values)
-                y_mean = average_mood
-                
-                numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, mood_values))
-                denominator = sum((x - x_mean) ** 2 for x in x_values)
-                
-                slope = numerator / denominator if denominator != 0 else 0
-                
+            if total_entries > 1:
                 if slope > 0.1:
                     trend = "improving"
                 elif slope < -0.1:
@@ -390,10 +411,11 @@ class MoodEntryRepository(BaseRepository[MoodEntry, str]):
                 trend = "insufficient_data"
             
             return {
-                'average_mood': round(average_mood, 2),
+                'average_mood': round(float(row['average_mood']), 2),
+                'mood_variance': round(float(row['mood_variance']), 3) if row['mood_variance'] is not None else 0,
                 'trend_direction': trend,
-                'trend_slope': round(slope, 3) if len(x_values) > 1 else 0,
-                'total_entries': len(entries),
+                'trend_slope': round(slope, 3),
+                'total_entries': total_entries,
                 'period_days': days
             }
             
@@ -443,17 +465,7 @@ class MoodEntryRepository(BaseRepository[MoodEntry, str]):
         if len(x) != len(y) or len(x) < 2:
             return 0.0
         
-        n = len(x)
-        x_mean = sum(x) / n
-        y_mean = sum(y) / n
-        
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        x_var = sum((x[i] - x_mean) ** 2 for i in range(n))
-        y_var = sum((y[i] - y_mean) ** 2 for i in range(n))
-        
-        denominator = (x_var * y_var) ** 0.5
-        
-        return numerator / denominator if denominator != 0 else 0.0
+        return _pearson(x, y)
 
 
 class MoodPatternRepository(BaseRepository[MoodPattern, str]):
@@ -3,6 +3,9 @@ Session Repository
 
 Repository implementation for user session management.
 Handles session creation, validation, cleanup, and analytics.
+
+Ingestion jobs loading many sessions should use SessionRepository.bulk_ingest(),
+which streams rows with COPY rather than one INSERT per session.
 """
 
 from typing import List, Optional, Dict, Any
@@ -14,7 +17,7 @@ import json
 import logging
 
 from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
-from .base_repository import ValidationError, NotFoundError
+from .base_repository import ValidationError, NotFoundError, _hour_bucket
 
 
 class SessionStatus(Enum):
@@ -241,6 +244,11 @@ class SessionRepository(BaseRepository[UserSession, str]):
         self._cleanup_user_sessions(user_id)
         
         created_session = self.create(session)
+        self._publish_change(
+            "session_created",
+            {"session_id": created_session.id, "login_method": login_method, "risk_score": risk_score},
+            user_id=user_id
+        )
         
         self.logger.info(f"Created session for user {user_id}", extra={
             "user_id": user_id,
@@ -306,6 +314,7 @@ class SessionRepository(BaseRepository[UserSession, str]):
             }
             
             self.db.execute_query(query, params)
+            self._evict(session_id)
             return self.db.get_affected_rows() > 0
             
         except Exception as e:
@@ -365,8 +374,8 @@ class SessionRepository(BaseRepository[UserSession, str]):
             Number of sessions terminated
         """
         try:
-            # Get active sessions for user
-            sessions = self.get_user_sessions(user_id, active_only=True)
+            # Walk every active session page by page, not just the newest page
+            sessions = self.iter_all({'user_id': user_id, 'is_active': True})
             
             terminated_count = 0
             for session in sessions:
@@ -383,35 +392,33 @@ class SessionRepository(BaseRepository[UserSession, str]):
             self.logger.error(f"Failed to terminate sessions for user {user_id}: {e}")
             return 0
     
-    def get_user_sessions(self, user_id: int, active_only: bool = False) -> List[UserSession]:
+    def get_user_sessions(self, user_id: int, active_only: bool = False, limit: int = 500,
+                          after: Optional[UserSession] = None) -> List[UserSession]:
         """
-        Get all sessions for a user.
+        Get sessions for a user, newest first.
         
         Args:
             user_id: User ID
             active_only: Whether to return only active sessions
+            limit: Maximum sessions per page; required
+            after: Last session of the previous page, to fetch the next one
             
         Returns:
             List of user sessions
         """
-        filters = {'user_id': user_id}
+        conditions = ["user_id = %(user_id)s"]
         if active_only:
-            filters['is_active'] = True
-        
-        options = QueryOptions(
-            filters=filters,
-            order_by=['-created_at']
-        )
+            conditions.append("is_active = TRUE")
         
-        result = self.list_all(options)
-        return result.data
+        return self._keyset_page(conditions, {'user_id': user_id}, limit, after)
     
     def get_active_sessions(self, limit: Optional[int] = None) -> List[UserSession]:
         """Get all active sessions."""
         options = QueryOptions(
             filters={'is_active': True},
             limit=limit,
-            order_by=['-last_activity']
+            order_by=['-last_activity'],
+            prepared=True
         )
         
         result = self.list_all(options)
@@ -422,7 +429,8 @@ class SessionRepository(BaseRepository[UserSession, str]):
         options = QueryOptions(
             filters={'is_suspicious': True, 'is_active': True},
             limit=limit,
-            order_by=['-risk_score', '-created_at']
+            order_by=['-risk_score', '-created_at'],
+            prepared=True
         )
         
         result = self.list_all(options)
@@ -505,6 +513,8 @@ class SessionRepository(BaseRepository[UserSession, str]):
             
             self.db.execute_query(expire_query, {'current_time': current_time})
             expired_count = self.db.get_affected_rows()
+            self.clear_result_cache()
+            self.clear_identity_map()
             
             # Delete old terminated sessions (older than 30 days)
             cleanup_threshold = current_time - timedelta(days=30)
@@ -519,6 +529,7 @@ class SessionRepository(BaseRepository[UserSession, str]):
             
             self.db.execute_query(delete_query, {'threshold': cleanup_threshold})
             deleted_count = self.db.get_affected_rows()
+            self.clear_identity_map()
             
             total_cleaned = expired_count + deleted_count
             
@@ -536,6 +547,11 @@ class SessionRepository(BaseRepository[UserSession, str]):
         """
         Generate session analytics for a time period.
         
+        The queries cover exactly the requested period. The result is cached
+        for result_cache_ttl seconds under the whole hours the period spans,
+        so repeated dashboard calls within the same hours reuse the first
+        computation until a session is written.
+        
         Args:
             start_date: Start of analysis period
             end_date: End of analysis period (defaults to now)
@@ -544,7 +560,13 @@ class SessionRepository(BaseRepository[UserSession, str]):
             SessionAnalytics with statistics
         """
         end_date = end_date or datetime.utcnow()
-        
+        return self._cached_result(
+            ('session_analytics', *_hour_bucket(start_date, end_date)),
+            lambda: self._compute_session_analytics(start_date, end_date)
+        )
+    
+    def _compute_session_analytics(self, start_date: datetime, end_date: datetime) -> SessionAnalytics:
+        """Run the session analytics queries for a time period."""
         try:
             # Basic counts
             counts_query = f"""
@@ -678,7 +700,7 @@ class SessionRepository(BaseRepository[UserSession, str]):
                 risk_score += self.risk_factors['unusual_time']
             
             # Check for multiple active sessions
-            active_sessions = len(self.get_user_sessions(user_id, active_only=True))
+            active_sessions = self.count({'user_id': user_id, 'is_active': True})
             if active_sessions >= 3:
                 risk_score += self.risk_factors['multiple_sessions']
             
@@ -695,7 +717,7 @@ class SessionRepository(BaseRepository[UserSession, str]):
     def _cleanup_user_sessions(self, user_id: int) -> None:
         """Clean up old sessions for a user to enforce max sessions limit."""
         try:
-            active_sessions = self.get_user_sessions(user_id, active_only=True)
+            active_sessions = list(self.iter_all({'user_id': user_id, 'is_active': True}))
             
             if len(active_sessions) >= self.max_sessions_per_user:
                 # Sort by last activity and terminate oldest sessions
@@ -718,6 +740,8 @@ class SessionRepository(BaseRepository[UserSession, str]):
             """
             
             self.db.execute_query(query, {'session_id': session_id})
+            self.clear_result_cache()
+            self._evict(session_id)
             
         except Exception as e:
             self.logger.error(f"Failed to expire session {session_id}: {e}")
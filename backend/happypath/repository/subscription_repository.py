@@ -5,15 +5,16 @@ Repository implementation for subscription and billing management.
 Handles subscription plans, billing cycles, payments, and usage tracking.
 """
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
+from types import MappingProxyType
 from decimal import Decimal
 import logging
 
 from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
-from .base_repository import ValidationError, NotFoundError
+from .base_repository import ValidationError, NotFoundError, memoized_query
 
 
 class SubscriptionStatus(Enum):
@@ -196,9 +197,23 @@ class SubscriptionAnalytics:
     geographic_distribution: Dict[str, int]
 
 
+# Plan columns selected alongside a subscription, prefixed to avoid name clashes
+_PLAN_COLUMNS = tuple(field.name for field in fields(SubscriptionPlan))
+_PLAN_SELECT = ', '.join(f"p.{column} AS plan__{column}" for column in _PLAN_COLUMNS)
+
+# Options for the active plan listing, which never vary between calls
+_ACTIVE_PLANS_OPTIONS = QueryOptions(
+    filters=MappingProxyType({'is_active': True}),
+    order_by=('price',)
+)
+
+
 class SubscriptionPlanRepository(BaseRepository[SubscriptionPlan, int]):
     """Repository for subscription plan management."""
     
+    # Plan lookups are memoized in the shared cache; plan writes drop them
+    memoized_queries = ('get_active_plans', 'get_plan_by_name')
+    
     def __init__(self, db_manager, logger: logging.Logger = None):
         super().__init__(db_manager, "subscription_plans", logger)
     
@@ -252,15 +267,17 @@ class SubscriptionPlanRepository(BaseRepository[SubscriptionPlan, int]):
         if entity.trial_days < 0:
             raise ValidationError("Trial days cannot be negative")
     
+    def create_many(self, plans: Sequence[SubscriptionPlan]) -> List[SubscriptionPlan]:
+        """Create several plans with one multi-row INSERT, returning them in input order."""
+        return self.bulk_create(list(plans))
+    
+    @memoized_query(ttl=300)
     def get_active_plans(self) -> List[SubscriptionPlan]:
         """Get all active subscription plans."""
-        options = QueryOptions(
-            filters={'is_active': True},
-            order_by=['price']
-        )
-        result = self.list_all(options)
+        result = self.list_all(_ACTIVE_PLANS_OPTIONS)
         return result.data
     
+    @memoized_query(ttl=300)
     def get_plan_by_name(self, name: str) -> Optional[SubscriptionPlan]:
         """Get plan by name."""
         return self.find_one_by(name=name)
@@ -269,9 +286,11 @@ class SubscriptionPlanRepository(BaseRepository[SubscriptionPlan, int]):
 class SubscriptionRepository(BaseRepository[Subscription, int]):
     """Repository for subscription management."""
     
-    def __init__(self, db_manager, logger: logging.Logger = None):
+    def __init__(self, db_manager, logger: logging.Logger = None,
+                 plan_repo: Optional[SubscriptionPlanRepository] = None):
         super().__init__(db_manager, "subscriptions", logger)
-        self.plan_repo = SubscriptionPlanRepository(db_manager, logger)
+        # Share an existing plan repository when given one
+        self.plan_repo = plan_repo or SubscriptionPlanRepository(self.db, self.logger)
     
     def _to_entity(self, row: Dict[str, Any]) -> Subscription:
         """Convert database row to Subscription entity."""
@@ -433,14 +452,46 @@ class SubscriptionRepository(BaseRepository[Subscription, int]):
             self.logger.error(f"Failed to get user subscription for {user_id}: {e}")
             return None
     
-    def get_user_subscription_history(self, user_id: int) -> List[Subscription]:
-        """Get all subscriptions for a user."""
-        options = QueryOptions(
-            filters={'user_id': user_id},
-            order_by=['-created_at']
-        )
-        result = self.list_all(options)
-        return result.data
+    def get_user_subscription_with_plan(self, user_id: int) -> Optional[Tuple[Subscription, SubscriptionPlan]]:
+        """Get a user's active subscription and its plan with a single JOIN query."""
+        active_statuses = [
+            SubscriptionStatus.TRIAL.value,
+            SubscriptionStatus.ACTIVE.value,
+            SubscriptionStatus.PAST_DUE.value
+        ]
+        
+        try:
+            query = f"""
+                SELECT s.*, {_PLAN_SELECT}
+                FROM {self.table_name} s
+                JOIN {self.plan_repo.table_name} p ON p.id = s.plan_id
+                WHERE s.user_id = %(user_id)s 
+                AND s.status = ANY(%(statuses)s)
+                ORDER BY s.created_at DESC
+                LIMIT 1
+            """
+            
+            params = {
+                'user_id': user_id,
+                'statuses': active_statuses
+            }
+            
+            result = self.db.execute_query(query, params)
+            if not result:
+                return None
+            
+            row = result[0]
+            plan_row = {column: row.pop(f"plan__{column}", None) for column in _PLAN_COLUMNS}
+            return self._to_entity(row), self.plan_repo._to_entity(plan_row)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get user subscription with plan for {user_id}: {e}")
+            return None
+    
+    def get_user_subscription_history(self, user_id: int, limit: int = 500,
+                                      after: Optional[Subscription] = None) -> List[Subscription]:
+        """Get a user's subscriptions, newest first, one keyset page of at most limit at a time."""
+        return self._keyset_page(["user_id = %(user_id)s"], {'user_id': user_id}, limit, after)
     
     def cancel_subscription(self, subscription_id: int, reason: str = "user_request",
                           immediate: bool = False) -> Subscription:
@@ -566,6 +617,11 @@ class SubscriptionRepository(BaseRepository[Subscription, int]):
                 }
         
         updated_subscription = self.update(subscription)
+        self._publish_change(
+            "subscription_updated",
+            {"subscription_id": subscription_id, "old_plan_id": old_plan.id, "new_plan_id": new_plan.id},
+            user_id=updated_subscription.user_id
+        )
         
         self.logger.info(f"Upgraded subscription {subscription_id} from plan {old_plan.id} to {new_plan.id}")
         return updated_subscription
@@ -672,6 +728,7 @@ class SubscriptionRepository(BaseRepository[Subscription, int]):
             
             self.db.execute_query(query, params)
             expired_count = self.db.get_affected_rows()
+            self.clear_identity_map()
             
             if expired_count > 0:
                 self.logger.info(f"Expired {expired_count} trial subscriptions")
@@ -12,7 +12,7 @@ import bcrypt
 import logging
 
 from .base_repository import BaseRepository, AsyncBaseRepository, QueryOptions, QueryResult
-from .base_repository import ValidationError, NotFoundError, DuplicateError
+from .base_repository import ValidationError, NotFoundError, DuplicateError, memoized_query
 
 
 @dataclass
@@ -71,6 +71,11 @@ class UserProfile:
 class UserRepository(BaseRepository[User, int]):
     """Repository for user management operations."""
     
+    # Premium user IDs are memoized in the shared cache; user writes and
+    # these events, once the event manager handles them, drop them
+    memoized_queries = ('_premium_user_ids',)
+    invalidate_on = ('user_registered', 'user_profile_updated', 'subscription_updated')
+    
     def __init__(self, db_manager, logger: logging.Logger = None):
         super().__init__(db_manager, "users", logger)
         self.profile_table = "user_profiles"
@@ -182,7 +187,19 @@ class UserRepository(BaseRepository[User, int]):
             **kwargs
         )
         
-        return self.create(user)
+        created_user = self.create(user)
+        self._publish_change(
+            "user_registered",
+            {"email": created_user.email, "registration_source": "user_repository"},
+            user_id=created_user.id
+        )
+        return created_user
+    
+    def update(self, entity: User) -> User:
+        """Update a user and publish USER_PROFILE_UPDATED after commit."""
+        updated_user = super().update(entity)
+        self._publish_change("user_profile_updated", {"user_id": updated_user.id}, user_id=updated_user.id)
+        return updated_user
     
     def authenticate_user(self, email_or_username: str, password: str) -> Optional[User]:
         """
@@ -312,7 +329,8 @@ class UserRepository(BaseRepository[User, int]):
         """Update user's last login timestamp."""
         user = self.get_by_id_or_raise(user_id)
         user.last_login = datetime.utcnow()
-        return self.update(user)
+        # A login changes no cached listing, so skip the change event
+        return super().update(user)
     
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email address."""
@@ -377,48 +395,56 @@ class UserRepository(BaseRepository[User, int]):
         return result.data
     
     def get_premium_users(self, limit: int = None) -> List[User]:
-        """Get all premium users."""
-        options = QueryOptions(
-            filters={'is_premium': True, 'is_active': True},
-            limit=limit,
-            order_by=['created_at']
-        )
-        result = self.list_all(options)
-        return result.data
+        """
+        Get all premium users.
+        
+        Only the matching IDs are memoized, so password hashes and other
+        user fields never reach the shared cache; the users themselves are
+        loaded with one primary-key lookup.
+        """
+        user_ids = self._premium_user_ids(limit)
+        users = self.get_many(user_ids)
+        return [users[user_id] for user_id in user_ids if user_id in users]
+    
+    @memoized_query(ttl=60)
+    def _premium_user_ids(self, limit: Optional[int]) -> List[int]:
+        """Return the IDs of active premium users, oldest first."""
+        query = f"""
+            SELECT id FROM {self.table_name}
+            WHERE is_premium = true AND is_active = true
+            ORDER BY created_at
+        """
+        params: Dict[str, Any] = {}
+        if limit:
+            query += " LIMIT %(limit)s"
+            params['limit'] = limit
+        
+        result = self.db.execute_query(query, params) or []
+        return [row['id'] for row in result]
     
-    def get_users_by_signup_date(self, start_date: datetime, 
-                                end_date: datetime = None) -> List[User]:
+    def get_users_by_signup_date(self, start_date: datetime,
+                                end_date: datetime = None, limit: int = 500,
+                                after: Optional[User] = None) -> List[User]:
         """
-        Get users who signed up within date range.
+        Get users who signed up within date range, newest first.
         
         Args:
             start_date: Start of date range
             end_date: End of date range (defaults to now)
+            limit: Maximum users per page; required
+            after: Last user of the previous page, to fetch the next one
             
         Returns:
             List of users
         """
         end_date = end_date or datetime.utcnow()
         
-        try:
-            query = f"""
-                SELECT * FROM {self.table_name}
-                WHERE created_at >= %(start_date)s 
-                AND created_at <= %(end_date)s
-                ORDER BY created_at DESC
-            """
-            
-            params = {
-                'start_date': start_date,
-                'end_date': end_date
-            }
-            
-            result = self.db.execute_query(query, params)
-            return [self._to_entity(row) for row in result] if result else []
-            
-        except Exception as e:
-            self.logger.error(f"Failed to get users by signup date: {e}")
-            raise
+        return self._keyset_page(
+            ["created_at >= %(start_date)s", "created_at <= %(end_date)s"],
+            {'start_date': start_date, 'end_date': end_date},
+            limit,
+            after
+        )
     
     # User Profile Operations
     
@@ -24,64 +24,115 @@ CREATE TYPE event_category AS ENUM (
     'performance'
 );
 
--- System audit logs
+-- System audit logs, range-partitioned by month on timestamp.
+-- Columns follow what the application writes: AuditLogger and
+-- AuditLogRepository key events by audit_id, AuditRepository by id, and
+-- every audit query filters on timestamp.
 CREATE TABLE audit_logs (
-    log_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    audit_id UUID NOT NULL DEFAULT gen_random_uuid(), -- UUIDv7 from AuditLogger, so ids sort by time
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY, -- AuditRepository entry id
     
     -- Event identification
-    event_category event_category NOT NULL,
-    event_type VARCHAR(100) NOT NULL, -- Specific event within category
-    event_description TEXT NOT NULL,
+    event_type VARCHAR(100),
+    action VARCHAR(100),
+    action_type VARCHAR(50),
+    description TEXT,
+    details JSONB,
+    tags TEXT[] DEFAULT '{}',
     
     -- User and session context
     user_id UUID REFERENCES users(user_id),
+    username VARCHAR(100),
+    user_role VARCHAR(50),
     session_id UUID,
-    impersonated_user_id UUID REFERENCES users(user_id), -- For admin actions
+    request_id VARCHAR(100),
     
     -- Request context
     ip_address INET,
     user_agent TEXT,
-    request_method VARCHAR(10),
-    request_url TEXT,
-    request_headers JSONB,
     
     -- Data context
-    affected_table VARCHAR(100),
-    affected_record_id UUID,
+    resource_type VARCHAR(100),
+    resource_id VARCHAR(255),
     old_values JSONB,
     new_values JSONB,
+    changes JSONB,
     
-    -- Security context
-    authentication_method VARCHAR(50),
-    authorization_level VARCHAR(50),
-    permission_checked VARCHAR(100),
-    access_granted BOOLEAN,
-    
-    -- System context
-    application_version VARCHAR(50),
-    server_instance VARCHAR(100),
-    processing_time_ms INTEGER,
+    -- Outcome and severity
+    success BOOLEAN NOT NULL DEFAULT TRUE,
+    error_message TEXT,
+    severity VARCHAR(20) NOT NULL DEFAULT 'low',
+    level VARCHAR(20),
     
     -- Compliance and privacy
-    phi_accessed BOOLEAN DEFAULT FALSE, -- Protected Health Information
-    consent_verified BOOLEAN,
-    data_retention_rule VARCHAR(100),
-    
-    -- Severity and alerting
-    log_level log_level NOT NULL DEFAULT 'info',
-    requires_review BOOLEAN DEFAULT FALSE,
-    alert_sent BOOLEAN DEFAULT FALSE,
+    compliance_category VARCHAR(50),
+    retention_until TIMESTAMP WITH TIME ZONE,
+    is_sensitive BOOLEAN DEFAULT FALSE,
+    hipaa_relevant BOOLEAN DEFAULT FALSE,
+    pii_accessed BOOLEAN DEFAULT FALSE,
     
     -- Correlation
     correlation_id UUID, -- Groups related events
-    parent_event_id UUID REFERENCES audit_logs(log_id),
+    -- audit_id of the parent event. Not a foreign key: a partitioned table's
+    -- primary key must include the partition column, so the application is
+    -- responsible for pointing this at an existing event.
+    parent_event_id UUID,
     
     -- Metadata
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Constraints
-    CONSTRAINT chk_processing_time_positive CHECK (processing_time_ms IS NULL OR processing_time_ms >= 0)
-);
+    PRIMARY KEY (audit_id, timestamp),
+    CONSTRAINT chk_audit_severity CHECK (severity IN ('low', 'medium', 'high', 'critical'))
+) PARTITION BY RANGE (timestamp);
+
+-- Catches rows outside the monthly partitions created below
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+-- Create the monthly audit_logs partition containing month_start, if missing
+CREATE OR REPLACE FUNCTION create_audit_logs_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month_start)::DATE;
+    partition_name TEXT := 'audit_logs_' || to_char(range_start, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, (range_start + INTERVAL '1 month')::DATE
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop monthly partitions that end on or before cutoff; retention without a mass DELETE
+CREATE OR REPLACE FUNCTION drop_audit_logs_partitions_before(cutoff DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    partition_record RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR partition_record IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'audit_logs'
+          AND child.relname ~ '^audit_logs_[0-9]{4}_[0-9]{2}$'
+          AND (to_date(substring(child.relname from 12), 'YYYY_MM') + INTERVAL '1 month')::DATE <= cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition_record.relname);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for the current and next two months; schedule
+-- create_audit_logs_partition() monthly to stay ahead
+SELECT create_audit_logs_partition((CURRENT_DATE + make_interval(months => offset_months))::DATE)
+FROM generate_series(0, 2) AS offset_months;
 
 -- System configuration and settings
 CREATE TABLE system_configurations (
@@ -441,10 +492,9 @@ CREATE TABLE system_analytics (
 
 -- Indexes for performance
 CREATE INDEX idx_audit_logs_user_id ON audit_logs(user_id);
-CREATE INDEX idx_audit_logs_category ON audit_logs(event_category);
-CREATE INDEX idx_audit_logs_created_at ON audit_logs(created_at);
-CREATE INDEX idx_audit_logs_level ON audit_logs(log_level);
-CREATE INDEX idx_audit_logs_requires_review ON audit_logs(requires_review);
+CREATE INDEX idx_audit_logs_timestamp ON audit_logs USING BRIN (timestamp) WITH (pages_per_range = 32);
+CREATE INDEX idx_audit_logs_severity ON audit_logs(severity);
+CREATE INDEX idx_audit_logs_retention ON audit_logs(retention_until) WHERE retention_until IS NOT NULL;
 CREATE INDEX idx_system_configurations_key ON system_configurations(config_key);
 CREATE INDEX idx_system_configurations_category ON system_configurations(config_category);
 CREATE INDEX idx_system_configurations_active ON system_configurations(is_active);
@@ -212,7 +212,13 @@ CREATE INDEX IF NOT EXISTS idx_clinical_sessions_date ON clinical_sessions(sessi
 
 -- System administration indexes
 CREATE INDEX IF NOT EXISTS idx_audit_logs_user_action ON audit_logs(user_id, action);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp DESC);
+-- Time-range scans use the BRIN idx_audit_logs_timestamp from system_administration.sql
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_type_time ON audit_logs(user_id, event_type, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_type_time ON audit_logs(event_type, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_time ON audit_logs(user_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_resource_time ON audit_logs(resource_type, resource_id, timestamp DESC) WHERE resource_type IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_audit_logs_failed_login_user ON audit_logs(user_id, timestamp DESC) WHERE event_type = 'security_login_failed' AND success = false;
+CREATE INDEX IF NOT EXISTS idx_audit_logs_failed_login_ip ON audit_logs(ip_address, timestamp DESC) WHERE event_type = 'security_login_failed' AND success = false;
 CREATE INDEX IF NOT EXISTS idx_performance_metrics_timestamp ON performance_metrics(timestamp DESC);
 
 \echo '✅ Performance indexes created'
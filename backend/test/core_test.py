@@ -23,9 +23,10 @@ import pytest
 import asyncio
 import tempfile
 import json
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent.parent
@@ -161,6 +162,56 @@ class TestLogging:
         
         # Should not raise exceptions
         assert True
+        
+    def test_get_logger_cached(self):
+        """Test loggers are reused per name."""
+        assert get_logger(__name__) is get_logger(__name__)
+        assert get_logger(__name__) is not get_logger("other")
+        
+    def test_thread_buffer_renders_records_before_buffering(self):
+        """Test buffered records keep their logged message and drop args and exc_info."""
+        import logging
+        from happypath.core.logging import SecurityFilter, ThreadLocalBufferHandler
+        
+        records = []
+        target = logging.Handler()
+        target.emit = records.append
+        target.addFilter(SecurityFilter())
+        handler = ThreadLocalBufferHandler(target, flush_interval=60)
+        
+        items = ["a"]
+        handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, "items=%s auth=%s", (items, {"token": "abc"}), None))
+        items.append("b")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            handler.handle(logging.LogRecord("t", logging.ERROR, __file__, 2, "failed", None, sys.exc_info()))
+        handler.close()
+        
+        assert records[0].getMessage() == "items=['a'] auth={'token': '[REDACTED]'}"
+        assert records[0].args is None
+        assert records[1].exc_info is None
+        assert "ValueError: boom" in records[1].getMessage()
+        
+    def test_interned_log_rotates_and_keeps_arg_types(self):
+        """Test binary logs rotate into self-contained files and format args as logging would."""
+        import logging
+        from happypath.core.logging import InternedLogHandler, read_interned_log
+        
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_file = os.path.join(log_dir, "app.bin")
+            handler = InternedLogHandler(log_file, maxBytes=200, backupCount=2)
+            for i in range(10):
+                handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, "step %d of %s: %r", (i, "run", None), None))
+            handler.handle(logging.LogRecord("t", logging.INFO, __file__, 2, "state %s", ({"ok": True},), None))
+            handler.close()
+            
+            assert os.path.exists(log_file + ".1")
+            assert not os.path.exists(log_file + ".3")
+            messages = [entry["message"] for entry in read_interned_log(log_file)]
+            assert messages[-1] == "state {'ok': True}"
+            assert messages[-2] == "step 9 of run: None"
+            assert [entry["message"] for entry in read_interned_log(log_file + ".1")][0].startswith("step ")
 
 
 class TestSecurity:
@@ -177,6 +228,32 @@ class TestSecurity:
         assert security.verify_password(password, hashed) is True
         assert security.verify_password("wrong_password", hashed) is False
         
+    def test_pbkdf2_password_hashing(self):
+        """Test the pbkdf2 scheme round-trips and bcrypt hashes still verify."""
+        from happypath.core.security import SecurityManager
+        from happypath.core.config import SecurityConfig
+        
+        with patch('happypath.core.security.get_config') as mock_config:
+            mock_config.return_value.security = SecurityConfig(
+                secret_key="s" * 32,
+                jwt_secret="j" * 32,
+                password_hash_scheme="pbkdf2_sha256",
+                pbkdf2_iterations=1000
+            )
+            security = SecurityManager()
+        
+        hashed = security.hash_password("TestPassword123!")
+        scheme, iterations, salt, digest = hashed.split("$")
+        
+        assert (scheme, iterations) == ("pbkdf2_sha256", "1000")
+        assert security.hash_password("TestPassword123!") != hashed
+        assert security.verify_password("TestPassword123!", hashed) is True
+        assert security.verify_password("WrongPassword123!", hashed) is False
+        
+        import bcrypt
+        legacy = bcrypt.hashpw(b"TestPassword123!", bcrypt.gensalt(4)).decode('utf-8')
+        assert security.verify_password("TestPassword123!", legacy) is True
+        
     def test_jwt_tokens(self):
         """Test JWT token creation and verification."""
         security = get_security_manager()
@@ -286,6 +363,131 @@ class TestDatabase:
         assert "status" in health
         # Status might be unhealthy in test environment, which is expected
         assert health["status"] in ["healthy", "unhealthy", "degraded"]
+        
+    def test_execute_many_single_checkout(self):
+        """Test a batch of statements borrows one pooled connection."""
+        from happypath.core.database import DatabaseManager
+        
+        db = DatabaseManager()
+        db._initialized = True
+        db._pool = MagicMock()
+        db._pool.getconn.return_value.closed = 0
+        
+        with patch('happypath.core.database.execute_batch') as mock_execute_batch:
+            count = db.execute_many(
+                "UPDATE users SET is_active = %(active)s WHERE id = %(id)s",
+                [{"active": False, "id": 1}, {"active": False, "id": 2}]
+            )
+        
+        assert count == 2
+        db._pool.getconn.assert_called_once()
+        db._pool.putconn.assert_called_once()
+        assert len(mock_execute_batch.call_args[0][2]) == 2
+        
+    def test_execute_prepared_declares_types_and_unescapes_percent(self):
+        """Test PREPARE declares unambiguous parameter types and sends %% as a literal %."""
+        from happypath.core.database import DatabaseManager
+        
+        db = DatabaseManager()
+        db._initialized = True
+        db._pool = MagicMock()
+        conn = db._pool.getconn.return_value
+        conn.closed = 0
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        query = "SELECT * FROM users WHERE email LIKE '%%@example.com' AND created_at >= %(since)s AND username = %(name)s"
+        
+        db.execute_prepared(query, {"since": datetime(2024, 1, 1), "name": "alice"})
+        db.execute_prepared(query, {"since": datetime(2024, 2, 1), "name": "bob"})
+        
+        statements = [call[0][0] for call in cursor.execute.call_args_list if call[0][0].startswith("PREPARE")]
+        assert len(statements) == 1
+        assert "(timestamp, unknown) AS" in statements[0]
+        assert "LIKE '%@example.com'" in statements[0]
+        assert "created_at >= $1 AND username = $2" in statements[0]
+        
+    def test_async_pool_sized_separately(self):
+        """Test the asyncpg pool uses its own size and the per-process total counts both pools."""
+        from happypath.core.config import DatabaseConfig
+        from happypath.core.database import DatabaseManager
+        
+        db = DatabaseManager()
+        db.config = Mock()
+        db.config.database = DatabaseConfig(pool_size=20, min_pool_size=4, async_pool_size=6, async_min_pool_size=1)
+        
+        with patch('happypath.core.database.asyncpg.create_pool', new=AsyncMock()) as mock_create_pool:
+            asyncio.run(db._create_async_pool())
+        
+        assert mock_create_pool.call_args[1]["min_size"] == 1
+        assert mock_create_pool.call_args[1]["max_size"] == 6
+        assert db.config.database.max_connections_per_process == 27
+        assert db.execute_many("SELECT 1", []) == 0
+        
+    def test_after_commit_waits_for_transaction(self):
+        """Test after-commit callbacks run only once the transaction commits."""
+        from happypath.core.database import DatabaseManager
+        
+        db = DatabaseManager()
+        db._initialized = True
+        db._pool = MagicMock()
+        db._pool.getconn.return_value.closed = 0
+        calls = []
+        
+        with db.transaction():
+            db.after_commit(lambda: calls.append("committed"))
+            assert calls == []
+        assert calls == ["committed"]
+        
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.after_commit(lambda: calls.append("rolled back"))
+                raise ValueError("abort")
+        assert calls == ["committed"]
+        
+        db.after_commit(lambda: calls.append("immediate"))
+        assert calls == ["committed", "immediate"]
+        
+    def test_use_connection_pins_owned_connection(self):
+        """Test queries inside use_connection run on the given connection and commit there."""
+        from happypath.core.database import DatabaseManager
+        
+        db = DatabaseManager()
+        db._initialized = True
+        db._pool = MagicMock()
+        connection = MagicMock(closed=0)
+        
+        with db.use_connection(connection):
+            with db.get_connection() as conn:
+                assert conn is connection
+        connection.commit.assert_called_once()
+        
+        with pytest.raises(ValueError):
+            with db.use_connection(connection):
+                raise ValueError("abort")
+        connection.rollback.assert_called_once()
+        db._pool.getconn.assert_not_called()
+        
+    def test_pinned_connection_left_to_its_owner(self):
+        """Test batch helpers inside transaction() neither commit nor roll back the shared connection."""
+        from happypath.core.database import DatabaseManager, QueryError
+        
+        db = DatabaseManager()
+        db._initialized = True
+        db._pool = MagicMock()
+        conn = db._pool.getconn.return_value
+        conn.closed = 0
+        
+        with pytest.raises(QueryError):
+            with db.transaction():
+                db.execute_transaction([("UPDATE users SET is_active = false WHERE id = 1", None)])
+                with patch('happypath.core.database.execute_values'):
+                    assert db.execute_batch_insert("audit_logs", ["id"], [(1,), (2,)]) == 2
+                assert conn.commit.call_count == 0
+                with patch('happypath.core.database.execute_batch', side_effect=Exception("deadlock")):
+                    db.execute_many("UPDATE users SET is_active = false WHERE id = %(id)s", [{"id": 1}])
+                assert conn.rollback.call_count == 0
+        
+        conn.rollback.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -358,6 +560,43 @@ class TestCaching:
             session_data = cache.get_session(session_id)
             assert session_data["user_id"] == 123
             assert session_data["role"] == "user"
+            
+    def test_pipeline_incr_returns_counts_only(self):
+        """Test pipelined counters create missing keys with a TTL and return just the counts."""
+        from happypath.core.cache import CacheManager, CachePipeline
+        
+        with patch('happypath.core.cache.get_config'):
+            cache = CacheManager()
+        redis_pipeline = MagicMock()
+        redis_pipeline.execute.return_value = [True, 1, 4]
+        
+        pipeline = CachePipeline(cache, redis_pipeline)
+        pipeline.incr("user:1", ttl=60, namespace="failed_logins").incr("ip:1", namespace="failed_logins")
+        
+        assert pipeline.execute() == [1, 4]
+        assert redis_pipeline.set.call_args[1] == {"ex": 60, "nx": True}
+        assert redis_pipeline.incrby.call_count == 2
+    
+    def test_pipeline_window_union_count(self):
+        """Test sliding-window sets are trimmed, expired and counted as one union."""
+        from happypath.core.cache import CacheManager, CachePipeline
+        
+        with patch('happypath.core.cache.get_config'):
+            cache = CacheManager()
+        redis_pipeline = MagicMock()
+        redis_pipeline.execute.return_value = [1, 0, True, 1, 2, True, 3, 1]
+        
+        pipeline = CachePipeline(cache, redis_pipeline)
+        pipeline.window_add("user:1", "event-1", 3600, namespace="failed_logins")
+        pipeline.window_add("ip:1", "event-1", 3600, namespace="failed_logins")
+        pipeline.union_count("user:1", "ip:1", namespace="failed_logins")
+        
+        assert pipeline.execute() == [3]
+        assert redis_pipeline.zadd.call_count == 2
+        assert redis_pipeline.expire.call_args[0][1] == 3600
+        scratch_key, source_keys = redis_pipeline.zunionstore.call_args[0]
+        assert len(source_keys) == 2
+        redis_pipeline.unlink.assert_called_once_with(scratch_key)
 
 
 class TestAuditLogging:
@@ -427,6 +666,458 @@ class TestAuditLogging:
         assert hasattr(AuditSeverity, 'MEDIUM')
         assert hasattr(AuditSeverity, 'HIGH')
         assert hasattr(AuditSeverity, 'CRITICAL')
+        
+    def test_log_event_queues_write(self):
+        """Test log_event returns before the background writer stores the event."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig(flush_interval_ms=10)
+            audit = AuditLogger()
+            
+            event_id = audit.log_event(
+                event_type=AuditEventType.USER_LOGIN,
+                user_id="12345",
+                severity=AuditSeverity.LOW
+            )
+            audit.flush()
+            
+            assert event_id is not None
+            query, row = mock_db_manager.return_value.execute_prepared.call_args[0]
+            assert query.startswith("INSERT INTO audit_logs")
+            assert row[0] == event_id
+            
+            audit.close()
+            assert not audit._writer.is_alive()
+    
+    def test_writer_batches_queued_events(self):
+        """Test queued events are coalesced into multi-row inserts of at most max_rows."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig(max_rows=4, flush_interval_ms=50)
+            audit = AuditLogger()
+            
+            event_ids = [
+                audit.log_event(event_type=AuditEventType.DATA_READ, user_id=str(index))
+                for index in range(10)
+            ]
+            audit.close()
+            
+            batches = [
+                call[0][2] for call in mock_db_manager.return_value.execute_batch_insert.call_args_list
+            ]
+            assert all(len(batch) <= 4 for batch in batches)
+            assert [row[0] for batch in batches for row in batch] == event_ids
+            assert len(batches) < len(event_ids)
+    
+    def test_large_batches_use_copy(self):
+        """Test batches over the bulk copy threshold are loaded with COPY."""
+        from happypath.core.auditing import AuditLogger, AUDIT_LOG_COLUMNS
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig(bulk_copy_threshold=3)
+            db_manager = mock_db_manager.return_value
+            copied = []
+            db_manager.copy_records.side_effect = lambda table, columns, rows: copied.extend(rows)
+            audit = AuditLogger()
+            
+            audit.log_events_batch([
+                {"event_type": AuditEventType.DATA_READ, "user_id": str(index), "details": {"n": index}}
+                for index in range(3)
+            ])
+            audit.log_events_batch([{"event_type": AuditEventType.DATA_READ}] * 2)
+            audit.close()
+            
+            assert db_manager.copy_records.call_args[0][:2] == ("audit_logs", AUDIT_LOG_COLUMNS)
+            assert [row[AUDIT_LOG_COLUMNS.index("details")] for row in copied] == [
+                '{"n":0}', '{"n":1}', '{"n":2}'
+            ]
+            db_manager.execute_batch_insert.assert_called_once()
+    
+    def test_log_events_batch_rejects_invalid_event(self):
+        """Test a batch with an invalid event raises AuditError and stores nothing."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig()
+            db_manager = mock_db_manager.return_value
+            audit = AuditLogger()
+            
+            with pytest.raises(AuditError, match="Invalid audit event"):
+                audit.log_events_batch([
+                    {"event_type": AuditEventType.DATA_READ},
+                    {"event_type": AuditEventType.DATA_READ, "unknown_field": 1}
+                ])
+            assert audit.log_events_batch([]) == []
+            audit.close()
+        
+        db_manager.execute_prepared.assert_not_called()
+        db_manager.execute_batch_insert.assert_not_called()
+    
+    def test_event_row_snapshots_payload(self):
+        """Test payloads are encoded when logged, not when the writer runs."""
+        from happypath.core.auditing import AuditLogger, AUDIT_LOG_COLUMNS
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager'):
+            mock_config.return_value.audit = AuditConfig()
+            audit = AuditLogger()
+            details = {"changed_at": datetime(2024, 1, 1, 9, 30)}
+            
+            event = audit._build_event(event_type=AuditEventType.DATA_UPDATE, details=details)
+            details["changed_at"] = None
+            audit.close()
+        
+        assert len(event.row) == len(AUDIT_LOG_COLUMNS)
+        assert event.row[AUDIT_LOG_COLUMNS.index("event_type")] == "data_update"
+        assert event.row[AUDIT_LOG_COLUMNS.index("details")] == '{"changed_at":"2024-01-01T09:30:00"}'
+        assert event.row[AUDIT_LOG_COLUMNS.index("old_values")] is None
+    
+    def test_single_event_uses_prepared_insert(self):
+        """Test lone events reuse the prepared insert instead of a multi-row statement."""
+        from happypath.core.auditing import AuditLogger, AUDIT_LOG_COLUMNS, _AUDIT_INSERT
+        from happypath.core.config import AuditConfig
+        from happypath.core.database import _to_positional
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig()
+            db_manager = mock_db_manager.return_value
+            audit = AuditLogger()
+            
+            event_ids = audit.log_events_batch([{"event_type": AuditEventType.DATA_READ}])
+            audit.close()
+        
+        db_manager.execute_batch_insert.assert_not_called()
+        db_manager.execute_prepared.assert_called_once()
+        assert db_manager.execute_prepared.call_args[0][1][0] == event_ids[0]
+        assert _to_positional(_AUDIT_INSERT)[1] == tuple(AUDIT_LOG_COLUMNS)
+    
+    def test_gdpr_report_counts_in_sql(self):
+        """Test the GDPR summary comes from one aggregate query without fetching rows."""
+        from happypath.core.auditing import ComplianceTracker
+        
+        audit_logger = Mock()
+        counts = {
+            "total_events": 12, "data_access_events": 7,
+            "consent_events": 2, "privacy_rights_events": 1
+        }
+        
+        with patch('happypath.core.auditing.execute_query', return_value=counts) as mock_query:
+            report = ComplianceTracker(audit_logger).generate_gdpr_report("12345", include_events=False)
+        
+        assert report["summary"] == counts
+        assert "FILTER (WHERE event_type = ANY(%(consent)s))" in mock_query.call_args[0][0]
+        assert "privacy_consent_given" in mock_query.call_args[0][1]["consent"]
+        audit_logger.get_audit_trail.assert_not_called()
+    
+    def test_security_report_aggregates_in_sql(self):
+        """Test the security report is built from one aggregate row."""
+        from happypath.core.auditing import SecurityAuditor
+        
+        audit_logger = Mock()
+        row = {
+            "total_security_events": 9,
+            "unique_ip_addresses": 3,
+            "users_with_failed_logins": 2,
+            "event_counts": {"security_login_failed": 8, "security_account_locked": 1},
+            "top_failed_login_users": [["user-1", 6], ["user-2", 2]]
+        }
+        
+        with patch('happypath.core.auditing.execute_query', return_value=row) as mock_query:
+            report = SecurityAuditor(audit_logger).generate_security_report(days=1)
+        
+        assert report["summary"]["total_security_events"] == 9
+        assert report["event_counts"]["security_login_failed"] == 8
+        assert report["top_failed_login_users"] == [("user-1", 6), ("user-2", 2)]
+        assert mock_query.call_args[1]["fetch_one"] is True
+        audit_logger.get_audit_trail.assert_not_called()
+    
+    def test_failed_login_pattern_avoids_or(self):
+        """Test failed logins are counted per key so each side can use its index."""
+        from happypath.core.auditing import SecurityAuditor
+        
+        audit_logger = Mock()
+        
+        with patch('happypath.core.auditing.get_cache_manager', side_effect=Exception("no redis")), \
+             patch('happypath.core.auditing.execute_query', return_value={"failed_count": 5}) as mock_query:
+            SecurityAuditor(audit_logger)._check_failed_login_pattern("12345", "10.0.0.1")
+        
+        query = mock_query.call_args[0][0]
+        assert " OR " not in query
+        assert "(user_id = %(user_id)s) IS NOT TRUE" in query
+        assert audit_logger.log_event.call_args[1]["event_type"] == AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY
+    
+    def test_failed_logins_query_until_local_count_reaches_threshold(self):
+        """Test the shared count runs on every failure until this process alone reaches the threshold."""
+        from happypath.core.auditing import SecurityAuditor
+        
+        audit_logger = Mock()
+        auditor = SecurityAuditor(audit_logger)
+        auditor.failed_login_threshold = 2
+        
+        with patch('happypath.core.auditing.get_cache_manager', side_effect=Exception("no redis")), \
+             patch('happypath.core.auditing.execute_query', return_value={"failed_count": 0}) as mock_query:
+            auditor.track_login_attempt("12345", "10.0.0.1", "test-agent", success=False)
+            assert mock_query.call_count == 1
+            assert audit_logger.log_event.call_args[1]["wait_timeout"] == auditor.failed_login_write_timeout
+            
+            auditor.track_login_attempt("12345", "10.0.0.1", "test-agent", success=False)
+        
+        assert mock_query.call_count == 1
+        alert = audit_logger.log_event.call_args[1]
+        assert alert["event_type"] == AuditEventType.SECURITY_SUSPICIOUS_ACTIVITY
+        assert alert["details"]["failed_attempts"] == 2
+        
+        auditor.suspicious_activity_window = 0
+        assert auditor._record_failure("67890", "10.0.0.2") == 1
+        assert ("user", "12345") not in auditor._recent_failures
+    
+    def test_failed_logins_counted_in_redis(self):
+        """Test Redis windows count failures for the user or IP, like the database query."""
+        from happypath.core.auditing import SecurityAuditor
+        
+        audit_logger = Mock()
+        audit_logger.log_event.side_effect = ["event-1", "event-2", None]
+        cache_manager = MagicMock()
+        pipeline = cache_manager.pipeline.return_value.__enter__.return_value
+        pipeline.execute.side_effect = [[4], [5]]
+        
+        with patch('happypath.core.auditing.get_cache_manager', return_value=cache_manager), \
+             patch('happypath.core.auditing.execute_query') as mock_query:
+            auditor = SecurityAuditor(audit_logger)
+            auditor.track_login_attempt("12345", "10.0.0.1", "test-agent", success=False)
+            assert audit_logger.log_event.call_count == 1
+            
+            auditor.track_login_attempt("12345", "10.0.0.1", "test-agent", success=False)
+        
+        mock_query.assert_not_called()
+        pipeline.window_add.assert_any_call("user:12345", "event-2", 3600, namespace="failed_logins")
+        pipeline.window_add.assert_any_call("ip:10.0.0.1", "event-2", 3600, namespace="failed_logins")
+        pipeline.union_count.assert_called_with("user:12345", "ip:10.0.0.1", namespace="failed_logins")
+        assert audit_logger.log_event.call_args[1]["details"]["failed_attempts"] == 5
+    
+    def test_failure_cache_retried_after_interval(self):
+        """Test an unavailable Redis is retried after the retry interval, not never."""
+        from happypath.core.auditing import SecurityAuditor
+        
+        cache_manager = MagicMock()
+        auditor = SecurityAuditor(Mock())
+        
+        with patch('happypath.core.auditing.get_cache_manager',
+                   side_effect=[Exception("no redis"), cache_manager]) as mock_get:
+            assert auditor._get_failure_cache() is None
+            assert auditor._get_failure_cache() is None
+            assert mock_get.call_count == 1
+            
+            auditor._failure_cache_retry_at = time.monotonic() - 1
+            assert auditor._get_failure_cache() is cache_manager
+        
+        cache_manager.pipeline.side_effect = Exception("connection lost")
+        assert auditor._count_failures_in_cache("12345", "10.0.0.1", "event-1") is None
+        assert auditor._failure_cache is None
+    
+    def test_event_handlers_dispatch_only_when_registered(self):
+        """Test handler dispatch is skipped until a handler is registered."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager'):
+            mock_config.return_value.audit = AuditConfig()
+            audit = AuditLogger()
+            handled = []
+            
+            with patch.object(audit, '_call_event_handlers') as mock_dispatch:
+                audit.log_events_batch([{"event_type": AuditEventType.DATA_READ}])
+                mock_dispatch.assert_not_called()
+            
+            audit.register_event_handler(AuditEventType.DATA_READ, handled.append)
+            event_ids = audit.log_events_batch([
+                {"event_type": AuditEventType.DATA_READ},
+                {"event_type": AuditEventType.DATA_WRITE}
+            ])
+            audit.close()
+        
+        assert [event.event_id for event in handled] == event_ids[:1]
+    
+    def test_event_log_goes_through_queue_listener(self):
+        """Test audit log lines reach the root handlers via the shared queue listener."""
+        import logging
+        from happypath.core import logging as core_logging
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager'):
+            mock_config.return_value.audit = AuditConfig()
+            core_logging._restart_queue_listener([handler])
+            try:
+                audit = AuditLogger()
+                second = AuditLogger()
+                
+                event_ids = audit.log_events_batch([{"event_type": AuditEventType.DATA_READ, "severity": AuditSeverity.HIGH}])
+                audit.close()
+                second.close()
+            finally:
+                core_logging._stop_queue_listener()
+        
+        assert audit._event_log.propagate
+        assert records[0].getMessage() == "Audit Event: data_read - Data accessed"
+        assert records[0].extra_data["audit_event_id"] == event_ids[0]
+    
+    def test_close_with_full_queue_and_failing_writes(self):
+        """Test close() does not deadlock with a writer recording failures while the queue is full."""
+        import threading
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        writing = threading.Event()
+        release = threading.Event()
+        
+        def failing_store(events):
+            writing.set()
+            release.wait(5)
+            raise Exception("db down")
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager'):
+            mock_config.return_value.audit = AuditConfig(queue_size=1)
+            audit = AuditLogger()
+            audit._store_audit_events = failing_store
+            audit._store_audit_event = Mock(side_effect=Exception("db down"))
+            
+            audit.log_event(event_type=AuditEventType.DATA_READ)
+            assert writing.wait(5)
+            audit.log_event(event_type=AuditEventType.DATA_READ)
+            
+            closer = threading.Thread(target=audit.close, daemon=True)
+            closer.start()
+            time.sleep(0.1)
+            release.set()
+            closer.join(5)
+        
+        assert not closer.is_alive()
+        assert audit._failed_writes == 2
+    
+    def test_writer_uses_dedicated_connection_with_backoff(self):
+        """Test the writer owns a connection, backs off after connect failures, and closes it."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        from happypath.core.exceptions import ConnectionError
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig(synchronous_commit=False)
+            db_manager = mock_db_manager.return_value
+            connection = Mock(closed=False)
+            db_manager.create_connection.side_effect = [ConnectionError("down"), connection]
+            audit = AuditLogger()
+            
+            assert audit._get_writer_connection() is None
+            assert audit._get_writer_connection() is None
+            assert db_manager.create_connection.call_count == 1
+            assert audit._writer_backoff == 0.5
+            
+            audit._writer_retry_at = 0.0
+            assert audit._get_writer_connection() is connection
+            assert audit._writer_backoff == 0.0
+            
+            audit.log_event(event_type=AuditEventType.DATA_READ)
+            audit.close()
+        
+        db_manager.create_connection.assert_called_with(options="-c synchronous_commit=off")
+        db_manager.use_connection.assert_called_with(connection)
+        connection.close.assert_called_once()
+    
+    def test_low_severity_events_skip_filtered_logging(self):
+        """Test LOW events log at DEBUG and are not built when DEBUG is filtered."""
+        import logging
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager'):
+            mock_config.return_value.audit = AuditConfig()
+            audit = AuditLogger()
+            audit._event_log = Mock()
+            audit._event_log.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+            
+            audit.log_events_batch([{"event_type": AuditEventType.DATA_READ, "severity": AuditSeverity.LOW}])
+            audit._event_log.log.assert_not_called()
+            
+            audit.log_events_batch([{"event_type": AuditEventType.DATA_READ, "severity": AuditSeverity.HIGH}])
+            audit.close()
+        
+        assert audit._get_log_level(AuditSeverity.LOW) == logging.DEBUG
+        assert audit._event_log.log.call_args[0][:2] == (logging.ERROR, "Audit Event: %s - %s")
+    
+    def test_log_event_after_close_writes_inline(self):
+        """Test events logged after close are written inline and flush does not hang."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager, \
+             patch('happypath.core.auditing.atexit') as mock_atexit:
+            mock_config.return_value.audit = AuditConfig()
+            audit = AuditLogger()
+            mock_atexit.register.assert_called_once_with(audit.close)
+            
+            audit.close()
+            audit.close()
+            event_id = audit.log_event(event_type=AuditEventType.DATA_READ)
+            audit.flush()
+        
+        mock_atexit.unregister.assert_called_once_with(audit.close)
+        assert mock_db_manager.return_value.execute_prepared.call_args[0][1][0] == event_id
+    
+    def test_wait_timeout_surfaces_write_failure(self):
+        """Test waiting on an event raises AuditError when it fails to store, as does flush."""
+        from happypath.core.auditing import AuditLogger
+        from happypath.core.config import AuditConfig
+        
+        with patch('happypath.core.auditing.get_config') as mock_config, \
+             patch('happypath.core.auditing.get_db_manager') as mock_db_manager:
+            mock_config.return_value.audit = AuditConfig(flush_interval_ms=10)
+            mock_db_manager.return_value.execute_prepared.side_effect = Exception("db down")
+            audit = AuditLogger()
+            
+            with pytest.raises(AuditError):
+                audit.log_event(event_type=AuditEventType.SECURITY_LOGIN_FAILED, wait_timeout=5)
+            
+            audit.log_event(event_type=AuditEventType.DATA_READ)
+            with pytest.raises(AuditError):
+                audit.flush()
+            audit.flush()
+            audit.close()
+    
+    def test_event_ids_are_time_ordered_uuid7(self):
+        """Test event IDs are version 7 UUIDs that sort in creation order."""
+        import uuid
+        from happypath.core.auditing import _UUID7Generator
+        
+        generate = _UUID7Generator(pool_size=32)
+        event_ids = [generate() for _ in range(100)]
+        
+        assert event_ids == sorted(event_ids)
+        assert len(set(event_ids)) == 100
+        assert all(uuid.UUID(event_id).version == 7 for event_id in event_ids)
+        assert all(uuid.UUID(event_id).variant == uuid.RFC_4122 for event_id in event_ids)
 
 
 class TestEventHandler(EventHandler):
@@ -502,6 +1193,26 @@ class TestEventSystem:
         # Check that events were processed
         assert len(handler.events_received) >= 0  # Events might be processed asynchronously
         
+    def test_process_pending_events_in_batches(self):
+        """Test queued events are dispatched in order and stored once per batch."""
+        from happypath.core.events import EventManager
+        
+        with patch('happypath.core.events.get_config'), \
+             patch('happypath.core.events.get_cache_manager'):
+            events = EventManager()
+        events._store_events = AsyncMock()
+        received = []
+        events.register_handler(EventType.USER_LOGIN, lambda event: received.append(event.data["n"]))
+        
+        for n in range(3):
+            events.enqueue("user_login", {"n": n}, source="test")
+        assert events.pending_count == 3
+        
+        assert asyncio.run(events.process_pending_events(batch_size=2)) == 3
+        assert received == [0, 1, 2]
+        assert events._store_events.await_count == 2
+        assert asyncio.run(events.process_pending_events()) == 0
+        
     def test_event_types(self):
         """Test event types are available."""
         assert hasattr(EventType, 'USER_REGISTERED')
@@ -551,6 +1262,45 @@ class TestMonitoring:
             # System metrics might not be available in all test environments
             pytest.skip("System metrics not available in test environment")
             
+    def test_proc_metrics_parsing(self):
+        """Test system metrics are parsed from /proc with CPU measured between snapshots."""
+        import io
+        from happypath.core.monitoring import MetricsCollector
+        
+        stats = iter([
+            "cpu  100 0 100 700 100 0 0 0 0 0\n",
+            "cpu  150 0 150 750 150 0 0 0 0 0\n"
+        ])
+        proc_files = {
+            "/proc/meminfo": "MemTotal:        8000000 kB\nMemFree:  1000 kB\nMemAvailable:    2000000 kB\n",
+            "/proc/net/dev": (
+                "Inter-|   Receive\n"
+                " face |bytes    packets\n"
+                "    lo: 1048576 10 0 0 0 0 0 0 2097152 10 0 0 0 0 0 0\n"
+                "  eth0: 1048576 10 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+            )
+        }
+        
+        def fake_open(path, *args, **kwargs):
+            return io.StringIO(next(stats) if path == "/proc/stat" else proc_files[path])
+        
+        disk = Mock(f_bavail=25, f_bfree=25, f_blocks=100, f_frsize=1024 ** 3)
+        collector = MetricsCollector()
+        with patch('builtins.open', side_effect=fake_open), \
+             patch('happypath.core.monitoring.os.statvfs', return_value=disk), \
+             patch('happypath.core.monitoring.os.getloadavg', return_value=(0.5, 0.25, 0.1)):
+            first = collector._collect_proc_metrics()
+            second = collector._collect_proc_metrics()
+        
+        assert first.cpu_percent == 20.0
+        assert second.cpu_percent == 50.0
+        assert second.memory_percent == 75.0
+        assert second.memory_available_mb == 2000000 / 1024
+        assert second.disk_percent == 75.0
+        assert second.network_recv_mb == 2.0
+        assert second.network_sent_mb == 2.0
+        assert second.load_average == [0.5, 0.25, 0.1]
+        
     def test_application_metrics_collection(self):
         """Test application metrics collection."""
         metrics = get_metrics_collector()
@@ -613,6 +1363,32 @@ class TestErrorHandling:
 class TestIntegration:
     """Integration tests for multiple components."""
     
+    def test_core_components_load_lazily(self):
+        """Test importing happypath.core defers its submodules until a component is used."""
+        import subprocess
+        
+        script = (
+            "import sys, happypath.core as core\n"
+            "assert 'happypath.core.auditing' not in sys.modules\n"
+            "assert 'get_audit_logger' in dir(core)\n"
+            "loader = core.get_audit_logger\n"
+            "assert 'happypath.core.auditing' in sys.modules\n"
+            "assert core.__dict__['get_audit_logger'] is loader\n"
+            "try:\n"
+            "    core.not_a_component\n"
+            "except AttributeError:\n"
+            "    print('lazy')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=str(Path(__file__).resolve().parent.parent),
+            capture_output=True,
+            text=True
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "lazy"
+    
     def test_full_user_workflow(self):
         """Test a complete user workflow using multiple components."""
         # Initialize components
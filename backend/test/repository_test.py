@@ -9,8 +9,11 @@ import pytest
 import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
 import logging
+import time
+import json
+from types import MappingProxyType
 
 # Import repository classes and entities
 from backend.happypath.repository import (
@@ -32,8 +35,11 @@ from backend.happypath.repository import (
     SubscriptionPlanRepository, SubscriptionRepository,
     
     # Factory functions
-    create_user_repository, create_audit_repository
+    create_user_repository, create_audit_repository,
+    create_subscription_repository, create_subscription_plan_repository,
+    set_repository_context, clear_repository_context, unit_of_work
 )
+from backend.happypath.core.events import EventType
 
 
 class TestBaseRepository:
@@ -126,6 +132,28 @@ class TestBaseRepository:
         assert "SELECT * FROM test_entities WHERE id" in call_args[0][0]
         assert call_args[1]['id'] == 1
     
+    def test_get_by_id_uses_identity_map(self):
+        """Test repeated lookups inside a unit of work hit the database once and return copies."""
+        self.mock_db.execute_query.return_value = [{'id': 1, 'name': 'Test Entity', 'value': 42}]
+        
+        with unit_of_work():
+            first = self.repository.get_by_id(1)
+            first.name = "Changed"
+            second = self.repository.get_by_id(1)
+        
+        assert first is not second
+        assert second.name == "Test Entity"
+        self.mock_db.execute_query.assert_called_once()
+    
+    def test_get_by_id_without_unit_of_work_reads_database(self):
+        """Test lookups outside a unit of work always read the database."""
+        self.mock_db.execute_query.return_value = [{'id': 1, 'name': 'Test Entity', 'value': 42}]
+        
+        self.repository.get_by_id(1)
+        self.repository.get_by_id(1)
+        
+        assert self.mock_db.execute_query.call_count == 2
+    
     def test_get_by_id_not_found(self):
         """Test getting non-existent entity."""
         self.mock_db.execute_query.return_value = []
@@ -145,8 +173,6 @@ class TestBaseRepository:
     
     def test_update_entity(self):
         """Test entity update."""
-        # Mock existing entity check
-        existing_row = {'id': 1, 'name': 'Old Name', 'value': 10}
         updated_row = {
             'id': 1, 
             'name': 'Updated Name', 
@@ -154,9 +180,9 @@ class TestBaseRepository:
             'updated_at': datetime.utcnow()
         }
         
+        # UPDATE ... RETURNING doubles as the existence check
         self.mock_db.execute_query.side_effect = [
-            [existing_row],  # get_by_id call
-            [updated_row]    # update call
+            [updated_row]
         ]
         
         entity = self.TestEntity(id=1, name="Updated Name", value=20)
@@ -166,8 +192,8 @@ class TestBaseRepository:
         assert result.name == "Updated Name"
         assert result.value == 20
         
-        # Verify two database calls (check + update)
-        assert self.mock_db.execute_query.call_count == 2
+        # One round-trip: the UPDATE itself reports a missing row
+        assert self.mock_db.execute_query.call_count == 1
     
     def test_update_not_found(self):
         """Test updating non-existent entity."""
@@ -204,15 +230,11 @@ class TestBaseRepository:
     def test_list_all_with_filters(self):
         """Test listing entities with filters."""
         rows = [
-            {'id': 1, 'name': 'Entity 1', 'value': 10},
-            {'id': 2, 'name': 'Entity 2', 'value': 20}
+            {'id': 1, 'name': 'Entity 1', 'value': 10, '__total': 2},
+            {'id': 2, 'name': 'Entity 2', 'value': 20, '__total': 2}
         ]
-        count_row = {'count': 2}
         
-        self.mock_db.execute_query.side_effect = [
-            [count_row],  # count query
-            rows          # main query
-        ]
+        self.mock_db.execute_query.return_value = rows
         
         options = QueryOptions(
             filters={'value': 10},
@@ -225,6 +247,110 @@ class TestBaseRepository:
         assert len(result.data) == 2
         assert result.total_count == 2
         assert result.data[0].name == "Entity 1"
+        
+        # The total comes from a window count on the same statement
+        self.mock_db.execute_query.assert_called_once()
+        assert "COUNT(*) OVER() AS __total" in self.mock_db.execute_query.call_args[0][0]
+    
+    def test_list_all_count_past_last_page(self):
+        """Test an empty page falls back to the COUNT query for the total."""
+        self.mock_db.execute_query.side_effect = [
+            [],              # main query
+            [{'count': 3}]   # count query
+        ]
+        
+        options = QueryOptions(limit=10, offset=20, include_count=True)
+        result = self.repository.list_all(options)
+        
+        assert result.data == []
+        assert result.total_count == 3
+        assert result.has_next is False
+        assert "SELECT COUNT(*) as count" in self.mock_db.execute_query.call_args[0][0]
+    
+    def test_estimated_count(self):
+        """Test row estimates come from pg_class and fall back when unanalyzed."""
+        self.mock_db.execute_query.return_value = [{'estimate': 1500}]
+        
+        assert self.repository.estimated_count() == 1500
+        assert "pg_class" in self.mock_db.execute_query.call_args[0][0]
+        
+        self.mock_db.execute_query.side_effect = [[{'estimate': -1}], [{'count': 4}]]
+        
+        assert self.repository.estimated_count() == 4
+    
+    def test_list_all_reuses_sql_per_shape(self):
+        """Test that list_all generates SQL once per filter shape."""
+        self.mock_db.execute_query.return_value = []
+        self.mock_db.execute_prepared.return_value = []
+        
+        self.repository.list_all(QueryOptions(filters={'value': 10}, limit=5))
+        self.repository.list_all(QueryOptions(filters={'value': 20}, limit=5, prepared=True))
+        
+        assert len(self.repository._list_sql_cache) == 1
+        query, params = self.mock_db.execute_prepared.call_args[0]
+        assert query == self.mock_db.execute_query.call_args[0][0]
+        assert params == {'filter_value': 20, 'limit': 5}
+        
+    def test_stream_all_yields_entities(self):
+        """Test streaming entities through a server-side cursor."""
+        self.mock_db.stream_query.return_value = iter([
+            {'id': 1, 'name': 'Entity 1', 'value': 10},
+            {'id': 2, 'name': 'Entity 2', 'value': 20}
+        ])
+        
+        entities = list(self.repository.stream_all(QueryOptions(filters={'value': 10}), batch_size=50))
+        
+        assert [entity.id for entity in entities] == [1, 2]
+        query, params = self.mock_db.stream_query.call_args[0]
+        assert query.startswith("SELECT * FROM test_entities WHERE value")
+        assert params == {'filter_value': 10}
+        assert self.mock_db.stream_query.call_args[1] == {'batch_size': 50}
+    
+    def test_get_many_single_array_query(self):
+        """Test get_many fetches uncached IDs with one ANY(array) query."""
+        self.mock_db.execute_query.return_value = [
+            {'id': 2, 'name': 'Entity 2', 'value': 20},
+            {'id': 3, 'name': 'Entity 3', 'value': 30}
+        ]
+        
+        with unit_of_work():
+            self.repository._remember(self.repository._to_entity({'id': 1, 'name': 'Cached', 'value': 1}))
+            entities = self.repository.get_many([1, 2, 3, 2, 4])
+        
+        assert sorted(entities) == [1, 2, 3]
+        assert entities[1].name == 'Cached'
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert query == "SELECT * FROM test_entities WHERE id = ANY(%(ids)s)"
+        assert params == {'ids': [2, 3, 4]}
+        
+    def test_list_filter_uses_array_parameter(self):
+        """Test list filters share one statement regardless of list length."""
+        self.mock_db.execute_query.return_value = []
+        
+        self.repository.list_all(QueryOptions(filters={'value': [1, 2]}))
+        self.repository.list_all(QueryOptions(filters={'value': [1, 2, 3]}))
+        
+        assert len(self.repository._list_sql_cache) == 1
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert "value = ANY(%(filter_value)s)" in query
+        assert params == {'filter_value': [1, 2, 3]}
+    
+    def test_list_all_shared_frozen_options(self):
+        """Test a module-level frozen QueryOptions reuses one statement."""
+        self.mock_db.execute_query.return_value = []
+        options = QueryOptions(
+            filters=MappingProxyType({'name': 'test'}),
+            order_by=('name',),
+            limit=10
+        )
+        
+        self.repository.list_all(options)
+        self.repository.list_all(options)
+        
+        assert len(self.repository._list_sql_cache) == 1
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert "ORDER BY name" in query
+        assert params == {'filter_name': 'test', 'limit': 10}
     
     def test_exists(self):
         """Test entity existence check."""
@@ -260,6 +386,44 @@ class TestBaseRepository:
         
         assert len(result) == 1
         assert result[0].name == "Test"
+    
+    def test_bulk_create_single_statement_per_batch(self):
+        """Test bulk creation issues one multi-row INSERT per batch."""
+        self.mock_db.execute_query.side_effect = [
+            [{'id': 1, 'name': 'A', 'value': 1}, {'id': 2, 'name': 'B', 'value': 2}],
+            [{'id': 3, 'name': 'C', 'value': 3}]
+        ]
+        entities = [
+            self.TestEntity(name="A", value=1),
+            self.TestEntity(name="B", value=2),
+            self.TestEntity(name="C", value=3)
+        ]
+        
+        result = self.repository.bulk_create(entities, batch_size=2)
+        
+        assert [entity.id for entity in result] == [1, 2, 3]
+        assert self.mock_db.execute_query.call_count == 2
+        query, params = self.mock_db.execute_query.call_args_list[0][0]
+        assert "INSERT INTO test_entities" in query
+        assert params['name_0'] == "A"
+        assert params['name_1'] == "B"
+    
+    def test_acreate_uses_async_pool(self):
+        """Test async creation goes through the asyncpg query path."""
+        self.mock_db.run_blocking = AsyncMock(side_effect=lambda func, *args: func(*args))
+        self.mock_db.execute_async_query = AsyncMock(
+            return_value=[{'id': 7, 'name': 'Async', 'value': 1}]
+        )
+        
+        result = asyncio.run(self.repository.acreate(self.TestEntity(name="Async", value=1)))
+        
+        assert result.id == 7
+        query, values = self.mock_db.execute_async_query.call_args[0]
+        assert "VALUES ($1, $2, $3, $4)" in query
+        assert values[:2] == ["Async", 1]
+        # Validation runs off the event loop, and the create is logged like create()
+        assert self.mock_db.run_blocking.call_args[0][0] == self.repository._prepare_insert_data
+        self.mock_logger.info.assert_called_once()
 
 
 class TestUserRepository:
@@ -391,6 +555,92 @@ class TestUserRepository:
         
         assert "Current password is incorrect" in str(exc_info.value)
     
+    def test_update_publishes_change_after_commit(self):
+        """Test user updates publish a change event only once committed."""
+        user_row = {'id': 1, 'email': 'test@example.com', 'username': 'testuser', 'is_premium': False}
+        self.mock_db.execute_query.side_effect = [
+            [user_row],                          # get user
+            [{**user_row, 'is_premium': True}]   # update user
+        ]
+        callbacks = []
+        self.mock_db.after_commit.side_effect = callbacks.append
+        event_manager = Mock()
+        self.user_repo.event_manager = event_manager
+        
+        self.user_repo.upgrade_to_premium(1)
+        event_manager.enqueue.assert_not_called()
+        
+        callbacks[0]()
+        
+        event_type, data = event_manager.enqueue.call_args[0]
+        assert EventType(event_type) == EventType.USER_PROFILE_UPDATED
+        assert data == {"user_id": 1}
+        assert event_manager.enqueue.call_args[1]['user_id'] == "1"
+    
+    def test_update_without_event_manager_publishes_nothing(self):
+        """Test repositories without an injected event manager skip change events."""
+        user_row = {'id': 1, 'email': 'test@example.com', 'username': 'testuser', 'is_premium': False}
+        self.mock_db.execute_query.side_effect = [[user_row], [{**user_row, 'is_premium': True}]]
+        
+        self.user_repo.upgrade_to_premium(1)
+        
+        self.mock_db.after_commit.assert_not_called()
+    
+    def test_premium_users_memoize_ids_only(self):
+        """Test premium user reads cache only IDs, under a per-database namespace."""
+        stored = {}
+        query_cache = Mock()
+        query_cache.get.side_effect = lambda key, namespace, default: stored.get((namespace, key), default)
+        query_cache.set.side_effect = lambda key, value, ttl, namespace: stored.__setitem__((namespace, key), value)
+        self.mock_db.cache_namespace = "db-a:5432/happypath"
+        
+        set_repository_context(self.mock_db, self.mock_logger, query_cache=query_cache)
+        try:
+            user_repo = UserRepository(None)
+        finally:
+            clear_repository_context()
+        
+        self.mock_db.execute_query.side_effect = [
+            [{'id': 2}, {'id': 1}],
+            [{'id': 1, 'email': 'a@example.com', 'password_hash': 'secret'},
+             {'id': 2, 'email': 'b@example.com', 'password_hash': 'secret'}],
+            [{'id': 1, 'email': 'a@example.com', 'password_hash': 'secret'},
+             {'id': 2, 'email': 'b@example.com', 'password_hash': 'secret'}]
+        ]
+        
+        assert [user.id for user in user_repo.get_premium_users()] == [2, 1]
+        assert [user.id for user in user_repo.get_premium_users()] == [2, 1]
+        
+        assert list(stored.values()) == [[2, 1]]
+        (namespace, _), = stored
+        assert namespace.endswith("users@db-a:5432/happypath")
+        assert self.mock_db.execute_query.call_count == 3
+    
+    def test_queued_events_drop_memoized_premium_users(self):
+        """Test handled subscription and user events clear the memoized premium user IDs."""
+        from backend.happypath.core.events import EventManager
+        
+        with patch('backend.happypath.core.events.get_config'), \
+             patch('backend.happypath.core.events.get_cache_manager'):
+            event_manager = EventManager()
+        event_manager._event_store_enabled = False
+        query_cache = Mock()
+        
+        set_repository_context(self.mock_db, self.mock_logger, query_cache=query_cache,
+                               event_manager=event_manager)
+        try:
+            user_repo = UserRepository(None)
+            UserRepository(None)
+        finally:
+            clear_repository_context()
+        
+        event_manager.enqueue("subscription_updated", {"subscription_id": 7}, source="subscriptions_repository")
+        event_manager.enqueue(EventType.USER_REGISTERED, {"email": "a@example.com"}, source="users_repository")
+        asyncio.run(event_manager.process_pending_events())
+        
+        namespace = user_repo._query_namespace('_premium_user_ids')
+        assert [call.args for call in query_cache.clear_namespace.call_args_list] == [(namespace,), (namespace,)]
+    
     def test_search_users(self):
         """Test user search functionality."""
         search_results = [
@@ -449,6 +699,99 @@ class TestAuditRepository:
         assert audit_entry.action == "create"
         assert audit_entry.resource_type == "user"
     
+    def test_audit_details_encoded_as_json(self):
+        """Test details payloads are serialized for the JSONB column but not in the entity dict."""
+        trial_end = datetime(2024, 1, 8, 12, 0)
+        entry = AuditEntry(
+            action="update",
+            resource_type="subscription",
+            details={"plan_id": 7, "trial_end": trial_end}
+        )
+        
+        data = self.audit_repo._to_row(entry)
+        
+        assert data['details'] == '{"plan_id":7,"trial_end":"2024-01-08T12:00:00+00:00"}'
+        assert data['old_values'] is None
+        assert self.audit_repo._to_dict(entry)['details'] is entry.details
+        
+    def test_log_audit_events_single_insert(self):
+        """Test several audit events are written with one INSERT."""
+        now = datetime.utcnow()
+        self.mock_db.execute_query.return_value = [
+            {'id': 1, 'action': 'read', 'resource_type': 'profile', 'timestamp': now},
+            {'id': 2, 'action': 'failed_login', 'resource_type': 'security', 'timestamp': now}
+        ]
+        
+        entries = self.audit_repo.log_audit_events([
+            AuditEntry(user_id=123, action="read", resource_type="profile"),
+            AuditEntry(user_id=123, action="failed_login", resource_type="security",
+                       level=AuditLevel.HIGH.value, success=False, compliance_category="security")
+        ])
+        
+        assert [entry.id for entry in entries] == [1, 2]
+        assert self.mock_db.execute_query.call_count == 1
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert "INSERT INTO audit_logs" in query
+        assert params['action_1'] == "failed_login"
+        assert params['retention_until_1'] is not None
+    
+    def test_bulk_ingest_uses_copy(self):
+        """Test bulk ingestion streams validated rows to COPY."""
+        copied = []
+        
+        def copy_records(table, columns, rows):
+            copied.extend(dict(zip(columns, row)) for row in rows)
+            return len(copied)
+        
+        self.mock_db.copy_records.side_effect = copy_records
+        
+        count = self.audit_repo.bulk_ingest(
+            AuditEntry(user_id=index, action="read", resource_type="profile", compliance_category="general")
+            for index in range(3)
+        )
+        
+        assert count == 3
+        assert self.mock_db.copy_records.call_args[0][0] == "audit_logs"
+        assert [row['user_id'] for row in copied] == [0, 1, 2]
+        assert all(row['retention_until'] is not None for row in copied)
+        self.mock_db.execute_query.assert_not_called()
+        assert self.audit_repo.bulk_ingest([]) == 0
+    
+    def test_stream_audit_export(self):
+        """Test audit export is streamed as one JSON document."""
+        self.audit_repo.log_system_event = Mock()
+        self.mock_db.stream_query.return_value = iter([
+            {'id': 1, 'action': 'read', 'resource_type': 'profile'},
+            {'id': 2, 'action': 'update', 'resource_type': 'profile', 'details': {'a': 1}},
+            {'id': 3, 'action': 'delete', 'resource_type': 'profile'}
+        ])
+        
+        chunks = list(self.audit_repo.stream_audit_export(AuditQuery(user_id=123), batch_size=2))
+        document = json.loads(b"".join(chunks))
+        
+        assert [entry['id'] for entry in document['audit_entries']] == [1, 2, 3]
+        assert document['audit_entries'][1]['details'] == {'a': 1}
+        assert document['total_records'] == 3
+        assert len(chunks) == 4
+        query, params = self.mock_db.stream_query.call_args[0]
+        assert "user_id = %(user_id)s" in query and params == {'user_id': 123}
+    
+    def test_export_audit_data_json_bytes(self):
+        """Test JSON audit export is encoded straight to bytes."""
+        self.audit_repo.log_system_event = Mock()
+        self.audit_repo.query_audit_logs = Mock(return_value=QueryResult(data=[
+            AuditEntry(id=1, user_id=123, action="read", resource_type="profile",
+                       details={"ip": "10.0.0.1"}, timestamp=datetime(2024, 1, 1, 12, 0))
+        ]))
+        
+        exported = self.audit_repo.export_audit_data(AuditQuery(user_id=123))
+        document = json.loads(exported)
+        
+        assert isinstance(exported, bytes)
+        assert document['metadata']['total_records'] == 1
+        assert document['audit_entries'][0]['timestamp'] == "2024-01-01T12:00:00"
+        assert document['audit_entries'][0]['details'] == {"ip": "10.0.0.1"}
+    
     def test_log_user_action(self):
         """Test logging a user action (convenience method)."""
         created_row = {
@@ -518,7 +861,7 @@ class TestAuditRepository:
         
         # Mock count and main queries
         count_row = {'count': 2}
-        self.mock_db.execute_query.side_effect = [
+        self.mock_db.execute_prepared.side_effect = [
             [count_row],  # count query
             audit_rows    # main query
         ]
@@ -528,6 +871,7 @@ class TestAuditRepository:
         assert len(trail) == 2
         assert trail[0].action == "login"
         assert trail[1].action == "update"
+        self.mock_db.execute_query.assert_not_called()
     
     def test_generate_audit_summary(self):
         """Test generating audit summary."""
@@ -575,6 +919,14 @@ class TestAuditRepository:
         assert summary.total_entries == 100
         assert summary.unique_users == 25
         assert summary.success_rate == 0.95
+        
+        # A second call for the same hours is served from the result cache
+        again = self.audit_repo.generate_audit_summary(
+            start_time=datetime.utcnow() - timedelta(days=7),
+            end_time=datetime.utcnow()
+        )
+        assert again is summary
+        assert self.mock_db.execute_query.call_count == 4
         assert summary.actions_breakdown['login'] == 50
 
 
@@ -587,6 +939,52 @@ class TestSessionRepository:
         self.mock_logger = Mock()
         self.session_repo = SessionRepository(self.mock_db, self.mock_logger)
     
+    def test_iter_all_keyset_pagination(self):
+        """Test iter_all continues each page below the last row seen."""
+        now = datetime.utcnow()
+        rows = [
+            {'id': f'session_{index}', 'user_id': 123, 'created_at': now - timedelta(minutes=index)}
+            for index in range(5)
+        ]
+        self.mock_db.execute_query.side_effect = [rows[:2], rows[2:4], rows[4:]]
+        
+        sessions = list(self.session_repo.iter_all({'user_id': 123}, batch_size=2))
+        
+        assert [session.id for session in sessions] == [row['id'] for row in rows]
+        assert self.mock_db.execute_query.call_count == 3
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert "OFFSET" not in query
+        assert "(created_at, id) < (%(after_created_at)s, %(after_id)s)" in query
+        assert params['after_id'] == 'session_3' and params['limit'] == 2
+    
+    def test_get_user_sessions_requires_limit(self):
+        """Test per-user session reads are bounded."""
+        self.mock_db.execute_query.return_value = []
+        
+        self.session_repo.get_user_sessions(123, active_only=True)
+        
+        query, params = self.mock_db.execute_query.call_args[0]
+        assert "is_active = TRUE" in query
+        assert params == {'user_id': 123, 'limit': 500}
+        with pytest.raises(ValidationError):
+            self.session_repo.get_user_sessions(123, limit=None)
+    
+    def test_terminate_user_sessions_covers_every_page(self):
+        """Test terminating a user's sessions reaches past the first page of active sessions."""
+        now = datetime.utcnow()
+        rows = [
+            {'id': f'session_{index}', 'user_id': 123, 'is_active': True, 'created_at': now - timedelta(minutes=index)}
+            for index in range(502)
+        ]
+        self.mock_db.execute_query.side_effect = [rows[:500], rows[500:]]
+        
+        with patch.object(self.session_repo, 'terminate_session', return_value=True) as mock_terminate:
+            count = self.session_repo.terminate_user_sessions(123, except_session_id='session_0')
+        
+        assert count == 501
+        assert mock_terminate.call_args[0] == ('session_501', 'user_action')
+        assert self.mock_db.execute_query.call_count == 2
+    
     def test_create_session(self):
         """Test session creation."""
         created_row = {
@@ -678,6 +1076,26 @@ class TestSessionRepository:
         
         assert result is True
     
+    def test_session_analytics_cached_until_write(self):
+        """Test session analytics are reused until a session is written."""
+        self.mock_db.execute_query.return_value = []
+        start = datetime(2024, 1, 1, 9, 30)
+        end = datetime(2024, 1, 2, 17, 45)
+        
+        first = self.session_repo.generate_session_analytics(start, end)
+        second = self.session_repo.generate_session_analytics(start.replace(minute=5), end.replace(minute=50))
+        
+        assert second is first
+        assert self.mock_db.execute_query.call_count == 4
+        # The cache is keyed on whole hours, but the queries use the exact range
+        params = self.mock_db.execute_query.call_args[0][1]
+        assert params == {'start_date': start, 'end_date': end}
+        
+        self.mock_db.get_affected_rows.return_value = 0
+        self.session_repo.cleanup_expired_sessions()
+        self.session_repo.generate_session_analytics(start, end)
+        assert self.mock_db.execute_query.call_count == 10
+    
     def test_cleanup_expired_sessions(self):
         """Test cleanup of expired sessions."""
         self.mock_db.get_affected_rows.side_effect = [5, 3]  # 5 expired, 3 deleted
@@ -799,6 +1217,43 @@ class TestSubscriptionRepository:
         assert subscription.plan_id == 2
         assert subscription.next_payment_amount == new_plan.price
 
+    
+    def test_get_user_subscription_with_plan(self):
+        """Test subscription and plan are read with one JOIN query."""
+        self.subscription_repo.plan_repo = SubscriptionPlanRepository(self.mock_db, self.mock_logger)
+        self.mock_db.execute_query.return_value = [{
+            'id': 5,
+            'user_id': 123,
+            'plan_id': 2,
+            'status': 'active',
+            'plan__id': 2,
+            'plan__name': 'Premium',
+            'plan__price': '19.99'
+        }]
+        
+        subscription, plan = self.subscription_repo.get_user_subscription_with_plan(123)
+        
+        assert (subscription.id, subscription.plan_id) == (5, 2)
+        assert (plan.id, plan.name, plan.price) == (2, 'Premium', Decimal('19.99'))
+        assert "JOIN subscription_plans p" in self.mock_db.execute_query.call_args[0][0]
+        assert self.mock_db.execute_query.call_count == 1
+    
+    def test_plan_create_many_single_insert(self):
+        """Test plans created together share one INSERT."""
+        plan_repo = SubscriptionPlanRepository(self.mock_db, self.mock_logger)
+        self.mock_db.execute_query.return_value = [
+            {'id': 1, 'name': 'Basic', 'price': '9.99'},
+            {'id': 2, 'name': 'Premium', 'price': '19.99'}
+        ]
+        
+        basic, premium = plan_repo.create_many([
+            SubscriptionPlan(name="Basic", price=Decimal('9.99')),
+            SubscriptionPlan(name="Premium", price=Decimal('19.99'))
+        ])
+        
+        assert (basic.id, premium.id) == (1, 2)
+        assert premium.price == Decimal('19.99')
+        assert self.mock_db.execute_query.call_count == 1
 
 class TestRepositoryFactory:
     """Test repository factory functions."""
@@ -822,6 +1277,34 @@ class TestRepositoryFactory:
         
         assert isinstance(repo, AuditRepository)
         assert repo.db == mock_db
+    
+    def test_subscription_repository_shares_plan_repository(self):
+        """Test a subscription repository can reuse an existing plan repository."""
+        mock_db = Mock()
+        plan_repo = create_subscription_plan_repository(mock_db)
+        
+        repo = create_subscription_repository(mock_db, plan_repo=plan_repo)
+        
+        assert repo.plan_repo is plan_repo
+        assert isinstance(create_subscription_repository(mock_db).plan_repo, SubscriptionPlanRepository)    
+    def test_factories_share_repository_context(self):
+        """Test factories fall back to the context db manager and logger."""
+        mock_db = Mock()
+        mock_logger = Mock()
+        
+        set_repository_context(mock_db, mock_logger)
+        try:
+            user_repo = create_user_repository()
+            audit_repo = create_audit_repository()
+            explicit_repo = create_user_repository(Mock())
+        finally:
+            clear_repository_context()
+        
+        assert user_repo.db is mock_db and audit_repo.db is mock_db
+        assert user_repo.logger is mock_logger
+        assert explicit_repo.db is not mock_db
+        with pytest.raises(RepositoryError):
+            create_user_repository()
 
 
 class TestAsyncRepository:
@@ -858,6 +1341,10 @@ def test_query_options():
     assert options.order_by == ['name', '-created_at']
     assert options.filters == {'active': True, 'type': 'premium'}
     assert options.include_count is True
+    
+    # Options are immutable so a single instance can be shared between calls
+    with pytest.raises(AttributeError):
+        options.limit = 5
 
 
 def test_query_result():
@@ -879,6 +1366,204 @@ def test_query_result():
     assert result.has_next is True
 
 
+
+def test_crisis_keyword_matcher():
+    """Test single-pass crisis keyword scanning."""
+    from backend.happypath.repository.crisis_repository import CrisisKeyword, CrisisKeywordMatcher
+    
+    matcher = CrisisKeywordMatcher([
+        CrisisKeyword(keyword_phrase="hopeless"),
+        CrisisKeyword(keyword_phrase="ending the pain"),
+        CrisisKeyword(keyword_phrase="Overdose", case_sensitive=True)
+    ])
+    
+    found = matcher.scan("Everything feels HOPELESS. I keep thinking about ending the pain. overdose")
+    
+    assert [keyword.keyword_phrase for keyword in found] == ["hopeless", "ending the pain"]
+    assert matcher.scan("") == []
+    assert matcher.might_match("Feeling helpless") is False
+    assert matcher.scan("A calm walk in the park") == []
+    assert matcher.might_match("sleep helps, hope so") is True
+
+
+def test_medication_dose_batch_window():
+    """Test windowing a column-oriented dose batch."""
+    import calendar
+    from array import array
+    from backend.happypath.repository.medication_repository import (
+        ADHERENCE_STATUS_CODES, AdherenceStatus, MedicationDoseBatch
+    )
+    
+    day = datetime(2024, 1, 1, 8, 0)
+    scheduled = [calendar.timegm((day + timedelta(days=offset)).utctimetuple()) for offset in range(5)]
+    batch = MedicationDoseBatch(
+        scheduled_ts=array('q', scheduled),
+        actual_ts=array('q', [ts + 600 for ts in scheduled]),
+        status=array('B', [ADHERENCE_STATUS_CODES['taken']] * 4 + [ADHERENCE_STATUS_CODES['missed']])
+    )
+    
+    window = batch.window(day + timedelta(days=1), day + timedelta(days=4, hours=1))
+    
+    assert len(window) == 4
+    assert window.count(AdherenceStatus.MISSED) == 1
+    assert window.average_delay_minutes(AdherenceStatus.TAKEN) == 10
+
+
+def test_mood_trends_aggregated_in_sql():
+    """Test mood trends come from a single aggregate query."""
+    from backend.happypath.repository.mood_repository import MoodEntryRepository
+    
+    mock_db = Mock()
+    mock_db.execute_query.return_value = {
+        'total_entries': 10,
+        'average_mood': Decimal('6.5'),
+        'mood_variance': Decimal('1.25'),
+        'trend_slope': 0.2
+    }
+    repository = MoodEntryRepository(mock_db, Mock())
+    
+    trends = repository.calculate_mood_trends("user_123", days=30)
+    
+    mock_db.execute_query.assert_called_once()
+    assert "REGR_SLOPE" in mock_db.execute_query.call_args[0][0]
+    assert trends['average_mood'] == 6.5
+    assert trends['trend_direction'] == "improving"
+    assert trends['total_entries'] == 10
+
+def test_journal_entry_flags_crisis_keywords():
+    """Test new journal entries are scanned for crisis keywords."""
+    from backend.happypath.repository.journaling_repository import JournalEntry, JournalEntryRepository
+    
+    mock_db = Mock()
+    mock_db.execute_query.return_value = [
+        {'keyword_id': 'k1', 'keyword_phrase': 'hopeless', 'crisis_type': 'suicidal_ideation'},
+        {'keyword_id': 'k2', 'keyword_phrase': 'self harm', 'crisis_type': 'self_harm'}
+    ]
+    repository = JournalEntryRepository(mock_db, Mock())
+    
+    entry = JournalEntry(user_id="user_123", content="Everything feels hopeless today")
+    repository._validate_entity(entry)
+    repository._validate_entity(JournalEntry(user_id="user_123", content="A calm walk"))
+    
+    assert entry.risk_indicators == ["hopeless"]
+    # The keyword matcher is built once and reused
+    mock_db.execute_query.assert_called_once()
+
+
+def test_crisis_keyword_matcher_expires_and_errors_propagate():
+    """Test compiled keyword matchers expire, and keyword query failures fail validation."""
+    from backend.happypath.repository.journaling_repository import JournalEntry, JournalEntryRepository
+    
+    mock_db = Mock()
+    mock_db.execute_query.return_value = [
+        {'keyword_id': 'k1', 'keyword_phrase': 'hopeless', 'crisis_type': 'suicidal_ideation'}
+    ]
+    repository = JournalEntryRepository(mock_db, Mock())
+    repository.detect_risk_indicators("Everything feels hopeless")
+    
+    with patch('backend.happypath.repository.base_repository.time.monotonic', return_value=time.monotonic() + 3600):
+        mock_db.execute_query.side_effect = Exception("connection lost")
+        with pytest.raises(RepositoryError):
+            repository._validate_entity(JournalEntry(user_id="user_123", content="A calm walk"))
+
+
+
+def test_crisis_keyword_matcher_compiles_regex_keywords_separately():
+    """Test regex keywords keep inline flags and backreferences, and invalid ones are skipped."""
+    from backend.happypath.repository.crisis_repository import CrisisKeyword, CrisisKeywordMatcher
+    
+    logger = Mock()
+    matcher = CrisisKeywordMatcher([
+        CrisisKeyword(keyword_phrase="hopeless"),
+        CrisisKeyword(keyword_phrase="(?i)end it", is_regex=True),
+        CrisisKeyword(keyword_phrase=r"(no|never) \1", is_regex=True, word_boundary_required=True),
+        CrisisKeyword(keyword_phrase="(unclosed", is_regex=True)
+    ], logger)
+    
+    found = matcher.scan("Never never again. I want to END IT, it is hopeless")
+    
+    assert [keyword.keyword_phrase for keyword in found] == [r"(no|never) \1", "(?i)end it", "hopeless"]
+    assert matcher.scan("no yes") == []
+    logger.error.assert_called_once()
+
+def test_with_slots_entity():
+    """Test slotted entities keep dataclass behaviour without a __dict__."""
+    from backend.happypath.repository.mood_repository import MoodEntry
+    
+    entry = MoodEntry(user_id="user_123", notes="Calm day")
+    
+    assert not hasattr(entry, '__dict__')
+    assert entry == MoodEntry(user_id="user_123", notes="Calm day")
+    assert entry.exercise_minutes == 0
+    with pytest.raises(AttributeError):
+        entry.unknown_field = True
+
+
+
+def test_with_slots_frozen_copy_and_pickle():
+    """Test frozen slotted dataclasses survive deepcopy and pickle."""
+    import copy
+    import pickle
+    
+    options = QueryOptions(limit=10, order_by=('-created_at',), filters={'user_id': 'user_123'})
+    
+    assert copy.deepcopy(options) == options
+    assert pickle.loads(pickle.dumps(options)) == options
+    assert copy.copy(options) == options
+
+def test_append_messages_rolls_back_when_stats_update_fails():
+    """Test a failed conversation stats update fails the append instead of being logged."""
+    from backend.happypath.repository.conversational_repository import (
+        ChatMessage, ChatMessageRepository, MessageSender
+    )
+    
+    mock_db = MagicMock()
+    mock_db.execute_query.side_effect = [
+        [{'message_id': 'm1', 'conversation_id': 'c1', 'user_id': 'u1', 'sender': 'user', 'content': 'hi'}],
+        Exception("deadlock detected")
+    ]
+    repository = ChatMessageRepository(mock_db, Mock())
+    
+    with pytest.raises(RepositoryError, match="deadlock detected"):
+        repository.append_messages('c1', [ChatMessage(user_id='u1', sender=MessageSender.USER, content='hi')])
+    
+    mock_db.transaction.return_value.__exit__.assert_called_once()
+    assert mock_db.transaction.return_value.__exit__.call_args[0][0] is Exception
+
+
+def test_acreate_keeps_pre_encoded_json_columns():
+    """Test acreate sends pre-encoded JSONB columns through the asyncpg codec unchanged."""
+    from backend.happypath.core.database import _init_async_connection
+    from backend.happypath.repository.crisis_repository import (
+        CRISIS_HOTLINE_CONTACT, SafetyPlan, SafetyPlanRepository
+    )
+    
+    connection = Mock()
+    connection.set_type_codec = AsyncMock()
+    asyncio.run(_init_async_connection(connection))
+    encoder = connection.set_type_codec.call_args[1]['encoder']
+    
+    mock_db = Mock()
+    mock_db.run_blocking = AsyncMock(side_effect=lambda func, *args: func(*args))
+    mock_db.execute_async_query = AsyncMock(return_value=[{'plan_id': 'p1', 'user_id': 'u1'}])
+    repository = SafetyPlanRepository(mock_db, Mock())
+    
+    asyncio.run(repository.acreate(SafetyPlan(
+        user_id='u1',
+        emergency_contacts=[CRISIS_HOTLINE_CONTACT, {"name": "Sam", "phone": "555-0100"}],
+        local_emergency_services={"hospital": "General"}
+    )))
+    
+    query, values = mock_db.execute_async_query.call_args[0]
+    columns = query.split("(", 1)[1].split(")", 1)[0].split(", ")
+    row = dict(zip(columns, values))
+    
+    stored = json.loads(encoder(row['emergency_contacts']))
+    assert [contact['name'] for contact in stored] == ["988 Suicide & Crisis Lifeline", "Sam"]
+    assert json.loads(encoder(row['local_emergency_services'])) == {"hospital": "General"}
+    assert json.loads(encoder({"a": 1})) == {"a": 1}
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])